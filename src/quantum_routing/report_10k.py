@@ -1,6 +1,11 @@
 """Reporting functions for 10K CSS Renderer routing results."""
 
+import io
+import sys
 from collections import defaultdict
+from itertools import chain
+
+import numpy as np
 
 from .css_renderer_agents import (
     CLOUD_MODELS, LOCAL_MODELS, CLOUD_SESSIONS, CLOUD_CAPACITY, LOCAL_COUNT,
@@ -8,6 +13,107 @@ from .css_renderer_agents import (
 from .css_renderer_intents import CSS_TASK_TEMPLATES
 from . import css_renderer_config as cfg
 
+COMPLEXITY_TIERS = ['trivial', 'simple', 'moderate', 'complex', 'very-complex', 'epic']
+
+# Agent-quality buckets for the pipeline flow report, lowest first.
+_QUALITY_CUTS = (0.6, 0.8, 0.9)
+_QUALITY_CLASSES = ('basic (<0.6)', 'fair (0.6-0.8)', 'good (0.8-0.9)', 'excellent (0.9+)')
+
+# Row formatters for the report tables, bound once at import.
+_STAGE_ROW = "  {:<20} {:>8} {:>8} ${:>10.2f}\n".format
+_CLOUD_DISPATCH_ROW = "  {:<20} {:>8} {:>8} ${:>9.2f} {:>8.2f}\n".format
+_LOCAL_DISPATCH_ROW = "  {:<20} {:>8} {:>8} $0.00     {:>8.2f}\n".format
+_TIER_ROW = "  {:<15} {:>8} {:>4} {:>10} ${:>10.2f}\n".format
+
+
+def _agent_columns(agents):
+    """Pull per-agent fields into arrays indexed by agent row.
+
+    Returns:
+        (row_of, token_rate, quality, is_local) where row_of maps agent
+        name to its row in the three parallel arrays.
+    """
+    names = list(agents)
+    n = len(names)
+    row_of = {name: k for k, name in enumerate(names)}
+    token_rate = np.fromiter((agents[a]['token_rate'] for a in names), dtype=np.float64, count=n)
+    quality = np.fromiter((agents[a]['quality'] for a in names), dtype=np.float64, count=n)
+    is_local = np.fromiter((bool(agents[a]['is_local']) for a in names), dtype=bool, count=n)
+    return row_of, token_rate, quality, is_local
+
+
+def _assignment_rows(assignments, row_of):
+    """Return (intent_idx, agent_row) int arrays in assignment order."""
+    n = len(assignments)
+    intent_idx = np.fromiter(assignments.keys(), dtype=np.int64, count=n)
+    agent_row = np.fromiter((row_of[a] for a in assignments.values()), dtype=np.int64, count=n)
+    return intent_idx, agent_row
+
+
+def _dependency_edges(intents):
+    """Flatten every intent's ``depends`` list into parallel (src, dst) arrays.
+
+    ``src[k]`` is the dependent intent and ``dst[k]`` the intent it depends on.
+    Dependencies outside ``range(len(intents))`` (including negative ones)
+    are dropped, so they are never counted.
+    """
+    dep_lists = [it.get('depends', ()) for it in intents]
+    counts = np.fromiter(map(len, dep_lists), dtype=np.int64, count=len(dep_lists))
+    src = np.repeat(np.arange(len(dep_lists), dtype=np.int64), counts)
+    dst = np.fromiter(chain.from_iterable(dep_lists), dtype=np.int64, count=int(counts.sum()))
+    in_range = (dst >= 0) & (dst < len(dep_lists))
+    return src[in_range], dst[in_range]
+
+
+def _count_violations(src, dst, intent_idx, agent_row, quality, num_intents, stage_rank=None):
+    """Count dependency-quality and stage-order violations over the edge arrays.
+
+    Only edges whose endpoints are both assigned count. A dependency
+    violation is a dependent whose agent has lower quality than its
+    dependency's; a stage-order violation is a dependency in a later
+    stage than its dependent (skipped when ``stage_rank`` is None).
+
+    Returns:
+        (dep_violations, stage_order_violations)
+    """
+    # NaN marks unassigned intents; every comparison against it is False
+    quality_of = np.full(num_intents, np.nan)
+    quality_of[intent_idx] = quality[agent_row]
+    q_src, q_dst = quality_of[src], quality_of[dst]
+    dep_violations = int(np.count_nonzero(q_src < q_dst))
+    if stage_rank is None:
+        return dep_violations, 0
+    both = ~(np.isnan(q_src) | np.isnan(q_dst))
+    stage_order_violations = int(np.count_nonzero(both & (stage_rank[dst] > stage_rank[src])))
+    return dep_violations, stage_order_violations
+
+
+def _category_index(intents, key, categories):
+    """Map ``intent[key]`` to its position in ``categories`` as an int8 array.
+
+    Values outside ``categories`` map to -1.
+    """
+    to_i = {c: k for k, c in enumerate(categories)}
+    return np.fromiter((to_i.get(it[key], -1) for it in intents), dtype=np.int8, count=len(intents))
+
+
+def _stage_index(intents):
+    """Position of each intent's stage in ``cfg.PIPELINE_STAGES`` (-1 if unknown)."""
+    return _category_index(intents, 'stage', cfg.PIPELINE_STAGES)
+
+
+def _group_totals(group, size, sp, cost):
+    """Per-group task count, story points and cost for ``group`` ids in [0, size).
+
+    Entries with a negative group id (unknown category) are ignored.
+    """
+    known = group >= 0
+    group, sp, cost = group[known], sp[known], cost[known]
+    counts = np.bincount(group, minlength=size)
+    sp_sums = np.bincount(group, weights=sp, minlength=size).astype(np.int64)
+    cost_sums = np.bincount(group, weights=cost, minlength=size)
+    return counts, sp_sums, cost_sums
+
 
 def print_shift_report(assignments, intents, agents, workflow_chains):
     """Print the full factory floor shift report for CSS Renderer.
@@ -18,95 +124,90 @@ def print_shift_report(assignments, intents, agents, workflow_chains):
         agents: Dict of agent definitions
         workflow_chains: List of workflow chain tuples
     """
+    out = io.StringIO()
     num_intents = len(intents)
 
-    # Count assignments per agent
-    agent_counts = defaultdict(int)
-    for agent in assignments.values():
-        agent_counts[agent] += 1
+    # Pull the per-intent and per-agent fields into arrays once; the only
+    # Python-level pass over assignments is _assignment_rows, and every
+    # metric below is a NumPy reduction over its output.
+    tokens = np.fromiter((it['estimated_tokens'] for it in intents), dtype=np.float64, count=num_intents)
+    min_q = np.fromiter((it['min_quality'] for it in intents), dtype=np.float64, count=num_intents)
+    story_points = np.fromiter((it.get('story_points', 0) for it in intents), dtype=np.int64, count=num_intents)
+    stage_idx = _stage_index(intents)
+    tier_idx = _category_index(intents, 'complexity', COMPLEXITY_TIERS)
+    row_of, token_rate, quality, is_local = _agent_columns(agents)
+    assigned_idx, agent_row = _assignment_rows(assignments, row_of)
 
     # Calculate costs and quality
-    money_spent = sum(
-        intents[i]['estimated_tokens'] * agents[a]['token_rate']
-        for i, a in assignments.items()
-    )
-    quality_met = sum(
-        1 for i, a in assignments.items()
-        if agents[a]['quality'] >= intents[i]['min_quality']
-    )
-    unassigned = [i for i in range(num_intents) if i not in assignments]
-
-    # Check capacity violations
-    capacity_violations = []
-    for name, count in agent_counts.items():
-        if count > agents[name]['capacity']:
-            capacity_violations.append(f"  {name}: {count}/{agents[name]['capacity']}")
-
-    # Check dependency violations
-    dep_violations = 0
-    for i, intent in enumerate(intents):
-        for dep_idx in intent.get('depends', []):
-            if i in assignments and dep_idx in assignments:
-                if agents[assignments[i]]['quality'] < agents[assignments[dep_idx]]['quality']:
-                    dep_violations += 1
-
-    # Check stage ordering (cross-stage dependencies)
-    stage_order_violations = 0
-    stage_order = {stage: i for i, stage in enumerate(cfg.PIPELINE_STAGES)}
-    for i, intent in enumerate(intents):
-        for dep_idx in intent.get('depends', []):
-            if i in assignments and dep_idx in assignments:
-                current_stage = intent['stage']
-                dep_stage = intents[dep_idx]['stage']
-                if stage_order.get(dep_stage, 0) > stage_order.get(current_stage, 0):
-                    stage_order_violations += 1
+    assigned_sp = story_points[assigned_idx]
+    task_cost = tokens[assigned_idx] * token_rate[agent_row]
+    money_spent = float(task_cost.sum())
+    quality_met = int((quality[agent_row] >= min_q[assigned_idx]).sum())
+    unassigned = num_intents - len(assignments)
+
+    # Check capacity violations, listing agents in order of first assignment
+    agent_names = list(row_of)
+    capacity = np.fromiter((agents[a]['capacity'] for a in agent_names), dtype=np.int64, count=len(agent_names))
+    agent_load = np.bincount(agent_row, minlength=len(agent_names))
+    used_rows, first_seen = np.unique(agent_row, return_index=True)
+    used_rows = used_rows[np.argsort(first_seen)]
+    capacity_violations = [
+        f"  {agent_names[r]}: {agent_load[r]}/{capacity[r]}"
+        for r in used_rows[agent_load[used_rows] > capacity[used_rows]].tolist()
+    ]
+
+    # Check dependency and stage-ordering (cross-stage) violations over the
+    # flattened edge list; unknown stages rank as the first stage.
+    dep_violations, stage_order_violations = _count_violations(
+        *_dependency_edges(intents), assigned_idx, agent_row, quality, num_intents,
+        stage_rank=np.maximum(stage_idx, 0))
 
     # Overkill: expensive models on simple tasks
-    overkill = []
-    for i, name in assignments.items():
-        if intents[i]['complexity'] in ('trivial', 'simple') and agents[name]['token_rate'] > 0.00001:
-            overkill.append(f"  {intents[i]['id']} -> {name}")
+    overkill_mask = np.isin(tier_idx[assigned_idx], (0, 1)) & (token_rate[agent_row] > 0.00001)
+    overkill = [
+        f"  {intents[i]['id']} -> {agent_names[r]}"
+        for i, r in zip(assigned_idx[overkill_mask].tolist(), agent_row[overkill_mask].tolist())
+    ]
 
     # Print report header
-    print("=" * 70)
-    print("  CSS RENDERER FACTORY FLOOR SHIFT REPORT")
-    print("  10K Tasks - Quantum Agent Annealed Swarm")
-    print("=" * 70)
+    print("=" * 70, file=out)
+    print("  CSS RENDERER FACTORY FLOOR SHIFT REPORT", file=out)
+    print("  10K Tasks - Quantum Agent Annealed Swarm", file=out)
+    print("=" * 70, file=out)
 
     # Summary metrics
-    print(f"\n  Tasks completed:       {len(assignments)}/{num_intents}")
-    print(f"  Tasks dropped:         {len(unassigned)}")
-    print(f"  Money spent:           ${money_spent:.2f}")
-    print(f"  Quality targets met:   {quality_met}/{len(assignments)}")
-    print(f"  Capacity violations:   {len(capacity_violations)}")
-    print(f"  Dep violations:        {dep_violations}")
-    print(f"  Stage order violations: {stage_order_violations}")
+    print(f"\n  Tasks completed:       {len(assignments)}/{num_intents}", file=out)
+    print(f"  Tasks dropped:         {unassigned}", file=out)
+    print(f"  Money spent:           ${money_spent:.2f}", file=out)
+    print(f"  Quality targets met:   {quality_met}/{len(assignments)}", file=out)
+    print(f"  Capacity violations:   {len(capacity_violations)}", file=out)
+    print(f"  Dep violations:        {dep_violations}", file=out)
+    print(f"  Stage order violations: {stage_order_violations}", file=out)
 
     # Pipeline stage breakdown
-    print(f"\n{'─' * 70}")
-    print(f"  PIPELINE STAGE BREAKDOWN")
-    print(f"{'─' * 70}")
-
-    stage_stats = defaultdict(lambda: {'count': 0, 'sp': 0, 'cost': 0.0})
-    for i, agent_name in assignments.items():
-        stage = intents[i]['stage']
-        sp = intents[i].get('story_points', 0)
-        cost = intents[i]['estimated_tokens'] * agents[agent_name]['token_rate']
-        stage_stats[stage]['count'] += 1
-        stage_stats[stage]['sp'] += sp
-        stage_stats[stage]['cost'] += cost
-
-    print(f"  {'Stage':<20} {'Tasks':>8} {'SP':>8} {'Cost':>12}")
-    print(f"  {'─' * 52}")
-    for stage in cfg.PIPELINE_STAGES:
-        s = stage_stats[stage]
-        if s['count'] > 0:
-            print(f"  {stage:<20} {s['count']:>8} {s['sp']:>8} ${s['cost']:>10.2f}")
+    print(f"\n{'─' * 70}", file=out)
+    print(f"  PIPELINE STAGE BREAKDOWN", file=out)
+    print(f"{'─' * 70}", file=out)
+
+    stage_counts, stage_sp, stage_cost = _group_totals(
+        stage_idx[assigned_idx], len(cfg.PIPELINE_STAGES), assigned_sp, task_cost)
+
+    print(f"  {'Stage':<20} {'Tasks':>8} {'SP':>8} {'Cost':>12}", file=out)
+    print(f"  {'─' * 52}", file=out)
+    for k, stage in enumerate(cfg.PIPELINE_STAGES):
+        if stage_counts[k] > 0:
+            out.write(_STAGE_ROW(stage, stage_counts[k], stage_sp[k], stage_cost[k]))
 
     # Workflow chain quality progression
-    print(f"\n{'─' * 70}")
-    print(f"  WORKFLOW CHAIN QUALITY PROGRESSION (sample)")
-    print(f"{'─' * 70}")
+    print(f"\n{'─' * 70}", file=out)
+    print(f"  WORKFLOW CHAIN QUALITY PROGRESSION (sample)", file=out)
+    print(f"{'─' * 70}", file=out)
+
+    # Agent row per intent (-1 if unassigned), so each chain step is an
+    # array lookup instead of assignments -> agents -> quality dict hops.
+    agent_of = np.full(num_intents, -1, dtype=np.int64)
+    agent_of[assigned_idx] = agent_row
+    agent_quality = quality.tolist()
 
     shown = defaultdict(int)
     for wf_type, steps in workflow_chains[:20]:  # Show first 20
@@ -114,107 +215,96 @@ def print_shift_report(assignments, intents, agents, workflow_chains):
             continue
         shown[wf_type] += 1
         chain_info = []
-        for s in steps:
-            if s in assignments:
-                a = assignments[s]
-                q = agents[a]['quality']
-                chain_info.append(f"{a.split('-')[0]}({q:.2f})")
+        for r in agent_of[np.asarray(steps, dtype=np.int64)].tolist():
+            if r >= 0:
+                chain_info.append(f"{agent_names[r].split('-')[0]}({agent_quality[r]:.2f})")
             else:
                 chain_info.append("UNASSIGNED")
-        print(f"  {wf_type}: {' -> '.join(chain_info)}")
+        print(f"  {wf_type}: {' -> '.join(chain_info)}", file=out)
 
     remaining = len(workflow_chains) - sum(shown.values())
     if remaining > 0:
-        print(f"  ... and {remaining} more chains")
+        print(f"  ... and {remaining} more chains", file=out)
 
     # Agent dispatch
-    print(f"\n{'─' * 70}")
-    print(f"  AGENT DISPATCH")
-    print(f"{'─' * 70}")
-    print(f"  {'Model':<20} {'Tasks':>8} {'Cap':>8} {'$/M tok':>10} {'Quality':>8}")
-    print(f"  {'─' * 58}")
+    print(f"\n{'─' * 70}", file=out)
+    print(f"  AGENT DISPATCH", file=out)
+    print(f"{'─' * 70}", file=out)
+    print(f"  {'Model':<20} {'Tasks':>8} {'Cap':>8} {'$/M tok':>10} {'Quality':>8}", file=out)
+    print(f"  {'─' * 58}", file=out)
+
+    # Group agent loads by base model name ("<model>-<session>")
+    model_counts = defaultdict(int)
+    for name, load in zip(agent_names, agent_load.tolist()):
+        model_counts[name.rsplit('-', 1)[0]] += load
 
     # Cloud models
     for model in CLOUD_MODELS:
-        total = sum(
-            agent_counts[f"{model['name']}-{i}"]
-            for i in range(CLOUD_SESSIONS)
-            if f"{model['name']}-{i}" in agent_counts
-        )
+        total = model_counts[model['name']]
         rate_per_m = cfg.TOKEN_RATES.get(model['name'], 0) * 1_000_000
-        print(f"  {model['name'] + f' (x{CLOUD_SESSIONS})':<20} {total:>8} "
-              f"{CLOUD_SESSIONS * CLOUD_CAPACITY:>8} ${rate_per_m:>9.2f} {model['quality']:>8.2f}")
+        out.write(_CLOUD_DISPATCH_ROW(f"{model['name']} (x{CLOUD_SESSIONS})", total,
+                                      CLOUD_SESSIONS * CLOUD_CAPACITY, rate_per_m, model['quality']))
 
-    print(f"  {'─' * 58}")
+    print(f"  {'─' * 58}", file=out)
 
     # Local models
     for model in LOCAL_MODELS:
-        count = sum(
-            agent_counts[f"{model['name']}-{i}"]
-            for i in range(LOCAL_COUNT)
-            if f"{model['name']}-{i}" in agent_counts
-        )
+        count = model_counts[model['name']]
         total_cap = LOCAL_COUNT * model['capacity']
-        print(f"  {model['name'] + f' (x{LOCAL_COUNT})':<20} {count:>8} "
-              f"{total_cap:>8} $0.00     {model['quality']:>8.2f}")
+        out.write(_LOCAL_DISPATCH_ROW(f"{model['name']} (x{LOCAL_COUNT})", count, total_cap, model['quality']))
 
     # Cost efficiency
-    cloud_tasks = sum(1 for a in assignments.values() if not agents[a]['is_local'])
+    cloud_tasks = int((~is_local[agent_row]).sum())
     local_tasks = len(assignments) - cloud_tasks
 
-    print(f"\n{'─' * 70}")
-    print(f"  COST EFFICIENCY")
-    print(f"{'─' * 70}")
-    print(f"  Local (free):   {local_tasks} tasks  - $0.00")
-    print(f"  Cloud (paid):   {cloud_tasks} tasks  - ${money_spent:.2f}")
-    print(f"  Avg cost/task:  ${money_spent / max(len(assignments), 1):.4f}")
+    print(f"\n{'─' * 70}", file=out)
+    print(f"  COST EFFICIENCY", file=out)
+    print(f"{'─' * 70}", file=out)
+    print(f"  Local (free):   {local_tasks} tasks  - $0.00", file=out)
+    print(f"  Cloud (paid):   {cloud_tasks} tasks  - ${money_spent:.2f}", file=out)
+    print(f"  Avg cost/task:  ${money_spent / max(len(assignments), 1):.4f}", file=out)
 
     if overkill:
-        print(f"\n  OVERKILL ({len(overkill)} expensive models on simple tasks)")
+        print(f"\n  OVERKILL ({len(overkill)} expensive models on simple tasks)", file=out)
         for line in overkill[:5]:
-            print(line)
+            print(line, file=out)
         if len(overkill) > 5:
-            print(f"  ... and {len(overkill) - 5} more")
+            print(f"  ... and {len(overkill) - 5} more", file=out)
 
     if capacity_violations:
-        print(f"\n  OVERLOADED AGENTS")
+        print(f"\n  OVERLOADED AGENTS", file=out)
         for line in capacity_violations[:5]:
-            print(line)
+            print(line, file=out)
         if len(capacity_violations) > 5:
-            print(f"  ... and {len(capacity_violations) - 5} more")
+            print(f"  ... and {len(capacity_violations) - 5} more", file=out)
 
     # Sprint economics
-    total_sp = sum(intents[i].get('story_points', 0) for i in assignments)
-    total_tokens = sum(intents[i]['estimated_tokens'] for i in assignments)
-
-    print(f"\n{'─' * 70}")
-    print(f"  SPRINT ECONOMICS")
-    print(f"{'─' * 70}")
-    print(f"  Total story points:  {total_sp}")
-    print(f"  Cost per SP:         ${money_spent / max(total_sp, 1):.4f}")
-    print(f"  Tokens per SP:       {total_tokens / max(total_sp, 1):.0f}")
-
-    print(f"\n  {'Tier':<15} {'Count':>8} {'SP':>4} {'Total SP':>10} {'Cost':>12}")
-    print(f"  {'─' * 53}")
-    tier_stats = defaultdict(lambda: {'count': 0, 'sp': 0, 'cost': 0.0})
-    for i, agent_name in assignments.items():
-        tier = intents[i]['complexity']
-        sp = intents[i].get('story_points', 0)
-        cost = intents[i]['estimated_tokens'] * agents[agent_name]['token_rate']
-        tier_stats[tier]['count'] += 1
-        tier_stats[tier]['sp'] += sp
-        tier_stats[tier]['cost'] += cost
-
-    for complexity in ['trivial', 'simple', 'moderate', 'complex', 'very-complex', 'epic']:
-        s = tier_stats[complexity]
-        if s['count'] > 0:
+    total_sp = int(assigned_sp.sum())
+    total_tokens = float(tokens[assigned_idx].sum())
+
+    print(f"\n{'─' * 70}", file=out)
+    print(f"  SPRINT ECONOMICS", file=out)
+    print(f"{'─' * 70}", file=out)
+    print(f"  Total story points:  {total_sp}", file=out)
+    print(f"  Cost per SP:         ${money_spent / max(total_sp, 1):.4f}", file=out)
+    print(f"  Tokens per SP:       {total_tokens / max(total_sp, 1):.0f}", file=out)
+
+    print(f"\n  {'Tier':<15} {'Count':>8} {'SP':>4} {'Total SP':>10} {'Cost':>12}", file=out)
+    print(f"  {'─' * 53}", file=out)
+    tier_counts, tier_sp, tier_cost = _group_totals(
+        tier_idx[assigned_idx], len(COMPLEXITY_TIERS), assigned_sp, task_cost)
+
+    for k, complexity in enumerate(COMPLEXITY_TIERS):
+        if tier_counts[k] > 0:
             sp_val = cfg.STORY_POINTS.get(complexity, 0)
-            print(f"  {complexity:<15} {s['count']:>8} {sp_val:>4} {s['sp']:>10} ${s['cost']:>10.2f}")
+            out.write(_TIER_ROW(complexity, tier_counts[k], sp_val, tier_sp[k], tier_cost[k]))
 
-    print(f"\n  Sprint capacity projections:")
-    print(f"    70% load:   {int(total_sp * 0.7):>6} SP   ${money_spent * 0.7:.2f}")
-    print(f"   100% load:   {total_sp:>6} SP   ${money_spent:.2f}")
-    print(f"   140% load:   {int(total_sp * 1.4):>6} SP   ${money_spent * 1.4:.2f}")
+    print(f"\n  Sprint capacity projections:", file=out)
+    print(f"    70% load:   {int(total_sp * 0.7):>6} SP   ${money_spent * 0.7:.2f}", file=out)
+    print(f"   100% load:   {total_sp:>6} SP   ${money_spent:.2f}", file=out)
+    print(f"   140% load:   {int(total_sp * 1.4):>6} SP   ${money_spent * 1.4:.2f}", file=out)
+
+    sys.stdout.write(out.getvalue())
 
 
 def print_comparison(anneal_assignments, greedy_assignments, greedy_cost, intents, agents):
@@ -223,73 +313,79 @@ def print_comparison(anneal_assignments, greedy_assignments, greedy_cost, intent
     Args:
         anneal_assignments: Dict from annealing solver
         greedy_assignments: Dict from greedy solver
-        greedy_cost: Total cost from greedy
+        greedy_cost: Total cost from greedy. Kept for callers; the table
+            recomputes it from greedy_assignments with the same summation
+            as the annealing side, so identical assignments compare equal.
         intents: List of intent dicts
         agents: Dict of agent definitions
     """
+    out = io.StringIO()
     num_intents = len(intents)
 
+    # Snapshot each assignment dict into (intent, agent row) arrays once;
+    # every metric below reuses them.
+    row_of, token_rate, quality, is_local = _agent_columns(agents)
+    greedy_idx, greedy_rows = _assignment_rows(greedy_assignments, row_of)
+    anneal_idx, anneal_rows = _assignment_rows(anneal_assignments, row_of)
+
     # Cloud vs local breakdown
-    greedy_cloud = sum(1 for a in greedy_assignments.values() if not agents[a]['is_local'])
+    greedy_cloud = int((~is_local[greedy_rows]).sum())
     greedy_local = len(greedy_assignments) - greedy_cloud
 
-    anneal_cloud = sum(1 for a in anneal_assignments.values() if not agents[a]['is_local'])
+    anneal_cloud = int((~is_local[anneal_rows]).sum())
     anneal_local = len(anneal_assignments) - anneal_cloud
 
-    money_spent = sum(
-        intents[i]['estimated_tokens'] * agents[a]['token_rate']
-        for i, a in anneal_assignments.items()
-    )
+    tokens = np.fromiter((it['estimated_tokens'] for it in intents), dtype=np.float64, count=num_intents)
+    money_spent = float((tokens[anneal_idx] * token_rate[anneal_rows]).sum())
+    greedy_cost = float((tokens[greedy_idx] * token_rate[greedy_rows]).sum())
     unassigned = num_intents - len(anneal_assignments)
 
     # Dependency violations
-    greedy_dep_violations = 0
-    anneal_dep_violations = 0
-    for i, intent in enumerate(intents):
-        for dep_idx in intent.get('depends', []):
-            if i in greedy_assignments and dep_idx in greedy_assignments:
-                if agents[greedy_assignments[i]]['quality'] < agents[greedy_assignments[dep_idx]]['quality']:
-                    greedy_dep_violations += 1
-            if i in anneal_assignments and dep_idx in anneal_assignments:
-                if agents[anneal_assignments[i]]['quality'] < agents[anneal_assignments[dep_idx]]['quality']:
-                    anneal_dep_violations += 1
+    edge_src, edge_dst = _dependency_edges(intents)
+    greedy_dep_violations, _ = _count_violations(
+        edge_src, edge_dst, greedy_idx, greedy_rows, quality, num_intents)
+    anneal_dep_violations, _ = _count_violations(
+        edge_src, edge_dst, anneal_idx, anneal_rows, quality, num_intents)
 
     # Story points
-    greedy_sp = sum(intents[i].get('story_points', 0) for i in greedy_assignments)
-    anneal_sp = sum(intents[i].get('story_points', 0) for i in anneal_assignments)
+    story_points = np.fromiter((it.get('story_points', 0) for it in intents), dtype=np.int64, count=num_intents)
+    greedy_sp = int(story_points[greedy_idx].sum())
+    anneal_sp = int(story_points[anneal_idx].sum())
     greedy_cost_per_sp = greedy_cost / max(greedy_sp, 1)
     anneal_cost_per_sp = money_spent / max(anneal_sp, 1)
 
     # Print comparison
-    print("=" * 70)
-    print("  HEAD TO HEAD: GREEDY vs QUANTUM ANNEALING")
-    print("  10K CSS Renderer Task Routing")
-    print("=" * 70)
-    print(f"\n  {'Metric':<30} {'Greedy':<15} {'Annealing':<15}")
-    print(f"  {'─' * 62}")
-    print(f"  {'Tasks shipped':<30} {len(greedy_assignments):<15} {len(anneal_assignments):<15}")
-    print(f"  {'Tasks dropped':<30} {num_intents - len(greedy_assignments):<15} {unassigned:<15}")
-    print(f"  {'Money spent':<30} ${greedy_cost:<14.2f} ${money_spent:<14.2f}")
-    print(f"  {'Story points':<30} {greedy_sp:<15} {anneal_sp:<15}")
-    print(f"  {'Cost per SP':<30} ${greedy_cost_per_sp:<14.4f} ${anneal_cost_per_sp:<14.4f}")
-    print(f"  {'Cloud tasks':<30} {greedy_cloud:<15} {anneal_cloud:<15}")
-    print(f"  {'Local tasks (free)':<30} {greedy_local:<15} {anneal_local:<15}")
-    print(f"  {'Dep violations':<30} {greedy_dep_violations:<15} {anneal_dep_violations:<15}")
+    print("=" * 70, file=out)
+    print("  HEAD TO HEAD: GREEDY vs QUANTUM ANNEALING", file=out)
+    print("  10K CSS Renderer Task Routing", file=out)
+    print("=" * 70, file=out)
+    print(f"\n  {'Metric':<30} {'Greedy':<15} {'Annealing':<15}", file=out)
+    print(f"  {'─' * 62}", file=out)
+    print(f"  {'Tasks shipped':<30} {len(greedy_assignments):<15} {len(anneal_assignments):<15}", file=out)
+    print(f"  {'Tasks dropped':<30} {num_intents - len(greedy_assignments):<15} {unassigned:<15}", file=out)
+    print(f"  {'Money spent':<30} ${greedy_cost:<14.2f} ${money_spent:<14.2f}", file=out)
+    print(f"  {'Story points':<30} {greedy_sp:<15} {anneal_sp:<15}", file=out)
+    print(f"  {'Cost per SP':<30} ${greedy_cost_per_sp:<14.4f} ${anneal_cost_per_sp:<14.4f}", file=out)
+    print(f"  {'Cloud tasks':<30} {greedy_cloud:<15} {anneal_cloud:<15}", file=out)
+    print(f"  {'Local tasks (free)':<30} {greedy_local:<15} {anneal_local:<15}", file=out)
+    print(f"  {'Dep violations':<30} {greedy_dep_violations:<15} {anneal_dep_violations:<15}", file=out)
 
     # Insights
-    print()
+    print(file=out)
     if len(anneal_assignments) > len(greedy_assignments):
-        print(f"  → Annealing shipped {len(anneal_assignments) - len(greedy_assignments)} more tasks")
+        print(f"  → Annealing shipped {len(anneal_assignments) - len(greedy_assignments)} more tasks", file=out)
     if money_spent < greedy_cost:
-        print(f"  → Annealing saved ${greedy_cost - money_spent:.2f}")
+        print(f"  → Annealing saved ${greedy_cost - money_spent:.2f}", file=out)
     elif money_spent > greedy_cost:
-        print(f"  → Greedy was ${money_spent - greedy_cost:.2f} cheaper")
+        print(f"  → Greedy was ${money_spent - greedy_cost:.2f} cheaper", file=out)
     if anneal_sp > greedy_sp:
-        print(f"  → Annealing delivered {anneal_sp - greedy_sp} more story points")
+        print(f"  → Annealing delivered {anneal_sp - greedy_sp} more story points", file=out)
     if anneal_local > greedy_local:
-        print(f"  → Annealing used {anneal_local - greedy_local} more free local agents")
+        print(f"  → Annealing used {anneal_local - greedy_local} more free local agents", file=out)
     if greedy_dep_violations > anneal_dep_violations:
-        print(f"  → Annealing had {greedy_dep_violations - anneal_dep_violations} fewer dependency violations")
+        print(f"  → Annealing had {greedy_dep_violations - anneal_dep_violations} fewer dependency violations", file=out)
+
+    sys.stdout.write(out.getvalue())
 
 
 def print_pipeline_flow(assignments, intents, agents):
@@ -300,35 +396,33 @@ def print_pipeline_flow(assignments, intents, agents):
         intents: List of intent dicts
         agents: Dict of agent definitions
     """
-    print("\n" + "=" * 70)
-    print("  CSS PIPELINE FLOW ANALYSIS")
-    print("=" * 70)
+    out = io.StringIO()
+    print("\n" + "=" * 70, file=out)
+    print("  CSS PIPELINE FLOW ANALYSIS", file=out)
+    print("=" * 70, file=out)
+
+    stage_idx = _stage_index(intents)
+    stage_sizes = np.bincount(stage_idx[stage_idx >= 0], minlength=len(cfg.PIPELINE_STAGES))
+    row_of, _, quality, _ = _agent_columns(agents)
+    intent_idx, agent_row = _assignment_rows(assignments, row_of)
+    assigned_stage = stage_idx[intent_idx]
+    # Quality class per assigned task: 0 basic, 1 fair, 2 good, 3 excellent
+    assigned_class = np.searchsorted(_QUALITY_CUTS, quality[agent_row], side='right')
 
     # Analyze each stage
-    for stage in cfg.PIPELINE_STAGES:
-        stage_intents = [(i, intent) for i, intent in enumerate(intents) if intent['stage'] == stage]
-        assigned = [i for i, _ in stage_intents if i in assignments]
-
-        # Quality distribution
-        quality_dist = defaultdict(int)
-        for i in assigned:
-            q = agents[assignments[i]]['quality']
-            if q >= 0.9:
-                quality_dist['excellent (0.9+)'] += 1
-            elif q >= 0.8:
-                quality_dist['good (0.8-0.9)'] += 1
-            elif q >= 0.6:
-                quality_dist['fair (0.6-0.8)'] += 1
-            else:
-                quality_dist['basic (<0.6)'] += 1
-
-        print(f"\n  {stage.upper()}")
-        print(f"    Tasks: {len(assigned)}/{len(stage_intents)} assigned")
-        print(f"    Quality distribution:")
-        for q_class, count in sorted(quality_dist.items()):
-            pct = 100 * count / max(len(assigned), 1)
-            print(f"      {q_class}: {count} ({pct:.1f}%)")
-
+    for k, stage in enumerate(cfg.PIPELINE_STAGES):
+        class_counts = np.bincount(assigned_class[assigned_stage == k], minlength=len(_QUALITY_CLASSES))
+        num_assigned = int(class_counts.sum())
+
+        print(f"\n  {stage.upper()}", file=out)
+        print(f"    Tasks: {num_assigned}/{stage_sizes[k]} assigned", file=out)
+        print(f"    Quality distribution:", file=out)
+        for q_class, count in sorted(zip(_QUALITY_CLASSES, class_counts.tolist())):
+            if count:
+                pct = 100 * count / max(num_assigned, 1)
+                print(f"      {q_class}: {count} ({pct:.1f}%)", file=out)
+
+    sys.stdout.write(out.getvalue())
 
 if __name__ == '__main__':
     # Test reporting
@@ -11,12 +11,19 @@ same model are interchangeable). This reduces boolean variables from ~2.6M to
 Profile filtering (optional): when a staffing plan is provided, each intent is
 restricted to model types that match its assigned profile via PROFILE_AGENT_MODELS.
 This narrows the search space dramatically (typically 70-90% variable reduction).
+
+Repeated solves against one agent pool can share a CpSatBuilder, which keeps
+the pool-level setup; solve_cpsat is the one-shot wrapper.
 """
 
+import heapq
 import logging
+import os
 import time
 from collections import defaultdict
+from itertools import chain
 
+import numpy as np
 from ortools.sat.python import cp_model
 
 from . import css_renderer_config as cfg
@@ -31,14 +38,30 @@ logger = logging.getLogger(__name__)
 # by this factor, round to int, then divide back for reporting.
 COST_SCALE = 1_000_000
 
+# Leaving an intent unassigned costs this many times the most expensive
+# assignment in the problem, so the solver only does it when capacity
+# leaves no choice. (Dropping an intent never lowers a dependency penalty;
+# see the deficit constraints in CpSatBuilder.solve.)
+UNASSIGNED_PENALTY_FACTOR = 10
+
+# Largest objective coefficient we let CP-SAT see. Wide coefficient ranges
+# weaken its LP relaxation, so COST_SCALE is lowered for inputs whose
+# per-unit costs would exceed this.
+MAX_OBJECTIVE_COEFFICIENT = 1 << 28
+
 # Quality is stored as float 0.0–1.0. Scale to integers for CP-SAT.
 QUALITY_SCALE = 100
 
 
 def _build_model_types(agents, agent_names):
-    """Collapse identical agents into model types."""
+    """Collapse identical agents into model types.
+
+    One pass over the pool: each agent's type index is recorded as the
+    agent is folded into its type.
+    """
     type_map = {}  # model_type_name -> index in model_types
     model_types = []
+    type_index = {}
 
     for name in agent_names:
         a = agents[name]
@@ -56,18 +79,35 @@ def _build_model_types(agents, agent_names):
                 'instances': [],
                 'total_capacity': 0,
             })
-        idx = type_map[mt]
+        idx = type_index[name] = type_map[mt]
         model_types[idx]['instances'].append(name)
         model_types[idx]['total_capacity'] += a['capacity']
 
-    type_index = {}
-    for name in agent_names:
-        mt = agents[name]['model_type']
-        type_index[name] = type_map[mt]
-
     return model_types, type_index
 
 
+def _equivalent_type_groups(model_types, use_profiles):
+    """Group model types that are interchangeable in the CP-SAT model.
+
+    Two types are interchangeable when swapping every assignment between
+    them changes neither feasibility nor the objective: same token rate,
+    quality, latency, capabilities and total capacity, and (when profile
+    filtering is active) allowed by the same set of profiles.
+
+    Returns:
+        list of type-index lists, each with at least two types, in index order.
+    """
+    groups = defaultdict(list)
+    for t, mt in enumerate(model_types):
+        profiles = frozenset(
+            p for p, names in PROFILE_AGENT_MODELS.items() if mt['name'] in names
+        ) if use_profiles else None
+        key = (mt['token_rate'], mt['quality'], mt['latency'],
+               frozenset(mt['capabilities']), mt['total_capacity'], profiles)
+        groups[key].append(t)
+    return [ts for ts in groups.values() if len(ts) > 1]
+
+
 def _can_assign_type(intent, model_type):
     """Check if a model type can handle an intent."""
     if intent['complexity'] not in model_type['capabilities']:
@@ -86,6 +126,18 @@ def _get_cost_for_type(intent, model_type):
     return token_cost + overkill_cost + latency_cost
 
 
+def _objective_scale(max_coefficient):
+    """Integer-per-dollar scale for the CP-SAT objective.
+
+    ``COST_SCALE`` unless that would push the largest per-unit coefficient
+    (*max_coefficient*, in dollars) past ``MAX_OBJECTIVE_COEFFICIENT``; the
+    same scale is applied to every term so relative weights are preserved.
+    """
+    if max_coefficient <= 0:
+        return COST_SCALE
+    return max(1, min(COST_SCALE, int(MAX_OBJECTIVE_COEFFICIENT / max_coefficient)))
+
+
 def _build_profile_index(staffing_plan):
     """Build a flat mapping from intent ID to profile name.
 
@@ -147,13 +199,15 @@ def get_allowed_agents_for_intent(intent_idx, intents, agents, agent_names,
 
 
 def _get_allowed_model_types_for_intent(intent, model_types,
-                                        profile_index):
+                                        profile_index, capability_valid=None):
     """Return the set of model-type indices allowed for *intent*.
 
     Applies both the capability check (``_can_assign_type``) and the
     profile filter.  *profile_index* is a dict ``{intent_id: profile}``
     built by ``_build_profile_index`` or ``None`` when no staffing plan
-    is active.
+    is active.  *capability_valid* optionally supplies the
+    capability-valid type indices (e.g. a row of ``_eligibility_mask``)
+    so they are not recomputed.
 
     Returns:
         (allowed_indices, was_filtered):
@@ -162,10 +216,10 @@ def _get_allowed_model_types_for_intent(intent, model_types,
                               type that would have been capability-valid
     """
     # First pass: capability-valid types
-    capability_valid = []
-    for t, mt in enumerate(model_types):
-        if _can_assign_type(intent, mt):
-            capability_valid.append(t)
+    if capability_valid is None:
+        capability_valid = [
+            t for t, mt in enumerate(model_types) if _can_assign_type(intent, mt)
+        ]
 
     if profile_index is None:
         return capability_valid, False
@@ -188,226 +242,521 @@ def _get_allowed_model_types_for_intent(intent, model_types,
     return profile_valid, was_filtered
 
 
-def solve_cpsat(intents, agents, agent_names, time_limit=cfg.CLASSICAL_TIME_BUDGET,
-                staffing_plan=None):
-    """Solve the 10K assignment problem using OR-Tools CP-SAT.
+def _dependency_edges(intents):
+    """(i, dep_idx) for every ``depends`` entry that names an intent in *intents*.
 
-    Args:
-        intents: List of intent dicts.
-        agents: Agent pool dict keyed by agent name.
-        agent_names: Ordered list of agent names.
-        time_limit: CP-SAT solver time limit in seconds.
-        staffing_plan: Optional staffing plan from ``generate_staffing_plan()``.
-            When provided, each intent is restricted to model types matching
-            its assigned profile via ``PROFILE_AGENT_MODELS``.  When ``None``,
-            no profile filtering is applied (original behavior).
+    Wave subsets (see hybrid_router._solve_wave_decomposed) keep their
+    global ``depends`` indices, so entries outside ``range(len(intents))``
+    -- including negative ones -- are skipped rather than indexed.
+    """
+    num_intents = len(intents)
+    return [
+        (i, dep_idx)
+        for i, intent in enumerate(intents)
+        for dep_idx in intent.get('depends', ())
+        if 0 <= dep_idx < num_intents
+    ]
+
+
+def _prune_dominated_types(intents, types_by_intent, cost, model_types):
+    """Drop types that can never be optimal for an intent, in place.
+
+    Only intents with no dependency edges in either direction are pruned:
+    their objective is just the assignment cost. For such an intent, a
+    type is dominated when some allowed type is strictly cheaper and has
+    capacity for every intent that could use it; moving the intent there
+    is always feasible and lowers the cost. Types tied on cost are kept,
+    which preserves the symmetry between interchangeable types.
 
     Returns:
-        dict mapping intent index to assigned agent name, or empty dict
-        if no feasible solution is found.
+        Number of (intent, type) pairs removed.
     """
-    num_intents = len(intents)
-    model_types, _ = _build_model_types(agents, agent_names)
-    num_types = len(model_types)
-
-    # Build profile index for fast lookup (None when no plan provided)
-    profile_index = (
-        _build_profile_index(staffing_plan) if staffing_plan is not None
-        else None
-    )
-
-    filtering_label = " (with profile filtering)" if staffing_plan else ""
-    print(f"Building CP-SAT model{filtering_label}: "
-          f"{num_intents} tasks x {num_types} model types")
-    build_start = time.time()
-
-    model = cp_model.CpModel()
-
-    # --- Decision variables: x[i, t] = 1 iff intent i assigned to model type t ---
-    x = {}
-    valid_types_for_intent = defaultdict(list)
-    vars_without_filtering = 0
-    vars_eliminated_by_profile = 0
-
-    for i, intent in enumerate(intents):
-        allowed, was_filtered = _get_allowed_model_types_for_intent(
-            intent, model_types, profile_index
-        )
+    counts = np.bincount(
+        np.fromiter(chain.from_iterable(types_by_intent), dtype=np.int64),
+        minlength=len(model_types))
+    unbounded = [mt['total_capacity'] >= c for mt, c in zip(model_types, counts)]
+    if not any(unbounded):
+        return 0
+
+    linked = set(chain.from_iterable(_dependency_edges(intents)))
+
+    removed = 0
+    cost_rows = cost.tolist()
+    for i, allowed in enumerate(types_by_intent):
+        if i in linked or len(allowed) < 2:
+            continue
+        costs = cost_rows[i]
+        best = min((costs[t] for t in allowed if unbounded[t]), default=None)
+        if best is None:
+            continue
+        kept = [t for t in allowed if costs[t] <= best]
+        removed += len(allowed) - len(kept)
+        types_by_intent[i] = kept
+    return removed
 
-        # Count capability-valid types (what we would have without filtering)
-        capability_valid_count = sum(
-            1 for t, mt in enumerate(model_types)
-            if _can_assign_type(intent, mt)
-        )
-        vars_without_filtering += capability_valid_count
 
-        for t in allowed:
-            x[i, t] = model.new_bool_var(f'x_{i}_{t}')
-            valid_types_for_intent[i].append(t)
+def _default_num_workers():
+    """CP-SAT worker count: the usable CPUs, but at least the 8 that the
+    full search portfolio needs."""
+    if hasattr(os, 'sched_getaffinity'):
+        cpus = len(os.sched_getaffinity(0))
+    else:
+        cpus = os.cpu_count() or 1
+    return max(8, cpus)
 
-        # Track how many variables were eliminated by profile filtering
-        vars_eliminated_by_profile += capability_valid_count - len(allowed)
 
-    print(f"  Boolean variables: {len(x):,}")
+class CpSatBuilder:
+    """Builds and solves the CP-SAT routing model for one agent pool.
 
-    # Log profile filtering statistics
-    if staffing_plan is not None:
-        if vars_without_filtering > 0:
-            pct = vars_eliminated_by_profile / vars_without_filtering * 100
-        else:
-            pct = 0.0
-        msg = (f"  Profile filtering: {vars_eliminated_by_profile:,} of "
-               f"{vars_without_filtering:,} variables eliminated "
-               f"({pct:.0f}% reduction)")
-        print(msg)
-        logger.info(msg)
-
-    # --- Constraints ---
-    for i in range(num_intents):
-        if valid_types_for_intent[i]:
-            model.add_exactly_one(x[i, t] for t in valid_types_for_intent[i])
-    for t, mt in enumerate(model_types):
-        model.add(sum(x[i, t] for i in range(num_intents) if (i, t) in x) <= mt['total_capacity'])
-
-    # --- Objective Function ---
-    objective_terms = []
-
-    # 1. Base assignment cost
-    for (i, t), var in x.items():
-        cost = _get_cost_for_type(intents[i], model_types[t])
-        objective_terms.append(int(cost * COST_SCALE) * var)
-
-    # 2. Deadline penalty
-    for i, intent in enumerate(intents):
-        if intent.get('deadline', -1) >= 0:
-            urgency = (PROJECT_DURATION_DAYS - intent['deadline']) / PROJECT_DURATION_DAYS
-            deadline_penalty = int(urgency * cfg.DEADLINE_WEIGHT * COST_SCALE)
-            if deadline_penalty > 0:
-                for t in valid_types_for_intent[i]:
-                    objective_terms.append(deadline_penalty * x[i, t])
-
-    # 3. Dependency quality penalty
-    dep_penalty_scaled = int(cfg.DEP_PENALTY * COST_SCALE)
-    for i, intent in enumerate(intents):
-        for dep_idx in intent.get('depends', []):
-            if not valid_types_for_intent[i] or not valid_types_for_intent[dep_idx]:
-                continue
-            
-            q_i = sum(int(model_types[t]['quality'] * QUALITY_SCALE) * x[i, t] for t in valid_types_for_intent[i])
-            q_dep = sum(int(model_types[t]['quality'] * QUALITY_SCALE) * x[dep_idx, t] for t in valid_types_for_intent[dep_idx])
-            
-            deficit = model.new_int_var(0, QUALITY_SCALE, f'def_{i}_{dep_idx}')
-            model.add(deficit >= q_dep - q_i)
-            objective_terms.append(dep_penalty_scaled * deficit)
-
-    # 4. Context affinity bonus
-    affinity_bonus_scaled = int(cfg.CONTEXT_BONUS * COST_SCALE)
-    for i, intent in enumerate(intents):
-        for dep_idx in intent.get('depends', []):
-            for t in valid_types_for_intent[i]:
-                if t in valid_types_for_intent[dep_idx]:
-                    # affinity_var == 1 only when both i and dep_idx use type t
-                    affinity_var = model.new_bool_var(f'aff_{i}_{dep_idx}_{t}')
-                    model.add_implication(affinity_var, x[i, t])
-                    model.add_implication(affinity_var, x[dep_idx, t])
-                    model.add_bool_or([affinity_var, x[i, t].Not(), x[dep_idx, t].Not()])
-                    objective_terms.append(-affinity_bonus_scaled * affinity_var)
-
-    model.minimize(sum(objective_terms))
-    build_time = time.time() - build_start
-    print(f"  Model build time: {build_time:.1f}s")
-
-    # --- Solve ---
-    print(f"\nSolving with CP-SAT (time limit: {time_limit}s)...")
-    solver = cp_model.CpSolver()
-    solver.parameters.max_time_in_seconds = time_limit
-    solver.parameters.log_search_progress = True
-    solver.parameters.num_workers = 0
-
-    solve_start = time.time()
-    status = solver.solve(model)
-    solve_time = time.time() - solve_start
-
-    print(f"\nSolver status: {solver.status_name(status)} in {solve_time:.1f}s")
-
-    if status in (cp_model.OPTIMAL, cp_model.FEASIBLE):
-        # ... (rest of the function is for extracting results and remains the same)
-        # Extract type-level assignments, then distribute to individual agents
-        type_assignments = {}  # intent_idx -> model_type_index
+    Everything that depends only on the pool is computed once here: the
+    collapse into model types, per-type NumPy arrays, capability rows and
+    symmetry groups. Each ``solve()`` builds a fresh model for its intents
+    on top of that, so repeated solves against the same pool (e.g. a
+    large-neighbourhood search re-solving perturbed intent sets) skip the
+    pool work.
+    """
+
+    def __init__(self, agents, agent_names):
+        self.agents = agents
+        self.agent_names = agent_names
+        self.model_types, self.type_index = _build_model_types(agents, agent_names)
+        self.token_rate = np.array([mt['token_rate'] for mt in self.model_types], dtype=np.float64)
+        self.quality = np.array([mt['quality'] for mt in self.model_types], dtype=np.float64)
+        self.latency = np.array([mt['latency'] for mt in self.model_types], dtype=np.float64)
+        # Capability labels as bit positions: capability_bits[t] has bit k set
+        # when type t handles label k, so eligibility is a shift and an AND.
+        labels = sorted(set().union(*(mt['capabilities'] for mt in self.model_types)))
+        if len(labels) > 63:
+            raise ValueError(f"{len(labels)} capability labels exceed the 63-bit mask")
+        self.complexity_code = {label: k for k, label in enumerate(labels)}
+        self.capability_bits = np.array(
+            [sum(1 << self.complexity_code[c] for c in mt['capabilities'])
+             for mt in self.model_types], dtype=np.int64)
+        self._symmetry_groups = {}  # use_profiles -> _equivalent_type_groups()
+
+    def _equivalent_type_groups(self, use_profiles):
+        groups = self._symmetry_groups.get(use_profiles)
+        if groups is None:
+            groups = self._symmetry_groups[use_profiles] = _equivalent_type_groups(
+                self.model_types, use_profiles)
+        return groups
+
+    def _eligibility_mask(self, intents):
+        """Vectorized ``_can_assign_type`` over every (intent, model type) pair.
+
+        Complexities are mapped to integer codes (-1 when no type lists them)
+        and tested against ``capability_bits``; the quality check is a single
+        broadcast compare.
+
+        Returns:
+            bool array of shape (len(intents), len(model_types)).
+        """
+        n = len(intents)
+        codes = self.complexity_code
+        complexity = np.fromiter(
+            (codes.get(it['complexity'], -1) for it in intents), dtype=np.int64, count=n)
+        known = complexity >= 0
+        capable = (self.capability_bits[None, :] >> np.where(known, complexity, 0)[:, None]) & 1
+        min_q = np.fromiter((it['min_quality'] for it in intents), dtype=np.float64, count=n)
+        return (capable == 1) & known[:, None] & (self.quality[None, :] >= min_q[:, None])
+
+    def _cost_matrix(self, intents):
+        """Dollar cost of every (intent, model type) pair.
+
+        Vectorized form of ``_get_cost_for_type`` (same operations in the same
+        order).
+
+        Returns:
+            float64 array of shape (len(intents), len(model_types)).
+        """
+        n = len(intents)
+        tokens = np.fromiter((it['estimated_tokens'] for it in intents), dtype=np.float64, count=n)
+        min_q = np.fromiter((it['min_quality'] for it in intents), dtype=np.float64, count=n)
+
+        token_cost = tokens[:, None] * self.token_rate[None, :]
+        overkill_cost = (self.quality[None, :] - min_q[:, None]) * token_cost * cfg.OVERKILL_WEIGHT
+        latency_cost = self.latency * cfg.LATENCY_WEIGHT
+        return token_cost + overkill_cost + latency_cost[None, :]
+
+    def solve(self, intents, time_limit=cfg.CLASSICAL_TIME_BUDGET, staffing_plan=None,
+              num_workers=None, linearization_level=2, use_greedy_hint=True,
+              solver_params=None):
+        """Solve the 10K assignment problem using OR-Tools CP-SAT.
+
+        Args:
+            intents: List of intent dicts.
+            time_limit: CP-SAT solver time limit in seconds.
+            staffing_plan: Optional staffing plan from ``generate_staffing_plan()``.
+                When provided, each intent is restricted to model types matching
+                its assigned profile via ``PROFILE_AGENT_MODELS``.  When ``None``,
+                no profile filtering is applied (original behavior).
+            num_workers: CP-SAT parallel search workers. ``None`` uses the
+                number of usable CPUs, with a floor of 8 so every portfolio
+                strategy runs.
+            linearization_level: CP-SAT ``linearization_level``. 2 (the
+                default here) adds the full LP relaxation, which pays off on
+                this dense 0/1 objective.
+            use_greedy_hint: Seed the search with ``greedy_solve``'s assignment
+                as a solution hint. Disable to benchmark the cold solver.
+            solver_params: Optional dict of extra ``SatParameters`` fields
+                (e.g. ``{"cp_model_probing_level": 1, "use_lns_only": True}``),
+                applied after the settings above so they can override them.
+                Lets callers tune the solver per workload without code changes.
+
+        Returns:
+            dict mapping intent index to assigned agent name. Intents with no
+            eligible type, or left over when capacity runs out, are absent.
+            Empty dict if the solver finds no solution within the time limit.
+        """
+        num_intents = len(intents)
+        model_types, type_index = self.model_types, self.type_index
+        num_types = len(model_types)
+
+        # Build profile index for fast lookup (None when no plan provided)
+        profile_index = (
+            _build_profile_index(staffing_plan) if staffing_plan is not None
+            else None
+        )
+
+        filtering_label = " (with profile filtering)" if staffing_plan else ""
+        print(f"Building CP-SAT model{filtering_label}: "
+              f"{num_intents} tasks x {num_types} model types")
+        build_start = time.time()
+
+        model = cp_model.CpModel()
+
+        # --- Decision variables: x[i][t] = 1 iff intent i assigned to model type t ---
+        # x[i] is a dense row (None where type t is not allowed); types_by_intent[i]
+        # lists the allowed types and vars_by_type[t] is the transpose, so no
+        # lookup below needs to hash an (i, t) key or scan for membership.
+        x = [[None] * num_types for _ in range(num_intents)]
+        types_by_intent = [[] for _ in range(num_intents)]
+        vars_by_type = [[] for _ in range(num_types)]
+        num_vars = 0
+        vars_without_filtering = 0
+        vars_eliminated_by_profile = 0
+
+        eligible = self._eligibility_mask(intents)
+        for i, intent in enumerate(intents):
+            capability_valid = np.flatnonzero(eligible[i]).tolist()
+            allowed, was_filtered = _get_allowed_model_types_for_intent(
+                intent, model_types, profile_index, capability_valid
+            )
+
+            # Count capability-valid types (what we would have without filtering)
+            capability_valid_count = len(capability_valid)
+            vars_without_filtering += capability_valid_count
+            types_by_intent[i] = allowed
+
+            # Track how many variables were eliminated by profile filtering
+            vars_eliminated_by_profile += capability_valid_count - len(allowed)
+
+        cost = self._cost_matrix(intents)
+        vars_dominated = _prune_dominated_types(intents, types_by_intent, cost, model_types)
+
+        for i, allowed in enumerate(types_by_intent):
+            row = x[i]
+            for t in allowed:
+                var = model.new_bool_var(f'x_{i}_{t}')
+                row[t] = var
+                vars_by_type[t].append(var)
+            num_vars += len(allowed)
+
+        print(f"  Boolean variables: {num_vars:,}")
+        if vars_dominated:
+            print(f"  Dominance pruning: {vars_dominated:,} variables eliminated")
+
+        # Log profile filtering statistics
+        if staffing_plan is not None:
+            if vars_without_filtering > 0:
+                pct = vars_eliminated_by_profile / vars_without_filtering * 100
+            else:
+                pct = 0.0
+            msg = (f"  Profile filtering: {vars_eliminated_by_profile:,} of "
+                   f"{vars_without_filtering:,} variables eliminated "
+                   f"({pct:.0f}% reduction)")
+            print(msg)
+            logger.info(msg)
+
+        # --- Constraints ---
+        # At most one type per intent. unassigned[i] is the explicit slack of that
+        # row (exactly one of the row and it is true): it carries the unassigned
+        # penalty and stands in for the intent's quality in its dependency
+        # constraints, so a capacity shortfall degrades to a partial assignment
+        # instead of an infeasible model.
+        unassigned = [None] * num_intents
+        for i in range(num_intents):
+            if types_by_intent[i]:
+                u = unassigned[i] = model.new_bool_var(f'u_{i}')
+                model.add_exactly_one([x[i][t] for t in types_by_intent[i]] + [u])
+        for t, mt in enumerate(model_types):
+            model.add(cp_model.LinearExpr.sum(vars_by_type[t]) <= mt['total_capacity'])
+
+        # Symmetry breaking: within a group of interchangeable types, any
+        # solution can be relabelled so earlier types carry at least as many
+        # tasks as later ones.
+        for group in self._equivalent_type_groups(profile_index is not None):
+            for t1, t2 in zip(group, group[1:]):
+                model.add(cp_model.LinearExpr.sum(vars_by_type[t1])
+                          >= cp_model.LinearExpr.sum(vars_by_type[t2]))
+            print(f"  Symmetry breaking: {', '.join(model_types[t]['name'] for t in group)} "
+                  f"are interchangeable")
+
+        # --- Objective Function ---
+        # Terms are collected as parallel (variable, coefficient) lists and handed
+        # to LinearExpr.weighted_sum in one call; summing `coeff * var` products
+        # in Python would build the expression one __add__ at a time.
+        obj_vars = []
+        obj_coeffs = []
+
+        # All terms share one scale, rounded half-to-even.
+        max_cost = float(np.abs(cost).max()) if cost.size else 0.0
+        scale = _objective_scale(max(
+            UNASSIGNED_PENALTY_FACTOR * max_cost,
+            cfg.DEP_PENALTY, cfg.CONTEXT_BONUS, cfg.DEADLINE_WEIGHT,
+        ))
+        if scale != COST_SCALE:
+            print(f"  Objective scale: {scale:,} per $ (COST_SCALE {COST_SCALE:,})")
+
+        # 1. Base assignment cost
+        cost_int = np.rint(cost * scale).astype(np.int64)
+        unassigned_penalty = UNASSIGNED_PENALTY_FACTOR * int(cost_int.max(initial=0)) + 1
+        cost_int = cost_int.tolist()
         for i in range(num_intents):
-            for t in valid_types_for_intent[i]:
-                if solver.value(x[i, t]):
-                    type_assignments[i] = t
-                    break
+            row, costs = x[i], cost_int[i]
+            for t in types_by_intent[i]:
+                obj_vars.append(row[t])
+                obj_coeffs.append(costs[t])
+
+        # 2. Deadline penalty
+        # Every type of an intent carries the same penalty and exactly one of
+        # them is chosen, so the penalty is a constant: it goes into the
+        # objective offset (keeping reported objective values unchanged)
+        # rather than onto each x[i][t].
+        deadline_constant = 0
+        for i, intent in enumerate(intents):
+            if intent.get('deadline', -1) >= 0 and types_by_intent[i]:
+                urgency = (PROJECT_DURATION_DAYS - intent['deadline']) / PROJECT_DURATION_DAYS
+                deadline_penalty = round(urgency * cfg.DEADLINE_WEIGHT * scale)
+                if deadline_penalty > 0:
+                    deadline_constant += deadline_penalty
+
+        # 3. Dependency quality penalty
+        # The deficit of an edge is at most max(q_dep) - min(q_i) over the allowed
+        # types; when that is <= 0 the penalty is provably zero and the edge
+        # needs no variable at all. An unassigned endpoint contributes its
+        # worst-case quality (q_max for the dependency, q_min for the
+        # dependent), so dropping an intent can never shrink a deficit and the
+        # unassigned penalty need not grow with the intent's edges.
+        dep_penalty_scaled = round(cfg.DEP_PENALTY * scale)
+        quality_int = [int(mt['quality'] * QUALITY_SCALE) for mt in model_types]
+        q_min = [min((quality_int[t] for t in ts), default=0) for ts in types_by_intent]
+        q_max = [max((quality_int[t] for t in ts), default=0) for ts in types_by_intent]
+        # Assigned-quality expression per intent, built on first use and shared
+        # by every edge the intent appears in.
+        q_expr = [None] * num_intents
+
+        def quality_expr(k):
+            if q_expr[k] is None:
+                ts = types_by_intent[k]
+                q_expr[k] = cp_model.LinearExpr.weighted_sum(
+                    [x[k][t] for t in ts], [quality_int[t] for t in ts])
+            return q_expr[k]
+
+        dep_edges = _dependency_edges(intents)
+        for i, dep_idx in dep_edges:
+            if not types_by_intent[i] or not types_by_intent[dep_idx]:
+                continue
+            max_deficit = q_max[dep_idx] - q_min[i]
+            if max_deficit <= 0:
+                continue
 
-        assignments = _distribute_to_instances(type_assignments, model_types,
-                                               intents, agents)
+            deficit = model.new_int_var(0, max_deficit, f'def_{i}_{dep_idx}')
+            model.add(deficit >= quality_expr(dep_idx) + q_max[dep_idx] * unassigned[dep_idx]
+                      - quality_expr(i) - q_min[i] * unassigned[i])
+            obj_vars.append(deficit)
+            obj_coeffs.append(dep_penalty_scaled)
+
+        # Unassigned penalty, per intent that has a slack literal.
+        for u in unassigned:
+            if u is not None:
+                obj_vars.append(u)
+                obj_coeffs.append(unassigned_penalty)
+
+        # 4. Context affinity bonus
+        affinity_bonus_scaled = round(cfg.CONTEXT_BONUS * scale)
+        for i, dep_idx in dep_edges:
+            row, types_i = x[i], types_by_intent[i]
+            # Dense rows make "does dep_idx allow t" an index, so the types
+            # both ends share cost O(|types_i|) per edge, not a set build.
+            dep_row = x[dep_idx]
+            for t in [t for t in types_i if dep_row[t] is not None]:
+                # affinity_var can only be 1 when both i and dep_idx use
+                # type t; its objective coefficient is negative, so the
+                # solver sets it to exactly that AND without a third
+                # "both imply affinity" clause.
+                affinity_var = model.new_bool_var(f'aff_{i}_{dep_idx}_{t}')
+                model.add_implication(affinity_var, row[t])
+                model.add_implication(affinity_var, dep_row[t])
+                obj_vars.append(affinity_var)
+                obj_coeffs.append(-affinity_bonus_scaled)
+
+        model.minimize(cp_model.LinearExpr.weighted_sum(obj_vars, obj_coeffs)
+                       + deadline_constant)
+
+        # --- Warm start: hint the greedy assignment where the model allows it ---
+        if use_greedy_hint:
+            # Greedy over the same agents the model uses: agent_names may be
+            # a subset of the pool (e.g. HybridRouter.route(agent_names=...)).
+            if len(self.agent_names) == len(self.agents):
+                hint_pool = self.agents
+            else:
+                hint_pool = {name: self.agents[name] for name in self.agent_names}
+            greedy, _ = greedy_solve(intents, hint_pool)
+            hinted = 0
+            for i, name in greedy.items():
+                row, chosen = x[i], type_index[name]
+                if row[chosen] is None:
+                    continue  # greedy picked a type the profile filter removed
+                for t in types_by_intent[i]:
+                    model.add_hint(row[t], 1 if t == chosen else 0)
+                model.add_hint(unassigned[i], 0)
+                hinted += 1
+            # Tasks greedy could not place are hinted as unassigned, which keeps
+            # the hint complete under capacity pressure.
+            for i, u in enumerate(unassigned):
+                if u is not None and i not in greedy:
+                    for t in types_by_intent[i]:
+                        model.add_hint(x[i][t], 0)
+                    model.add_hint(u, 1)
+            print(f"  Greedy hint: {hinted:,}/{num_intents:,} tasks")
+
+        build_time = time.time() - build_start
+        print(f"  Model build time: {build_time:.1f}s")
+
+        # --- Solve ---
+        print(f"\nSolving with CP-SAT (time limit: {time_limit}s)...")
+        solver = cp_model.CpSolver()
+        solver.parameters.max_time_in_seconds = time_limit
+        solver.parameters.log_search_progress = True
+        solver.parameters.num_workers = (
+            _default_num_workers() if num_workers is None else num_workers
+        )
+        solver.parameters.linearization_level = linearization_level
+        # Also CP-SAT's current default; pinned because interchangeable model
+        # types leave symmetry that presolve should keep exploiting.
+        solver.parameters.symmetry_level = 2
+        for name, value in (solver_params or {}).items():
+            setattr(solver.parameters, name, value)
+
+        solve_start = time.time()
+        status = solver.solve(model)
+        solve_time = time.time() - solve_start
+
+        print(f"\nSolver status: {solver.status_name(status)} in {solve_time:.1f}s")
+
+        if status in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+            # Extract type-level assignments, then distribute to individual agents
+            type_assignments = {}  # intent_idx -> model_type_index
+            for i in range(num_intents):
+                for t in types_by_intent[i]:
+                    if solver.value(x[i][t]):
+                        type_assignments[i] = t
+                        break
+
+            assignments = _distribute_to_instances(type_assignments, model_types,
+                                                       intents, self.agents)
+
+            print(f"Assigned {len(assignments)}/{num_intents} tasks")
+            if len(assignments) < num_intents:
+                logger.warning("%d of %d tasks left unassigned",
+                               num_intents - len(assignments), num_intents)
+            return assignments
+        else:
+            print("No feasible solution found.")
+            return {}
 
-        print(f"Assigned {len(assignments)}/{num_intents} tasks")
-        return assignments
-    else:
-        print("No feasible solution found.")
-        return {}
+
+def solve_cpsat(intents, agents, agent_names, time_limit=cfg.CLASSICAL_TIME_BUDGET,
+                staffing_plan=None, num_workers=None, linearization_level=2,
+                use_greedy_hint=True, solver_params=None):
+    """Solve the 10K assignment problem using OR-Tools CP-SAT.
+
+    One-shot wrapper around ``CpSatBuilder(agents, agent_names).solve(...)``;
+    see ``CpSatBuilder.solve`` for the arguments and return value. Build a
+    ``CpSatBuilder`` directly to reuse the pool setup across solves.
+    """
+    return CpSatBuilder(agents, agent_names).solve(
+        intents, time_limit=time_limit, staffing_plan=staffing_plan,
+        num_workers=num_workers, linearization_level=linearization_level,
+        use_greedy_hint=use_greedy_hint, solver_params=solver_params)
 
 
 def _distribute_to_instances(type_assignments, model_types, intents, agents):
-    """Map model-type assignments to individual agent instances."""
-    instance_load = defaultdict(int)
-    next_instance = defaultdict(int)
+    """Map model-type assignments to individual agent instances.
+
+    Each type keeps a heap of ``(load, instance_index)``; every intent goes
+    to the least-loaded instance of its type (lowest index on ties, which
+    reproduces round-robin while loads are even). An instance therefore
+    only exceeds its capacity once every instance of the type is full, and
+    the overflow is spread evenly instead of piling onto the first one.
+    """
+    heaps = [None] * len(model_types)
     assignments = {}
 
     for i, t in sorted(type_assignments.items()):
-        mt = model_types[t]
-        instances = mt['instances']
-        num_instances = len(instances)
-        per_instance_cap = mt['capacity']
-
-        assigned = False
-        for _ in range(num_instances):
-            idx = next_instance[t] % num_instances
-            instance_name = instances[idx]
-            next_instance[t] += 1
-
-            if instance_load[instance_name] < per_instance_cap:
-                assignments[i] = instance_name
-                instance_load[instance_name] += 1
-                assigned = True
-                break
-        
-        if not assigned:
-            assignments[i] = instances[0]
-            instance_load[instances[0]] += 1
+        heap = heaps[t]
+        if heap is None:
+            heap = heaps[t] = [(0, k) for k in range(len(model_types[t]['instances']))]
+        load, k = heap[0]
+        heapq.heapreplace(heap, (load + 1, k))
+        assignments[i] = model_types[t]['instances'][k]
 
     return assignments
 
 
 def greedy_solve(intents, agents):
-    """Greedy baseline: cheapest valid agent, first come first served."""
+    """Greedy baseline: cheapest valid agent, first come first served.
+
+    For a positive token count, "cheapest" only depends on the agent's
+    token rate, so each (complexity, min_quality) class has a fixed
+    preference order: its eligible agents sorted by rate, pool order on
+    ties. Agents only ever fill up, so a per-class cursor that skips full
+    agents finds the choice in amortized O(1). Zero-token intents cost the
+    same everywhere and take the first eligible agent in pool order, as in
+    the original scan over ``agents``.
+    """
     names = list(agents.keys())
+    rates = np.array([agents[n]['token_rate'] for n in names], dtype=np.float64)
+    quality = np.array([agents[n]['quality'] for n in names], dtype=np.float64)
+    caps = [agents[n]['capacity'] for n in names]
+    load = [0] * len(names)
+    orders = {}   # (complexity, min_quality, by_rate) -> [order, cursor]
     result = {}
-    load = {a: 0 for a in agents}
     cost = 0
 
     for idx, intent in enumerate(intents):
-        best = None
-        best_cost = float('inf')
-
-        for name in names:
-            a = agents[name]
-            if not can_assign(intent, name, agents):
-                continue
-            if load[name] >= a['capacity']:
-                continue
-
-            task_cost = intent['estimated_tokens'] * a['token_rate']
-            if task_cost < best_cost:
-                best_cost = task_cost
-                best = name
+        tokens = intent['estimated_tokens']
+        key = (intent['complexity'], intent['min_quality'], tokens > 0)
+        entry = orders.get(key)
+        if entry is None:
+            eligible = np.flatnonzero(np.array(
+                [key[0] in agents[n]['capabilities'] for n in names], dtype=bool
+            ) & (quality >= key[1]))
+            if key[2]:
+                eligible = eligible[np.argsort(rates[eligible], kind='stable')]
+            entry = orders[key] = [eligible.tolist(), 0]
+
+        order, cursor = entry
+        while cursor < len(order) and load[order[cursor]] >= caps[order[cursor]]:
+            cursor += 1
+        entry[1] = cursor
+        if cursor == len(order):
+            continue
 
-        if best:
-            result[idx] = best
-            load[best] += 1
-            cost += intent['estimated_tokens'] * agents[best]['token_rate']
+        best = order[cursor]
+        result[idx] = names[best]
+        load[best] += 1
+        cost += tokens * agents[names[best]]['token_rate']
 
     return result, cost
-    cost
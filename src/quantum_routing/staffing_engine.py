@@ -15,8 +15,9 @@ Accepts intent objects from any of the three decomposers:
 from __future__ import annotations
 
 import json
-from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional, Sequence, Set, Union
+from dataclasses import dataclass, field, fields, is_dataclass
+from operator import attrgetter, itemgetter
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Tuple, Union
 
 
 # ---------------------------------------------------------------------------
@@ -209,15 +210,49 @@ def _get_id(intent: Any) -> str:
     return intent.id
 
 
-def _get_deps(intent: Any) -> List[str]:
-    """Return the dependency list, probing ``depends`` then ``dependencies``."""
+def _get_deps(intent: Any) -> Sequence[str]:
+    """Return the dependency IDs, probing ``depends`` then ``dependencies``.
+
+    The intent's own sequence is returned, not a copy.
+    """
     if isinstance(intent, dict):
-        return list(intent.get("depends", intent.get("dependencies", [])))
-    if hasattr(intent, "depends") and intent.depends:
-        return list(intent.depends)
-    if hasattr(intent, "dependencies") and intent.dependencies:
-        return list(intent.dependencies)
-    return []
+        return _get_dict_deps(intent)
+    return getattr(intent, "depends", None) or getattr(intent, "dependencies", None) or ()
+
+
+def _get_dict_deps(intent: Dict[str, Any]) -> Sequence[str]:
+    """_get_deps for a plain-dict intent."""
+    deps = intent.get("depends")
+    if deps is None:
+        deps = intent.get("dependencies")
+    return deps or ()
+
+
+def _accessors(
+    intents: Sequence[Any],
+) -> Tuple[Callable[[Any], str], Callable[[Any], Sequence[str]]]:
+    """Pick ID/dependency getters specialised for *intents*.
+
+    Real inputs come from one decomposer, so every intent shares a type.
+    When they do, return getters for that type (``operator`` getters for
+    dataclasses whose declared fields include only one of
+    ``depends``/``dependencies``). Mixed lists (e.g. dicts alongside
+    dataclasses) and other objects, whose attributes may differ from one
+    instance to the next, get the generic per-intent _get_id/_get_deps.
+    The dependency getter may return None for an intent with no
+    dependencies.
+    """
+    kind = type(intents[0]) if intents else dict
+    if any(type(intent) is not kind for intent in intents):
+        return _get_id, _get_deps
+    if issubclass(kind, dict):
+        return itemgetter("id"), _get_dict_deps
+    if is_dataclass(kind):
+        names = {f.name for f in fields(kind)}
+        has_depends = "depends" in names
+        if has_depends != ("dependencies" in names):
+            return attrgetter("id"), attrgetter("depends" if has_depends else "dependencies")
+    return _get_id, _get_deps
 
 
 def _get_estimated_tokens(intent: Any) -> int:
@@ -238,107 +273,238 @@ def _get_complexity(intent: Any) -> str:
 # Wave scheduler (topological-level decomposition via Kahn's algorithm)
 # ---------------------------------------------------------------------------
 
-def compute_waves(intents: Sequence[Any]) -> List[List[Any]]:
-    """Partition *intents* into parallel execution waves.
+def _normalize(
+    intents: Sequence[Any],
+) -> Tuple[List[str], List[Tuple[str, ...]], List[List[int]]]:
+    """Resolve every intent's ID and dependencies in a single pass.
 
-    Wave 0 contains intents with no dependencies. Wave N contains intents
-    whose deps are all in waves < N.
+    Returns ``(ids, deps, deps_idx)``: ``deps[k]`` is intent *k*'s raw
+    dependency IDs and ``deps_idx[k]`` the positions in *intents* they
+    refer to.
 
-    Raises ValueError on circular deps or missing dependency references.
+    Raises ValueError on a dependency that references an unknown ID.
     """
-    if not intents:
-        return []
-
-    id_to_intent: Dict[str, Any] = {}
-    for intent in intents:
-        id_to_intent[_get_id(intent)] = intent
-
-    # Validate: every dependency must reference a known intent
-    for intent in intents:
-        iid = _get_id(intent)
-        for dep in _get_deps(intent):
-            if dep not in id_to_intent:
+    get_id, get_deps = _accessors(intents)
+    ids = [get_id(intent) for intent in intents]
+    deps = [tuple(get_deps(intent) or ()) for intent in intents]
+    id_to_idx = {iid: k for k, iid in enumerate(ids)}
+
+    deps_idx: List[List[int]] = []
+    for iid, raw in zip(ids, deps):
+        resolved: List[int] = []
+        for dep in raw:
+            k = id_to_idx.get(dep)
+            if k is None:
                 raise ValueError(
                     f"Intent '{iid}' depends on '{dep}', "
                     f"which does not exist. "
-                    f"Known IDs: {sorted(id_to_intent.keys())}"
+                    f"Known IDs: {sorted(id_to_idx.keys())}"
                 )
+            resolved.append(k)
+        deps_idx.append(resolved)
+    return ids, deps, deps_idx
 
-    # Kahn's algorithm (BFS topological sort by level)
-    in_degree: Dict[str, int] = {_get_id(i): 0 for i in intents}
-    dependents: Dict[str, List[str]] = {_get_id(i): [] for i in intents}
 
-    for intent in intents:
-        iid = _get_id(intent)
-        deps = _get_deps(intent)
-        in_degree[iid] = len(deps)
-        for dep in deps:
-            dependents[dep].append(iid)
+@dataclass(frozen=True)
+class _NormalizedDAG:
+    """Intent graph resolved by compute_waves_ex, reusable by analyze_waves.
 
-    current_wave_ids: List[str] = [
-        iid for iid, deg in in_degree.items() if deg == 0
-    ]
+    Everything is indexed by position in the original intent list:
+    ``ids[k]`` is the ID of intent ``k``, ``deps[k]`` its raw dependency
+    IDs and ``deps_idx[k]`` their positions. ``topo_order`` lists the
+    positions wave by wave, in the order compute_waves_ex emitted them.
+    ``peak_parallelism`` and ``bottleneck_wave`` are the size and index of
+    the first widest wave, tracked while the waves were built.
+    """
+    ids: List[str]
+    deps: List[Tuple[str, ...]]
+    deps_idx: List[List[int]]
+    topo_order: List[int]
+    peak_parallelism: int = 0
+    bottleneck_wave: int = 0
+
+
+class WaveCache:
+    """Opt-in memo of compute_waves_ex results for repeated calls.
+
+    Pass one instance as ``cache=`` to compute_waves, compute_waves_ex,
+    compute_waves_with_stats or generate_staffing_plan. Entries are keyed
+    on the intents sequence and validated on every hit: the sequence must
+    hold the same intent objects, with the same IDs and dependency tuples,
+    as when the entry was stored. Any replacement, append, ID change or
+    dependency edit (including one that introduces a cycle) is therefore
+    recomputed, never served stale. A hit skips ID resolution and Kahn's
+    algorithm but still reads every intent's ID and dependencies once.
+
+    The cache holds strong references to up to *maxsize* intent lists;
+    clear() releases them.
+    """
 
-    waves: List[List[Any]] = []
-    assigned: Set[str] = set()
+    def __init__(self, maxsize: int = 8) -> None:
+        self.maxsize = maxsize
+        self._entries: Dict[
+            int, Tuple[Sequence[Any], Tuple[Any, ...], List[List[Any]], _NormalizedDAG]
+        ] = {}
+
+    def get(
+        self, intents: Sequence[Any],
+    ) -> Optional[Tuple[List[List[Any]], _NormalizedDAG]]:
+        entry = self._entries.get(id(intents))
+        if entry is None:
+            return None
+        seq, members, waves, dag = entry
+        if (seq is not intents or len(members) != len(intents)
+                or any(a is not b for a, b in zip(members, intents))):
+            return None
+        get_id, get_deps = _accessors(intents)
+        if (any(get_id(intent) != iid for intent, iid in zip(intents, dag.ids))
+                or any(tuple(get_deps(intent) or ()) != deps
+                       for intent, deps in zip(intents, dag.deps))):
+            return None
+        return [list(w) for w in waves], dag
+
+    def put(self, intents: Sequence[Any], waves: List[List[Any]],
+            dag: _NormalizedDAG) -> None:
+        key = id(intents)
+        if key not in self._entries and len(self._entries) >= self.maxsize:
+            self._entries.pop(next(iter(self._entries)))
+        self._entries[key] = (intents, tuple(intents), waves, dag)
+
+    def clear(self) -> None:
+        """Drop every entry (and the references to their intent lists)."""
+        self._entries.clear()
+
+
+def compute_waves(
+    intents: Sequence[Any], cache: Optional[WaveCache] = None,
+) -> List[List[Any]]:
+    """Partition *intents* into parallel execution waves.
+
+    Wave 0 contains intents with no dependencies. Wave N contains intents
+    whose deps are all in waves < N. Intents within a wave are ordered by ID.
+    Pass a WaveCache to reuse the result across repeated calls.
 
-    while current_wave_ids:
-        wave = [id_to_intent[iid] for iid in sorted(current_wave_ids)]
-        waves.append(wave)
-        assigned.update(current_wave_ids)
+    Raises ValueError on circular deps or missing dependency references.
+    """
+    return compute_waves_ex(intents, cache)[0]
+
+
+def compute_waves_ex(
+    intents: Sequence[Any], cache: Optional[WaveCache] = None,
+) -> Tuple[List[List[Any]], _NormalizedDAG]:
+    """Like compute_waves, but also return the resolved graph.
+
+    Pass the graph to ``analyze_waves(..., dag=...)`` to skip resolving
+    the intents a second time. With a WaveCache, a repeat call on an
+    unchanged sequence is served from it (see WaveCache for what counts
+    as unchanged); errors are never cached.
+    """
+    if not intents:
+        return [], _NormalizedDAG([], [], [], [])
 
-        next_wave_ids: List[str] = []
-        for iid in current_wave_ids:
-            for dep_id in dependents[iid]:
-                in_degree[dep_id] -= 1
-                if in_degree[dep_id] == 0:
-                    next_wave_ids.append(dep_id)
+    if cache is not None:
+        hit = cache.get(intents)
+        if hit is not None:
+            return hit
 
-        current_wave_ids = next_wave_ids
+    ids, raw_deps, deps_idx = _normalize(intents)
+    n = len(ids)
 
-    if len(assigned) < len(intents):
-        remaining = set(id_to_intent.keys()) - assigned
-        cycle = _find_cycle(remaining, id_to_intent)
+    # Relabel nodes by ID rank so ordering each wave is a plain int sort
+    order = sorted(range(n), key=ids.__getitem__)
+    rank = [0] * n
+    for r, v in enumerate(order):
+        rank[v] = r
+
+    # Kahn's algorithm, level-synchronous: each wave is one frontier
+    in_degree = [0] * n
+    dependents: List[List[int]] = [[] for _ in range(n)]
+    for v, dep_positions in enumerate(deps_idx):
+        rv = rank[v]
+        in_degree[rv] = len(dep_positions)
+        for u in dep_positions:
+            dependents[rank[u]].append(rv)
+
+    current = [r for r in range(n) if in_degree[r] == 0]
+
+    waves: List[List[Any]] = []
+    topo_order: List[int] = []
+    peak = bottleneck = 0
+
+    while current:
+        if len(current) > peak:
+            peak, bottleneck = len(current), len(waves)
+        # One C-level sort of int ranks per wave; a heapq frontier gives
+        # the same order but pays a Python-level push/pop per node.
+        current.sort()
+        wave_positions = [order[r] for r in current]
+        waves.append([intents[v] for v in wave_positions])
+        topo_order.extend(wave_positions)
+
+        nxt: List[int] = []
+        for u in current:
+            for v in dependents[u]:
+                in_degree[v] -= 1
+                if in_degree[v] == 0:
+                    nxt.append(v)
+
+        current = nxt
+
+    # Duplicate IDs can never be scheduled unambiguously either
+    if len(topo_order) < n or len(set(ids)) < n:
+        remaining = {ids[order[r]] for r in range(n) if in_degree[r] > 0}
+        cycle = _find_cycle(remaining, dict(zip(ids, raw_deps)))
         cycle_str = " -> ".join(cycle) if cycle else ", ".join(sorted(remaining))
         raise ValueError(f"Circular dependency detected: {cycle_str}")
 
-    return waves
+    dag = _NormalizedDAG(ids, raw_deps, deps_idx, topo_order, peak, bottleneck)
+    if cache is not None:
+        cache.put(intents, waves, dag)
+        # Hand out copies so callers cannot reorder the cached waves
+        return [list(w) for w in waves], dag
+    return waves, dag
+
 
+def _find_cycle(node_ids: Set[str], deps: Dict[str, Sequence[str]]) -> List[str]:
+    """Return a list of IDs forming one cycle, or [].
 
-def _find_cycle(node_ids: Set[str], id_to_intent: Dict[str, Any]) -> List[str]:
-    """Return a list of IDs forming one cycle, or []."""
+    Iterative three-colour DFS with an explicit stack, so long dependency
+    chains cannot hit the recursion limit.
+    """
     WHITE, GRAY, BLACK = 0, 1, 2
     color: Dict[str, int] = {nid: WHITE for nid in node_ids}
     parent: Dict[str, Optional[str]] = {nid: None for nid in node_ids}
 
-    def dfs(nid: str) -> Optional[List[str]]:
-        color[nid] = GRAY
-        for dep in _get_deps(id_to_intent[nid]):
-            if dep not in node_ids:
-                continue
-            if color[dep] == GRAY:
-                cycle = [dep, nid]
-                cur = nid
-                while cur != dep:
-                    cur = parent[cur]  # type: ignore[assignment]
-                    if cur is None:
-                        break
-                    cycle.append(cur)
-                cycle.reverse()
-                return cycle
-            if color[dep] == WHITE:
-                parent[dep] = nid
-                result = dfs(dep)
-                if result is not None:
-                    return result
-        color[nid] = BLACK
-        return None
-
-    for nid in node_ids:
-        if color[nid] == WHITE:
-            result = dfs(nid)
-            if result is not None:
-                return result
+    for root in node_ids:
+        if color[root] != WHITE:
+            continue
+        color[root] = GRAY
+        stack = [(root, iter(deps[root]))]
+
+        while stack:
+            nid, pending = stack[-1]
+            for dep in pending:
+                if dep not in node_ids:
+                    continue
+                if color[dep] == GRAY:
+                    cycle = [dep, nid]
+                    cur = nid
+                    while cur != dep:
+                        cur = parent[cur]  # type: ignore[assignment]
+                        if cur is None:
+                            break
+                        cycle.append(cur)
+                    cycle.reverse()
+                    return cycle
+                if color[dep] == WHITE:
+                    parent[dep] = nid
+                    color[dep] = GRAY
+                    stack.append((dep, iter(deps[dep])))
+                    break
+            else:
+                color[nid] = BLACK
+                stack.pop()
+
     return []
 
 
@@ -357,8 +523,46 @@ class WaveStats:
     critical_path: List[str] = field(default_factory=list)
 
 
-def analyze_waves(waves: List[List[Any]], intents: Sequence[Any]) -> WaveStats:
-    """Compute summary statistics over a wave decomposition."""
+def compute_waves_with_stats(
+    intents: Sequence[Any], cache: Optional[WaveCache] = None,
+) -> Tuple[List[List[Any]], WaveStats]:
+    """compute_waves plus the WaveStats analyze_waves would report for it.
+
+    Wave sizes are tracked while the waves are built and the critical
+    path is traced over the same topological order, so the intents are
+    only resolved once. *cache* is passed on to compute_waves_ex.
+    """
+    waves, dag = compute_waves_ex(intents, cache)
+    return waves, _stats_from_dag(dag, len(waves))
+
+
+def _stats_from_dag(dag: _NormalizedDAG, num_waves: int) -> WaveStats:
+    """WaveStats for the decomposition compute_waves_ex produced with *dag*."""
+    return WaveStats(
+        total_intents=len(dag.topo_order),
+        total_waves=num_waves,
+        peak_parallelism=dag.peak_parallelism,
+        serial_depth=num_waves,
+        bottleneck_wave=dag.bottleneck_wave,
+        critical_path=_longest_chain(
+            dag.ids, range(len(dag.ids)), dag.deps_idx, dag.topo_order,
+        ),
+    )
+
+
+def analyze_waves(
+    waves: List[List[Any]],
+    intents: Sequence[Any],
+    dag: Optional[_NormalizedDAG] = None,
+) -> WaveStats:
+    """Compute summary statistics over a wave decomposition.
+
+    *dag* is the graph returned by compute_waves_ex for the same intents;
+    when given, the stats come from it without re-reading the intents.
+    compute_waves_with_stats does both steps in one call.
+    """
+    if dag is not None:
+        return _stats_from_dag(dag, len(waves))
     if not waves:
         return WaveStats(0, 0, 0, 0, 0, [])
 
@@ -377,33 +581,77 @@ def analyze_waves(waves: List[List[Any]], intents: Sequence[Any]) -> WaveStats:
     )
 
 
+def _deps_cache(intents: Sequence[Any]) -> Dict[str, Tuple[str, ...]]:
+    """Map each intent ID to its dependency IDs, probing each intent once."""
+    return {_get_id(i): tuple(_get_deps(i)) for i in intents}
+
+
 def _compute_critical_path(intents: Sequence[Any]) -> List[str]:
-    """Find the longest dependency chain via DP on the DAG."""
-    id_to_intent: Dict[str, Any] = {_get_id(i): i for i in intents}
-    memo: Dict[str, List[str]] = {}
-
-    def longest_ending_at(iid: str) -> List[str]:
-        if iid in memo:
-            return memo[iid]
-        deps = _get_deps(id_to_intent[iid])
-        if not deps:
-            memo[iid] = [iid]
-            return memo[iid]
-        best_prefix: List[str] = []
-        for dep in deps:
-            if dep in id_to_intent:
-                candidate = longest_ending_at(dep)
-                if len(candidate) > len(best_prefix):
-                    best_prefix = candidate
-        memo[iid] = best_prefix + [iid]
-        return memo[iid]
-
-    overall_best: List[str] = []
-    for iid in id_to_intent:
-        candidate = longest_ending_at(iid)
-        if len(candidate) > len(overall_best):
-            overall_best = candidate
-    return overall_best
+    """Find the longest dependency chain via DP over a topological order.
+
+    Dependencies on unknown IDs are ignored. Ties keep the earliest
+    candidate: the first dependency listed, then the first intent.
+    """
+    ids = [_get_id(i) for i in intents]
+    id_to_idx: Dict[str, int] = {iid: k for k, iid in enumerate(ids)}
+    nodes = list(id_to_idx.values())
+    deps_idx: List[List[int]] = [[] for _ in intents]
+    for iid, raw in _deps_cache(intents).items():
+        deps_idx[id_to_idx[iid]] = [
+            id_to_idx[dep] for dep in raw if dep in id_to_idx
+        ]
+    return _longest_chain(ids, nodes, deps_idx, _topo_order(nodes, deps_idx))
+
+
+def _topo_order(nodes: List[int], deps_idx: List[List[int]]) -> List[int]:
+    """Kahn order of *nodes*; nodes on a cycle are left out."""
+    in_degree = [0] * len(deps_idx)
+    dependents: List[List[int]] = [[] for _ in deps_idx]
+    for v in nodes:
+        in_degree[v] = len(deps_idx[v])
+        for u in deps_idx[v]:
+            dependents[u].append(v)
+
+    order = [v for v in nodes if in_degree[v] == 0]
+    for v in order:
+        for w in dependents[v]:
+            in_degree[w] -= 1
+            if in_degree[w] == 0:
+                order.append(w)
+    return order
+
+
+def _longest_chain(
+    ids: List[str],
+    nodes: Sequence[int],
+    deps_idx: List[List[int]],
+    topo_order: List[int],
+) -> List[str]:
+    """Longest path (by node count) through *nodes*, as IDs.
+
+    *topo_order* must list every dependency before its dependents.
+    """
+    n = len(deps_idx)
+    length = [0] * n
+    pred = [-1] * n
+    for v in topo_order:
+        best = 0
+        for u in deps_idx[v]:
+            if length[u] > best:
+                best, pred[v] = length[u], u
+        length[v] = best + 1
+
+    end, best = -1, 0
+    for v in nodes:
+        if length[v] > best:
+            end, best = v, length[v]
+
+    path: List[str] = []
+    while end != -1:
+        path.append(ids[end])
+        end = pred[end]
+    path.reverse()
+    return path
 
 
 # ---------------------------------------------------------------------------
@@ -449,16 +697,21 @@ def _estimate_intent_cost(intent: Any, profile: str) -> float:
 # Staffing plan generator
 # ---------------------------------------------------------------------------
 
-def generate_staffing_plan(intents: Sequence[Any]) -> Dict[str, Any]:
+def generate_staffing_plan(
+    intents: Sequence[Any], cache: Optional[WaveCache] = None,
+) -> Dict[str, Any]:
     """Produce a full staffing plan from decomposer output.
 
     Combines assign_profile() and compute_waves() into a complete
     execution plan with cost estimates, profile load, and wave metadata.
+    *cache* is an optional WaveCache passed on to compute_waves_ex.
 
     Returns a dict suitable for JSON serialization.
     """
-    waves = compute_waves(intents)
-    stats = analyze_waves(waves, intents)
+    waves, dag = compute_waves_ex(intents, cache)
+    stats = _stats_from_dag(dag, len(waves))
+    # topo_order walks the same positions as the waves, in the same order
+    positions = iter(dag.topo_order)
 
     profile_load: Dict[str, int] = {}
     total_cost = 0.0
@@ -470,7 +723,8 @@ def generate_staffing_plan(intents: Sequence[Any]) -> Dict[str, Any]:
         wave_cost = 0.0
 
         for intent in wave:
-            iid = _get_id(intent)
+            k = next(positions)
+            iid = dag.ids[k]
             profile = assign_profile(intent)
             tokens = _get_estimated_tokens(intent)
             cost = _estimate_intent_cost(intent, profile)
@@ -489,7 +743,7 @@ def generate_staffing_plan(intents: Sequence[Any]) -> Dict[str, Any]:
                 "complexity": _get_complexity(intent),
                 "estimated_tokens": tokens,
                 "estimated_cost": round(cost, 4),
-                "depends_on": _get_deps(intent),
+                "depends_on": list(dag.deps[k]),
                 "wave": i,
             })
 
@@ -12,73 +12,372 @@ See: Minimal viable weight tuning in CLAUDE.md
 from __future__ import annotations
 
 import json
-import statistics
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field
-from datetime import datetime
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Sequence
+from typing import (
+    Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple,
+)
+
+import numpy as np
+
+try:
+    import orjson
+except ImportError:  # stdlib fallback — same output, slower
+    orjson = None
+
+
+# ---------------------------------------------------------------------------
+# Serialization
+# ---------------------------------------------------------------------------
+
+_WRITE_BUFFER_SIZE = 1 << 16
+
+
+def _dumps(obj: Any) -> bytes:
+    """Serialize to compact JSON bytes (orjson when available)."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+
+def _loads(data: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _views_of(
+    runs: Iterable[Dict[str, Any]], count: int = -1,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """(gate_1_pass_rate, coherence, cost_quality_ratio) arrays over ``runs``.
+
+    ``runs`` may be a one-shot iterator (e.g. TelemetryLog.iter_history());
+    only the three floats per run are kept.
+    """
+    flat = np.fromiter(
+        (x for r in runs for x in (r["gate_pass"]["gate_1_pass_rate"],
+                                   r["chain_coherence"]["score"],
+                                   r["cost_quality"]["cost_quality_ratio"])),
+        np.float64, -1 if count < 0 else 3 * count,
+    ).reshape(-1, 3)
+    return flat[:, 0].copy(), flat[:, 1].copy(), flat[:, 2].copy()
+
+
+def _frontier_order(
+    gate: np.ndarray, coherence: np.ndarray, cq_ratio: np.ndarray,
+    min_gate_pass: float,
+) -> List[int]:
+    """Positions of the Pareto frontier, by descending coherence."""
+    valid = np.flatnonzero(gate >= min_gate_pass)
+    order = valid[np.lexsort((cq_ratio[valid], -coherence[valid]))]
+    sorted_cq = cq_ratio[order]
+    keep = np.ones(order.size, dtype=bool)
+    if order.size > 1:
+        keep[1:] = sorted_cq[1:] < np.minimum.accumulate(sorted_cq)[:-1]
+    return order[keep].tolist()
+
+
+def _read_runs(path: Path) -> Tuple[List[Dict[str, Any]], bool]:
+    """Runs stored in ``path`` and whether it is a ``{"runs": [...]}`` document."""
+    with open(path, "rb") as f:
+        data = f.read()
+    try:
+        doc = _loads(data)
+    except ValueError:
+        doc = None
+    if isinstance(doc, dict) and isinstance(doc.get("runs"), list):
+        return doc["runs"], True
+    return [_loads(line) for line in data.splitlines() if line.strip()], False
+
+
+def _write_lines_atomic(path: Path, runs: Sequence[Dict[str, Any]]) -> None:
+    """Replace ``path`` with ``runs`` as JSON lines via a temp file + rename."""
+    tmp = path.with_name(f".{path.name}.tmp")
+    with open(tmp, "wb", buffering=_WRITE_BUFFER_SIZE) as f:
+        for run in runs:
+            f.write(_dumps(run) + b"\n")
+    os.replace(tmp, path)
 
 
 # ---------------------------------------------------------------------------
 # Data classes
 # ---------------------------------------------------------------------------
 
+@dataclass(frozen=True)
+class AgentSoA:
+    """Structure-of-arrays view of an agent pool.
+
+    Position ``i`` in every array describes agent ``names[i]``. Built once
+    per pool by compute_metrics() and shared by all compute_* functions.
+    ``type_code`` interns ``model_type`` to small ints (0..num_types-1).
+    """
+
+    names: List[str]
+    name_to_i: Dict[str, int]
+    quality: np.ndarray
+    token_rate: np.ndarray
+    latency: np.ndarray
+    is_local: np.ndarray
+    model_type: np.ndarray
+    type_code: np.ndarray
+    num_types: int
+
+    @classmethod
+    def from_agents(cls, agents: Dict[str, Any]) -> "AgentSoA":
+        n = len(agents)
+        pool = agents.values()
+        names = list(agents)
+        codes: Dict[Any, int] = {}
+        type_code = np.fromiter(
+            (codes.setdefault(a.get('model_type'), len(codes)) for a in pool),
+            np.int32, n,
+        )
+        return cls(
+            names=names,
+            name_to_i={name: i for i, name in enumerate(names)},
+            quality=np.fromiter((a['quality'] for a in pool), np.float64, n),
+            token_rate=np.fromiter((a['token_rate'] for a in pool), np.float64, n),
+            latency=np.fromiter((a['latency'] for a in pool), np.float64, n),
+            is_local=np.fromiter((bool(a.get('is_local')) for a in pool), np.bool_, n),
+            model_type=np.array([a.get('model_type') for a in pool], dtype=object),
+            type_code=type_code,
+            num_types=len(codes),
+        )
+
+
 @dataclass
 class TelemetryLog:
     """Append-only log of routing runs for comparison and tuning.
 
-    Each run is the dict returned by compute_metrics(). The log provides
-    filtering by gate pass rate and Pareto frontier extraction — the
-    primitives needed for a future self-tuning loop.
+    Each run is the dict returned by compute_metrics(). When ``log_path``
+    is set, every added run is appended to it as one JSON line. The log
+    provides filtering by gate pass rate and Pareto frontier extraction —
+    the primitives needed for a future self-tuning loop.
+
+    For long tuning sessions, ``max_runs_in_memory`` keeps only the most
+    recent runs in ``runs`` (older ones remain on disk), and
+    ``max_file_bytes`` rotates ``log_path`` to ``<stem>.1<suffix>`` once it
+    grows past the cap, shifting older files to ``.2``, ``.3``, ... and
+    keeping ``max_rotated_files`` of them. Queries such as best() and
+    pareto_frontier() cover the in-memory window by default and every
+    file on disk with ``include_history=True``; iter_history() streams
+    everything on disk.
     """
 
     runs: List[Dict[str, Any]] = field(default_factory=list)
     log_path: Optional[Path] = None
+    max_runs_in_memory: Optional[int] = None
+    max_file_bytes: Optional[int] = None
+    max_rotated_files: int = 5
+    _frontier_cache: Optional[Tuple[Tuple[int, float], List[Dict]]] = field(
+        default=None, init=False, repr=False, compare=False,
+    )
+    _views: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = field(
+        default=None, init=False, repr=False, compare=False,
+    )
+    _views_len: int = field(default=-1, init=False, repr=False, compare=False)
+    _log_is_document: bool = field(default=False, init=False, repr=False,
+                                   compare=False)
 
     def add_run(self, metrics: Dict[str, Any]) -> None:
-        self.runs.append(metrics)
-        if self.log_path:
-            self._save()
+        self.add_runs([metrics])
 
-    def _save(self) -> None:
-        if not self.log_path:
+    def add_runs(self, batch: Sequence[Dict[str, Any]]) -> None:
+        """Add several runs, persisting them with a single write."""
+        self.runs.extend(batch)
+        if self.log_path:
+            self._append_batch(batch)
+            self._rotate_if_needed()
+            if (self.max_runs_in_memory is not None
+                    and len(self.runs) > self.max_runs_in_memory):
+                del self.runs[:len(self.runs) - self.max_runs_in_memory]
+        self._views = None
+        self._frontier_cache = None
+
+    def _append_batch(self, batch: Sequence[Dict[str, Any]]) -> None:
+        """Append runs to the log, one JSON line each, in one write() call."""
+        if not self.log_path or not batch:
             return
+        if self._log_is_document:
+            # Loaded from a {"runs": [...]} document: convert it to JSON
+            # lines now, so the appended lines leave it readable.
+            if self.log_path.exists():
+                _write_lines_atomic(self.log_path, _read_runs(self.log_path)[0])
+            self._log_is_document = False
         self.log_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(self.log_path, "w") as f:
-            json.dump({"runs": self.runs}, f, indent=2)
+        data = b"".join(_dumps(run) + b"\n" for run in batch)
+        with open(self.log_path, "ab") as f:
+            f.write(data)
+
+    def _rotated_path(self, generation: int = 1) -> Path:
+        return self.log_path.with_name(
+            f"{self.log_path.stem}.{generation}{self.log_path.suffix}"
+        )
+
+    def _rotate_if_needed(self) -> None:
+        """Move the log aside once it exceeds max_file_bytes.
+
+        ``.1`` is the newest rotated file; existing generations shift up
+        by one and the oldest beyond max_rotated_files is dropped.
+        """
+        if self.max_file_bytes is None:
+            return
+        if self.log_path.stat().st_size <= self.max_file_bytes:
+            return
+        if self.max_rotated_files < 1:
+            self.log_path.unlink()
+            return
+        for gen in range(self.max_rotated_files - 1, 0, -1):
+            src = self._rotated_path(gen)
+            if src.exists():
+                src.replace(self._rotated_path(gen + 1))
+        self.log_path.replace(self._rotated_path(1))
+
+    def _history_paths(self) -> List[Path]:
+        """Rotated files oldest first, then the live log."""
+        rotated = [self._rotated_path(gen)
+                   for gen in range(self.max_rotated_files, 0, -1)]
+        return [p for p in rotated + [self.log_path] if p.exists()]
+
+    def iter_history(self) -> Iterator[Dict[str, Any]]:
+        """Stream every run on disk, oldest first, including rotated files.
+
+        Unlike ``runs``, this is not limited by max_runs_in_memory.
+        """
+        if not self.log_path:
+            yield from self.runs
+            return
+        for path in self._history_paths():
+            with open(path, "rb") as f:
+                for line in f:
+                    if line.strip():
+                        yield _loads(line)
+
+    def export(self, path: Path) -> None:
+        """Write all runs as a single ``{"runs": [...]}`` JSON document.
+
+        Runs are serialized one at a time into a 64 KiB write buffer, so
+        the enclosing document is never built in memory and the file sees
+        few large writes rather than one per run.
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "wb", buffering=_WRITE_BUFFER_SIZE) as f:
+            f.write(b'{"runs":[')
+            for i, run in enumerate(self.runs):
+                if i:
+                    f.write(b",")
+                f.write(_dumps(run))
+            f.write(b"]}")
 
     @classmethod
     def load(cls, path: Path) -> "TelemetryLog":
-        with open(path) as f:
-            data = json.load(f)
-        log = cls(runs=data.get("runs", []), log_path=path)
+        """Load a log written by add_run() (JSON lines) or export().
+
+        Loading never modifies the file. A ``{"runs": [...]}`` document (an
+        export() file or a legacy indented log) is only rewritten as JSON
+        lines when a run is first appended to it, so the appended lines
+        keep it readable.
+        """
+        runs, is_document = _read_runs(path)
+        log = cls(runs=runs, log_path=path)
+        log._log_is_document = is_document
         return log
 
-    def best_by_coherence(self, min_gate_pass: float = 0.90) -> Optional[Dict]:
+    def _run_views(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Flat (gate_1_pass_rate, coherence, cost_quality_ratio) arrays.
+
+        Indexed by run position; rebuilt lazily after runs are added.
+        """
+        if self._views is None or self._views_len != len(self.runs):
+            self._views = _views_of(self.runs, len(self.runs))
+            self._views_len = len(self.runs)
+        return self._views
+
+    def _uses_history(self, include_history: bool) -> bool:
+        return include_history and self.log_path is not None
+
+    def _history_runs(self, positions: Sequence[int]) -> List[Dict]:
+        """Runs at ``positions`` in iter_history() order, in that order.
+
+        Streams the files once, keeping only the requested runs.
+        """
+        wanted = set(positions)
+        found = {i: run for i, run in enumerate(self.iter_history())
+                 if i in wanted}
+        return [found[i] for i in positions]
+
+    def best(
+        self, min_gate_pass: float = 0.90, include_history: bool = False,
+    ) -> Tuple[Optional[Dict], Optional[Dict]]:
+        """Best-coherence and best-cost runs meeting the gate threshold.
+
+        Args:
+            min_gate_pass: Minimum gate_1_pass_rate for a run to count
+            include_history: Scan every run on disk (including rotated
+                files and runs dropped by max_runs_in_memory) instead of
+                the in-memory window. Needs ``log_path``.
+
+        Returns:
+            (best_by_coherence, best_by_cost) — either may be None
+        """
+        if self._uses_history(include_history):
+            gate, coherence, cq_ratio = _views_of(self.iter_history())
+        else:
+            gate, coherence, cq_ratio = self._run_views()
+        mask = gate >= min_gate_pass
+        if not mask.any():
+            return None, None
+        # argmax/argmin return the first hit, so ties go to the earliest run.
+        best_c = int(np.argmax(np.where(mask, coherence, -np.inf)))
+        best_cq = int(np.argmin(np.where(mask, cq_ratio, np.inf)))
+        if self._uses_history(include_history):
+            return tuple(self._history_runs([best_c, best_cq]))
+        return self.runs[best_c], self.runs[best_cq]
+
+    def best_by_coherence(self, min_gate_pass: float = 0.90,
+                          include_history: bool = False) -> Optional[Dict]:
         """Best chain coherence among runs meeting gate threshold."""
-        valid = [
-            r for r in self.runs
-            if r["gate_pass"]["gate_1_pass_rate"] >= min_gate_pass
-        ]
-        if not valid:
-            return None
-        return max(valid, key=lambda r: r["chain_coherence"]["score"])
+        return self.best(min_gate_pass, include_history)[0]
 
-    def best_by_cost(self, min_gate_pass: float = 0.90) -> Optional[Dict]:
+    def best_by_cost(self, min_gate_pass: float = 0.90,
+                     include_history: bool = False) -> Optional[Dict]:
         """Best cost/quality ratio among runs meeting gate threshold."""
-        valid = [
-            r for r in self.runs
-            if r["gate_pass"]["gate_1_pass_rate"] >= min_gate_pass
-        ]
-        if not valid:
-            return None
-        return min(valid, key=lambda r: r["cost_quality"]["cost_quality_ratio"])
+        return self.best(min_gate_pass, include_history)[1]
+
+    def pareto_frontier(self, min_gate_pass: float = 0.90,
+                        include_history: bool = False) -> List[Dict]:
+        """Runs not dominated on (coherence ↑, cost/quality ratio ↓).
+
+        Kung-style sweep: sort by coherence descending (ties broken by
+        ratio ascending), then keep each run whose ratio beats every run
+        seen before it. The result is ordered by descending coherence and
+        cached until the next run is added. ``include_history`` scans
+        every run on disk, as in best(); that result is not cached.
+        """
+        if self._uses_history(include_history):
+            order = _frontier_order(*_views_of(self.iter_history()),
+                                    min_gate_pass)
+            return self._history_runs(order)
+
+        key = (len(self.runs), min_gate_pass)
+        if self._frontier_cache is not None and self._frontier_cache[0] == key:
+            return list(self._frontier_cache[1])
+
+        order = _frontier_order(*self._run_views(), min_gate_pass)
+        frontier = [self.runs[i] for i in order]
+
+        self._frontier_cache = (key, frontier)
+        return list(frontier)
 
     def summary(self) -> str:
         if not self.runs:
             return "No runs logged."
-        best_c = self.best_by_coherence()
-        best_cq = self.best_by_cost()
+        best_c, best_cq = self.best()
         lines = [f"Telemetry: {len(self.runs)} runs"]
         if best_c:
             lines.append(f"  Best coherence: {best_c['chain_coherence']['score']:.1%}")
@@ -87,6 +386,246 @@ class TelemetryLog:
         return "\n".join(lines)
 
 
+# ---------------------------------------------------------------------------
+# Array views of the agent pool and assignments
+# ---------------------------------------------------------------------------
+
+_IDENTITY_CACHE_SIZE = 8
+
+_SOA_CACHE: Dict[int, Tuple[Dict[str, Any], Tuple, AgentSoA]] = {}
+_CHAIN_CACHE: Dict[int, Tuple[Sequence[Any], Tuple,
+                              Tuple[np.ndarray, np.ndarray]]] = {}
+
+
+def _identity_cached(cache: Dict[int, Tuple[Any, Tuple, Any]], obj: Any,
+                     build: Callable[[Any], Any],
+                     stamp: Callable[[Any], Tuple]) -> Any:
+    """Return build(obj), memoized on the identity of ``obj``.
+
+    The cache holds a reference to ``obj`` so its id() cannot be reused
+    while the entry is alive. ``stamp(obj)`` is compared on every hit, so
+    entries added, removed or replaced since the build force a rebuild;
+    edits the stamp does not cover are not seen (see clear_metric_caches()).
+    """
+    key = stamp(obj)
+    hit = cache.get(id(obj))
+    if hit is not None and hit[0] is obj and hit[1] == key:
+        return hit[2]
+    value = build(obj)
+    if id(obj) not in cache and len(cache) >= _IDENTITY_CACHE_SIZE:
+        cache.pop(next(iter(cache)))
+    cache[id(obj)] = (obj, key, value)
+    return value
+
+
+def clear_metric_caches() -> None:
+    """Drop the cached array views of agent pools and workflow chains.
+
+    compute_metrics() caches per pool and chain-list object. It notices
+    agents being added, removed or replaced and chains whose step lists
+    are replaced or change length, but not fields edited inside an
+    existing agent dict (e.g. ``agents[name]["quality"] = ...``) or a step
+    index overwritten in place. Call this after such an edit, or pass
+    fresh objects.
+    """
+    _SOA_CACHE.clear()
+    _CHAIN_CACHE.clear()
+
+
+def _pool_stamp(agents: Dict[str, Any]) -> Tuple:
+    return tuple(map(id, agents.values())) + tuple(agents)
+
+
+def _agents_to_soa(agents: Dict[str, Any]) -> AgentSoA:
+    """AgentSoA for ``agents``, cached per pool."""
+    return _identity_cached(_SOA_CACHE, agents, AgentSoA.from_agents,
+                            _pool_stamp)
+
+
+def _assignment_index(
+    assignments: Dict[int, str],
+    num_intents: int,
+    name_to_i: Dict[str, int],
+) -> np.ndarray:
+    """Dense int32 agent position per intent index.
+
+    -1 marks intents that are unassigned or assigned to an agent outside
+    the pool. Built in one walk over ``assignments``.
+    """
+    assign_idx = np.full(num_intents, -1, dtype=np.int32)
+    if assignments:
+        n = len(assignments)
+        keys = np.fromiter(assignments.keys(), np.int64, n)
+        agent_i = np.fromiter(
+            (name_to_i.get(name, -1) for name in assignments.values()),
+            np.int32, n,
+        )
+        in_range = (keys >= 0) & (keys < num_intents)
+        assign_idx[keys[in_range]] = agent_i[in_range]
+    return assign_idx
+
+
+def _gather(assign_idx: np.ndarray, positions: np.ndarray) -> np.ndarray:
+    """assign_idx[positions], with -1 for positions outside the array."""
+    in_range = (positions >= 0) & (positions < assign_idx.size)
+    return np.where(in_range, assign_idx[np.where(in_range, positions, 0)], -1)
+
+
+@dataclass(frozen=True)
+class _IntentColumns:
+    """Numeric intent fields as arrays; missing fields are NaN."""
+
+    tokens: np.ndarray
+    min_quality: np.ndarray
+    story_points: np.ndarray
+    deadline: np.ndarray
+    dep_src: np.ndarray
+    dep_dst: np.ndarray
+
+
+def _intent_columns(intents: Sequence[Any]) -> _IntentColumns:
+    """Read every field the assignment metrics need in one pass."""
+    tokens: List[float] = []
+    min_quality: List[float] = []
+    story_points: List[float] = []
+    deadline: List[float] = []
+    dep_src: List[int] = []
+    dep_dst: List[int] = []
+    for i, intent in enumerate(intents):
+        get = intent.get
+        tokens.append(get('estimated_tokens', np.nan))
+        min_quality.append(get('min_quality', 0))
+        story_points.append(get('story_points', 0))
+        deadline.append(get('deadline', -1))
+        deps = get('depends')
+        if deps:
+            dep_src.extend(deps)
+            dep_dst.extend([i] * len(deps))
+    return _IntentColumns(
+        tokens=np.asarray(tokens, dtype=np.float64),
+        min_quality=np.asarray(min_quality, dtype=np.float64),
+        story_points=np.asarray(story_points, dtype=np.float64),
+        deadline=np.asarray(deadline, dtype=np.float64),
+        dep_src=np.asarray(dep_src, dtype=np.int64),
+        dep_dst=np.asarray(dep_dst, dtype=np.int64),
+    )
+
+
+def _chain_arrays(workflow_chains: Sequence[Any]) -> Tuple[np.ndarray, np.ndarray]:
+    """_flatten_chains() result, cached per workflow_chains object.
+
+    build_workflow_chains() output is fixed for a given intent set, so a
+    tuning sweep flattens it once rather than on every compute_metrics().
+    """
+    return _identity_cached(_CHAIN_CACHE, workflow_chains, _flatten_chains,
+                            _chains_stamp)
+
+
+def _chain_steps(entry: Any) -> Sequence[int]:
+    # workflow_chains entries are (chain_type_str, [step_indices])
+    if isinstance(entry, (list, tuple)) and len(entry) == 2:
+        return entry[1]
+    return entry
+
+
+def _chains_stamp(workflow_chains: Sequence[Any]) -> Tuple:
+    """id() and step count of every chain, to catch in-place edits."""
+    return tuple((id(entry), len(_chain_steps(entry)))
+                 for entry in workflow_chains)
+
+
+def _flatten_chains(workflow_chains: Sequence[Any]) -> Tuple[np.ndarray, np.ndarray]:
+    """Flatten multi-step chains into ``(lengths, steps)`` index arrays.
+
+    Accepts both ``(chain_type, [intent_indices])`` entries and bare index
+    lists. Single-step chains carry no coherence signal and are dropped.
+    """
+    lengths: List[int] = []
+    steps: List[int] = []
+    for entry in workflow_chains:
+        chain = _chain_steps(entry)
+        if len(chain) > 1:
+            lengths.append(len(chain))
+            steps.extend(chain)
+    return np.asarray(lengths, dtype=np.int64), np.asarray(steps, dtype=np.int64)
+
+
+def _distinct_types_per_chain(
+    lengths: np.ndarray,
+    step_agent: np.ndarray,
+    soa: AgentSoA,
+) -> np.ndarray:
+    """Number of distinct model types among the assigned steps of each chain.
+
+    Two-step chains are resolved by comparing their two type codes
+    directly. Longer chains OR together ``1 << type_code`` per assigned
+    step and popcount the mask, so no per-chain set is built.
+    """
+    counts = np.zeros(lengths.size, dtype=np.int64)
+    if lengths.size == 0:
+        return counts
+    assigned = step_agent >= 0
+    codes = np.where(assigned, soa.type_code[np.where(assigned, step_agent, 0)], -1)
+    offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+
+    is_pair = lengths == 2
+    if is_pair.any():
+        first = codes[offsets[is_pair]]
+        second = codes[offsets[is_pair] + 1]
+        same = (first >= 0) & (first == second)
+        counts[is_pair] = (first >= 0).astype(np.int64) + (second >= 0) - same
+
+    if not is_pair.all():
+        longer = ~is_pair
+        counts[longer] = _distinct_types_general(
+            lengths[longer], codes[np.repeat(longer, lengths)], soa.num_types,
+        )
+    return counts
+
+
+_BYTE_POPCOUNT = np.array([bin(b).count("1") for b in range(256)], dtype=np.int64)
+
+
+def _popcount64_table(masks: np.ndarray) -> np.ndarray:
+    """Set bits per uint64 via a per-byte lookup table (any NumPy)."""
+    as_bytes = np.ascontiguousarray(masks, dtype=np.uint64).view(np.uint8)
+    return _BYTE_POPCOUNT[as_bytes].reshape(-1, 8).sum(axis=1)
+
+
+def _popcount64_native(masks: np.ndarray) -> np.ndarray:
+    return np.bitwise_count(masks).astype(np.int64)
+
+
+# np.bitwise_count is NumPy >= 2.0 only.
+_popcount64 = (_popcount64_native if hasattr(np, "bitwise_count")
+               else _popcount64_table)
+
+
+def _distinct_types_general(
+    lengths: np.ndarray,
+    codes: np.ndarray,
+    num_types: int,
+) -> np.ndarray:
+    """Distinct non-negative codes per segment of ``codes``.
+
+    Uses a uint64 bitmask per segment; pools with more than 64 model
+    types fall back to deduplicating (segment, code) pairs.
+    """
+    assigned = codes >= 0
+    if num_types <= 64:
+        one = np.uint64(1)
+        bits = np.where(
+            assigned, one << np.maximum(codes, 0).astype(np.uint64), np.uint64(0),
+        )
+        offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+        masks = np.bitwise_or.reduceat(bits, offsets)
+        return _popcount64(masks)
+
+    segment = np.repeat(np.arange(lengths.size), lengths)
+    pairs = np.unique(segment[assigned] * num_types + codes[assigned])
+    return np.bincount(pairs // num_types, minlength=lengths.size)
+
+
 # ---------------------------------------------------------------------------
 # Metric computation functions
 # ---------------------------------------------------------------------------
@@ -95,6 +634,8 @@ def compute_chain_metrics(
     assignments: Dict[int, str],
     agents: Dict[str, Any],
     workflow_chains: Sequence[Any],
+    soa: Optional[AgentSoA] = None,
+    assign_idx: Optional[np.ndarray] = None,
 ) -> Dict[str, Any]:
     """Compute chain coherence metrics from assignments.
 
@@ -106,42 +647,27 @@ def compute_chain_metrics(
         agents: Full agent pool dict (agent_name -> agent dict with 'model_type')
         workflow_chains: List of (chain_type, [intent_indices]) tuples
             from build_workflow_chains()
+        soa: Precomputed AgentSoA for ``agents`` (built if omitted)
+        assign_idx: Precomputed _assignment_index() (built if omitted)
 
     Returns:
         Dict with coherence metrics
     """
-    chains_single = 0
-    chains_one_switch = 0
-    chains_multi = 0
-    total_chain_length = 0
-
-    for entry in workflow_chains:
-        # workflow_chains entries are (chain_type_str, [step_indices])
-        if isinstance(entry, (list, tuple)) and len(entry) == 2:
-            _, steps = entry
-        else:
-            steps = entry
-
-        if len(steps) <= 1:
-            continue
-
-        total_chain_length += len(steps)
-        model_types = []
-        for idx in steps:
-            agent_name = assignments.get(idx)
-            if agent_name and agent_name in agents:
-                model_types.append(agents[agent_name]['model_type'])
-
-        if not model_types:
-            continue
-
-        unique = set(model_types)
-        if len(unique) == 1:
-            chains_single += 1
-        elif len(unique) == 2:
-            chains_one_switch += 1
-        else:
-            chains_multi += 1
+    if soa is None:
+        soa = _agents_to_soa(agents)
+    lengths, steps = _chain_arrays(workflow_chains)
+    if assign_idx is None:
+        num_steps = int(steps.max()) + 1 if steps.size else 0
+        assign_idx = _assignment_index(assignments, num_steps, soa.name_to_i)
+    step_agent = _gather(assign_idx, steps)
+
+    unique_types = _distinct_types_per_chain(lengths, step_agent, soa)
+
+    # Chains with no assigned steps still count toward total length.
+    total_chain_length = int(lengths.sum())
+    chains_single = int(np.count_nonzero(unique_types == 1))
+    chains_one_switch = int(np.count_nonzero(unique_types == 2))
+    chains_multi = int(np.count_nonzero(unique_types >= 3))
 
     total_chains = chains_single + chains_one_switch + chains_multi
 
@@ -165,43 +691,66 @@ def compute_chain_metrics(
     }
 
 
-def compute_cost_quality_metrics(
+def compute_assignment_metrics(
     assignments: Dict[int, str],
     intents: Sequence[Any],
     agents: Dict[str, Any],
-) -> Dict[str, Any]:
-    """Compute cost and quality metrics from assignments.
+    soa: Optional[AgentSoA] = None,
+    assign_idx: Optional[np.ndarray] = None,
+) -> Tuple[Dict[str, Any], Dict[str, Any], Dict[str, Any]]:
+    """Compute cost/quality, gate and deadline metrics in one pass.
+
+    Intents are read once and the assignment index is built once; the
+    three metric groups are then reduced from the same gathered arrays.
+
+    Cost/quality: total token cost, average quality, overkill share
+        (agent quality above the intent's min_quality).
+    Gate 1 (per-intent): agent quality >= intent min_quality
+    Gate 3 (architecture): quality consistency across assignments
+        (mirrors quality_gates.py architecture_score: max(0, 100*(1 - stdev/0.3)))
+    Deadline: for each assigned intent with a deadline, estimates whether
+        the agent's throughput would cause a miss. Also checks dependency
+        quality ordering (downstream quality should not drop below upstream).
 
     Args:
         assignments: intent_index -> agent_name mapping
-        intents: List of intent dicts with 'estimated_tokens', 'min_quality'
+        intents: List of intent dicts with 'estimated_tokens', 'min_quality',
+            'story_points', 'deadline' (days), 'depends'
         agents: Full agent pool dict (agent_name -> agent dict)
+        soa: Precomputed AgentSoA for ``agents`` (built if omitted)
+        assign_idx: Precomputed _assignment_index() over ``intents``
+            (built if omitted)
 
     Returns:
-        Dict with cost/quality metrics
+        (cost_quality, gate_pass, deadline) metric dicts
     """
-    total_cost = 0.0
-    total_story_points = 0
-    quality_scores = []
-    overkill_count = 0
-
-    for idx, intent in enumerate(intents):
-        agent_name = assignments.get(idx)
-        if not agent_name or agent_name not in agents:
-            continue
-
-        agent = agents[agent_name]
-        tokens = intent.get("estimated_tokens", 0)
-        total_cost += tokens * agent['token_rate']
-        total_story_points += intent.get('story_points', 0)
-
-        quality_scores.append(agent['quality'])
-        if agent['quality'] > intent.get("min_quality", 0):
-            overkill_count += 1
-
-    n = len(quality_scores)
+    if soa is None:
+        soa = _agents_to_soa(agents)
+    cols = _intent_columns(intents)
+    if assign_idx is None:
+        assign_idx = _assignment_index(assignments, len(intents), soa.name_to_i)
+    idx = assign_idx
+    mask = idx >= 0
+    agent_i = idx[mask]
+    n = int(agent_i.size)
+
+    q = soa.quality[agent_i]
+    min_quality = cols.min_quality[mask]
+    tokens = cols.tokens[mask]
+
+    # Quality moments shared by cost/quality and the architecture gate:
+    # one mean, then the sample variance from deviations about it
+    # (two-pass, so no sum-of-squares cancellation).
+    avg_quality = float(q.mean()) if n > 0 else 0.0
+    if n >= 2:
+        deviation = q - avg_quality
+        stdev = math.sqrt(float(np.dot(deviation, deviation)) / (n - 1))
+    else:
+        stdev = 0.0
+
+    # --- Cost / quality ---
     if n == 0:
-        return {
+        cost = {
             "total_cost": 0.0,
             "avg_quality": 0.0,
             "overkill_pct": 0.0,
@@ -209,147 +758,155 @@ def compute_cost_quality_metrics(
             "cost_per_story_point": 0.0,
             "assigned_count": 0,
         }
+    else:
+        total_cost = float(np.dot(np.nan_to_num(tokens), soa.token_rate[agent_i]))
+        total_story_points = float(cols.story_points[mask].sum())
+        overkill_count = int(np.count_nonzero(q > min_quality))
+        cq_ratio = total_cost / avg_quality if avg_quality > 0 else 0.0
+        cost_per_sp = total_cost / total_story_points if total_story_points > 0 else 0.0
+        cost = {
+            "total_cost": total_cost,
+            "avg_quality": avg_quality,
+            "overkill_pct": overkill_count / n,
+            "cost_quality_ratio": cq_ratio,
+            "cost_per_story_point": cost_per_sp,
+            "assigned_count": n,
+        }
 
-    avg_quality = sum(quality_scores) / n
-    cq_ratio = total_cost / avg_quality if avg_quality > 0 else 0.0
-    cost_per_sp = total_cost / total_story_points if total_story_points > 0 else 0.0
+    # --- Gates ---
+    passed = int(np.count_nonzero(q >= min_quality))
+    failed = n - passed
+    gate_1_rate = passed / n if n > 0 else 0.0
 
-    return {
-        "total_cost": round(total_cost, 4),
-        "avg_quality": round(avg_quality, 4),
-        "overkill_pct": round(overkill_count / n, 4),
-        "cost_quality_ratio": round(cq_ratio, 4),
-        "cost_per_story_point": round(cost_per_sp, 4),
-        "assigned_count": n,
+    # Architecture score: low quality variance = high score
+    # (fewer than two assignments have stdev 0, i.e. a perfect score)
+    architecture_score = max(0.0, 1.0 - stdev / 0.3)
+
+    gate = {
+        "gate_1_pass_rate": gate_1_rate,
+        "gate_1_passed": passed,
+        "gate_1_failed": failed,
+        "architecture_score": architecture_score,
+    }
+
+    # --- Deadlines ---
+    # Heuristic: local models (latency < 2.0) are slower to complete
+    # complex tasks despite lower per-token latency. Estimate completion
+    # days from complexity token count / throughput
+    # (tokens_per_day estimate: cloud ~50k/day, local ~10k/day).
+    deadline_days = cols.deadline[mask]
+    tokens_per_day = np.where(soa.is_local[agent_i], 10000.0, 50000.0)
+    est_days = np.where(np.isnan(tokens), 1000.0, tokens) / tokens_per_day
+    has_deadline = deadline_days >= 0
+    total_with_deadline = int(np.count_nonzero(has_deadline))
+    deadline_violations = int(np.count_nonzero(has_deadline & (est_days > deadline_days)))
+
+    # Dependency quality check: downstream agent quality >= upstream
+    src_agent = _gather(idx, cols.dep_src)
+    dst_agent = idx[cols.dep_dst]
+    checked = (src_agent >= 0) & (dst_agent >= 0)
+    dep_pairs_checked = int(np.count_nonzero(checked))
+    dep_violations = int(np.count_nonzero(
+        soa.quality[src_agent[checked]] > soa.quality[dst_agent[checked]]
+    ))
+
+    deadline = {
+        "avg_agent_latency": float(soa.latency[agent_i].mean()) if n > 0 else 0.0,
+        "deadline_violation_rate": (
+            deadline_violations / total_with_deadline
+        ) if total_with_deadline > 0 else 0.0,
+        "deadline_violations": deadline_violations,
+        "total_with_deadline": total_with_deadline,
+        "dep_quality_violations": dep_violations,
+        "dep_pairs_checked": dep_pairs_checked,
+        "dep_violation_rate": (
+            dep_violations / dep_pairs_checked
+        ) if dep_pairs_checked > 0 else 0.0,
     }
 
+    return cost, gate, deadline
 
-def compute_gate_metrics(
+
+def compute_cost_quality_metrics(
     assignments: Dict[int, str],
     intents: Sequence[Any],
     agents: Dict[str, Any],
+    soa: Optional[AgentSoA] = None,
 ) -> Dict[str, Any]:
-    """Compute predicted gate pass rates from assignments.
+    """Compute cost and quality metrics from assignments.
 
-    Gate 1 (per-intent): agent quality >= intent min_quality
-    Gate 3 (architecture): quality consistency across assignments
-        (mirrors quality_gates.py architecture_score: max(0, 100*(1 - stdev/0.3)))
+    See compute_assignment_metrics(), which computes this together with
+    the gate and deadline metrics.
 
     Args:
         assignments: intent_index -> agent_name mapping
-        intents: List of intent dicts with 'min_quality'
-        agents: Full agent pool dict
+        intents: List of intent dicts with 'estimated_tokens', 'min_quality'
+        agents: Full agent pool dict (agent_name -> agent dict)
+        soa: Precomputed AgentSoA for ``agents`` (built if omitted)
 
     Returns:
-        Dict with gate pass rates and counts
+        Dict with cost/quality metrics
     """
-    passed = 0
-    failed = 0
-    quality_scores = []
+    return compute_assignment_metrics(assignments, intents, agents, soa)[0]
 
-    for idx, intent in enumerate(intents):
-        agent_name = assignments.get(idx)
-        if not agent_name or agent_name not in agents:
-            continue
 
-        agent_quality = agents[agent_name]['quality']
-        min_quality = intent.get('min_quality', 0)
-        quality_scores.append(agent_quality)
-
-        if agent_quality >= min_quality:
-            passed += 1
-        else:
-            failed += 1
+def compute_gate_metrics(
+    assignments: Dict[int, str],
+    intents: Sequence[Any],
+    agents: Dict[str, Any],
+    soa: Optional[AgentSoA] = None,
+) -> Dict[str, Any]:
+    """Compute predicted gate pass rates from assignments.
 
-    total = passed + failed
-    gate_1_rate = passed / total if total > 0 else 0.0
+    See compute_assignment_metrics(), which computes this together with
+    the cost/quality and deadline metrics.
 
-    # Architecture score: low quality variance = high score
-    if len(quality_scores) >= 2:
-        stdev = statistics.stdev(quality_scores)
-        architecture_score = max(0.0, 1.0 - stdev / 0.3)
-    else:
-        architecture_score = 1.0
+    Args:
+        assignments: intent_index -> agent_name mapping
+        intents: List of intent dicts with 'min_quality'
+        agents: Full agent pool dict
+        soa: Precomputed AgentSoA for ``agents`` (built if omitted)
 
-    return {
-        "gate_1_pass_rate": round(gate_1_rate, 4),
-        "gate_1_passed": passed,
-        "gate_1_failed": failed,
-        "architecture_score": round(architecture_score, 4),
-    }
+    Returns:
+        Dict with gate pass rates and counts
+    """
+    return compute_assignment_metrics(assignments, intents, agents, soa)[1]
 
 
 def compute_deadline_metrics(
     assignments: Dict[int, str],
     intents: Sequence[Any],
     agents: Dict[str, Any],
+    soa: Optional[AgentSoA] = None,
 ) -> Dict[str, Any]:
     """Compute deadline and dependency violation metrics.
 
-    For each assigned intent with a deadline, estimates whether the agent's
-    latency characteristic would cause a miss. Also checks dependency quality
-    ordering (downstream quality should not drop below upstream).
+    See compute_assignment_metrics(), which computes this together with
+    the cost/quality and gate metrics.
 
     Args:
         assignments: intent_index -> agent_name mapping
         intents: List of intent dicts with 'deadline' (days), 'depends'
         agents: Full agent pool dict
+        soa: Precomputed AgentSoA for ``agents`` (built if omitted)
 
     Returns:
         Dict with deadline and dependency violation metrics
     """
-    total_with_deadline = 0
-    deadline_violations = 0
-    dep_violations = 0
-    dep_pairs_checked = 0
-    avg_latency = 0.0
-    latency_count = 0
-
-    for idx, intent in enumerate(intents):
-        agent_name = assignments.get(idx)
-        if not agent_name or agent_name not in agents:
-            continue
-
-        agent = agents[agent_name]
-        avg_latency += agent['latency']
-        latency_count += 1
-
-        # Deadline check: intents with tight deadlines assigned to slow agents
-        deadline = intent.get('deadline', -1)
-        if deadline >= 0:
-            total_with_deadline += 1
-            # Heuristic: local models (latency < 2.0) are slower to complete
-            # complex tasks despite lower per-token latency. Estimate completion
-            # days from complexity token count / throughput.
-            tokens = intent.get('estimated_tokens', 1000)
-            # tokens_per_day estimate: cloud ~50k/day, local ~10k/day
-            tokens_per_day = 50000 if not agent.get('is_local') else 10000
-            est_days = tokens / tokens_per_day
-            if est_days > deadline:
-                deadline_violations += 1
-
-        # Dependency quality check: downstream agent quality >= upstream
-        for dep_idx in intent.get('depends', []):
-            dep_agent = assignments.get(dep_idx)
-            if dep_agent and dep_agent in agents:
-                dep_pairs_checked += 1
-                if agents[dep_agent]['quality'] > agent['quality']:
-                    dep_violations += 1
-
-    n = latency_count
-    return {
-        "avg_agent_latency": round(avg_latency / n, 4) if n > 0 else 0.0,
-        "deadline_violation_rate": round(
-            deadline_violations / total_with_deadline, 4
-        ) if total_with_deadline > 0 else 0.0,
-        "deadline_violations": deadline_violations,
-        "total_with_deadline": total_with_deadline,
-        "dep_quality_violations": dep_violations,
-        "dep_pairs_checked": dep_pairs_checked,
-        "dep_violation_rate": round(
-            dep_violations / dep_pairs_checked, 4
-        ) if dep_pairs_checked > 0 else 0.0,
-    }
+    return compute_assignment_metrics(assignments, intents, agents, soa)[2]
+
+
+_last_timestamp: Tuple[int, str] = (-1, "")
+
+
+def _utc_timestamp() -> str:
+    """UTC ISO-8601 timestamp at second resolution, formatted once per second."""
+    global _last_timestamp
+    now = int(time.time())
+    if _last_timestamp[0] != now:
+        stamp = datetime.fromtimestamp(now, timezone.utc).isoformat()
+        _last_timestamp = (now, stamp)
+    return _last_timestamp[1]
 
 
 def compute_metrics(
@@ -365,6 +922,13 @@ def compute_metrics(
     This is the single entry point. Takes raw solver output — no
     pre-extraction of rates/qualities/latencies needed.
 
+    Array views of ``agents`` are cached per pool object and rebuilt when
+    agents are added, removed or replaced. Fields edited in place inside
+    an agent dict are not detected; call clear_metric_caches() after such
+    an edit. The same applies to ``workflow_chains``: appending,
+    replacing or resizing chains is detected, overwriting a step index in
+    place is not.
+
     Args:
         assignments: intent_index -> agent_name from solve_cpsat()
         intents: List of intent dicts from generate_intents()
@@ -375,15 +939,20 @@ def compute_metrics(
         solver_duration_s: How long the solver took in seconds
 
     Returns:
-        JSON-serializable dict with all metrics
+        JSON-serializable dict with all metrics. Values are left at full
+        precision; round when displaying (see TelemetryLog.summary()).
     """
     if weights is None:
         weights = dict(DEFAULT_WEIGHTS)
 
-    chain = compute_chain_metrics(assignments, agents, workflow_chains)
-    cost = compute_cost_quality_metrics(assignments, intents, agents)
-    gate = compute_gate_metrics(assignments, intents, agents)
-    deadline = compute_deadline_metrics(assignments, intents, agents)
+    soa = _agents_to_soa(agents)
+    assign_idx = _assignment_index(assignments, len(intents), soa.name_to_i)
+    chain = compute_chain_metrics(
+        assignments, agents, workflow_chains, soa, assign_idx,
+    )
+    cost, gate, deadline = compute_assignment_metrics(
+        assignments, intents, agents, soa, assign_idx,
+    )
 
     return {
         "chain_coherence": chain,
@@ -397,35 +966,105 @@ def compute_metrics(
             "num_assigned": len(assignments),
             "num_agents": len(agents),
             "num_chains": len(workflow_chains),
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": _utc_timestamp(),
         },
     }
 
 
+# Per-process context for compute_metrics_batch() workers.
+_batch_context: Optional[Tuple[Sequence[Any], Dict[str, Any], Sequence[Any]]] = None
+
+
+def _init_batch_worker(
+    intents: Sequence[Any],
+    agents: Dict[str, Any],
+    workflow_chains: Sequence[Any],
+) -> None:
+    global _batch_context
+    _batch_context = (intents, agents, workflow_chains)
+    # Warm the per-pool caches once per worker rather than once per run.
+    _agents_to_soa(agents)
+    _chain_arrays(workflow_chains)
+
+
+def _batch_worker(run: Tuple[Dict[int, str], Optional[Dict[str, float]]]) -> Dict[str, Any]:
+    intents, agents, workflow_chains = _batch_context
+    assignments, weights = run
+    return compute_metrics(assignments, intents, agents, workflow_chains, weights)
+
+
+def compute_metrics_batch(
+    runs: Sequence[Tuple[Dict[int, str], Optional[Dict[str, float]]]],
+    intents: Sequence[Any],
+    agents: Dict[str, Any],
+    workflow_chains: Sequence[Any],
+    max_workers: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """Compute metrics for many candidate runs over one workflow.
+
+    Runs are independent, so they are spread across worker processes.
+    The shared intents, agent pool and chains are sent to each worker
+    once (via the pool initializer) instead of with every run.
+
+    Args:
+        runs: (assignments, weights) pairs, one per candidate
+        intents: List of intent dicts from generate_intents()
+        agents: Agent pool dict from build_agent_pool()
+        workflow_chains: From build_workflow_chains()
+        max_workers: Worker processes (os.cpu_count() if omitted);
+            1 computes serially in this process
+
+    Returns:
+        compute_metrics() results, in the same order as ``runs``
+    """
+    workers = max_workers or os.cpu_count() or 1
+    if workers == 1 or len(runs) <= 1:
+        return [
+            compute_metrics(assignments, intents, agents, workflow_chains, weights)
+            for assignments, weights in runs
+        ]
+
+    workers = min(workers, len(runs))
+    chunksize = max(1, len(runs) // (workers * 4))
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_batch_worker,
+        initargs=(intents, agents, workflow_chains),
+    ) as pool:
+        return list(pool.map(_batch_worker, runs, chunksize=chunksize))
+
+
 # ---------------------------------------------------------------------------
 # Weight perturbation for self-tuning (future use)
 # ---------------------------------------------------------------------------
 
+_RNG = np.random.default_rng()
+
+
 def perturb_weights(
     weights: Dict[str, float],
     perturbation_pct: float = 0.1,
+    rng: Optional[np.random.Generator] = None,
 ) -> Dict[str, float]:
     """Perturb weights by a percentage (for exploration).
-    
+
+    All factors are drawn in one batched call.
+
     Args:
         weights: Current weight configuration
         perturbation_pct: ±percentage to perturb (e.g., 0.1 = ±10%)
-    
+        rng: Generator to draw from (module-level generator if omitted);
+            pass a seeded one for reproducible sweeps
+
     Returns:
         Perturbed weight configuration
     """
-    import random
-    
-    perturbed = {}
-    for k, v in weights.items():
-        factor = random.uniform(1 - perturbation_pct, 1 + perturbation_pct)
-        perturbed[k] = v * factor
-    return perturbed
+    if rng is None:
+        rng = _RNG
+    keys = list(weights)
+    values = np.fromiter((weights[k] for k in keys), np.float64, len(keys))
+    factors = rng.uniform(1 - perturbation_pct, 1 + perturbation_pct, size=len(keys))
+    return dict(zip(keys, (values * factors).tolist()))
 
 
 # ---------------------------------------------------------------------------
@@ -1,7 +1,8 @@
-"""Wave Executor -- orchestrates agent execution wave-by-wave.
+"""Wave Executor -- orchestrates agent execution of a staffing plan.
 
 Takes a staffing plan (from generate_staffing_plan) and executes it:
-  - Runs waves sequentially, intents within each wave in parallel
+  - Schedules intents as a dependency DAG: each starts once its own
+    dependencies finish, so consecutive waves overlap
   - Validates quality gates at each checkpoint (per-intent, per-wave, final)
   - Handles failures with retry -> escalate -> human-flag ladder
   - Generates agent todo markdown per intent
@@ -9,6 +10,7 @@ Takes a staffing plan (from generate_staffing_plan) and executes it:
 
 Usage:
     python -m quantum_routing.wave_executor
+    QR_FAST_SIM=1 python -m quantum_routing.wave_executor  # no simulated latency
 
 See plans/agent-team-decomposer-ops.md (Part 6) for the design rationale.
 """
@@ -16,14 +18,19 @@ See plans/agent-team-decomposer-ops.md (Part 6) for the design rationale.
 from __future__ import annotations
 
 import os
+import queue
 import random
-import re
 import threading
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import weakref
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from dataclasses import dataclass, field
+from functools import lru_cache
+from itertools import chain
 from pathlib import Path
-from typing import Any, Callable, Dict, List, Optional, Protocol, Tuple
+from typing import Any, Callable, Dict, List, Optional, Protocol, Set, Tuple
+
+import numpy as np
 
 from quantum_routing.quality_gates import (
     IntentResult,
@@ -66,6 +73,7 @@ class IntentExecution:
     intent_id: str
     profile: str
     model: str
+    wave_index: int = 0
     attempts: List[IntentResult] = field(default_factory=list)
     final_result: Optional[IntentResult] = None
     validation: Optional[ValidationResult] = None
@@ -99,7 +107,13 @@ class ExecutionResult:
 
 
 class ExecutionBackend(Protocol):
-    """Protocol for pluggable execution backends."""
+    """Protocol for pluggable execution backends.
+
+    Backends may set ``supports_backoff = False`` to skip the sleep between
+    retry attempts (in-process simulators have no contention to back off
+    from), and ``needs_todo_md = False`` when they never read
+    ``context.todo_md``. Both default to True when absent.
+    """
 
     def execute_intent(
         self, intent_spec: Dict[str, Any], context: ExecutionContext
@@ -111,39 +125,112 @@ class ExecutionBackend(Protocol):
 # ---------------------------------------------------------------------------
 
 class ArtifactCollector:
-    """Thread-safe accumulator of artifacts across waves."""
+    """Thread-safe accumulator of artifacts across waves.
+
+    Writers publish a fresh immutable snapshot under a short lock; readers
+    take ``self._artifacts`` once and never lock, since rebinding an
+    attribute is atomic.
+    """
 
     def __init__(self) -> None:
-        self._artifacts: Dict[str, List[str]] = {}
+        self._artifacts: Dict[str, Tuple[str, ...]] = {}
         self._lock = threading.Lock()
 
     def record(self, intent_id: str, artifacts: List[str]) -> None:
         with self._lock:
-            self._artifacts.setdefault(intent_id, []).extend(artifacts)
+            old = self._artifacts
+            self._artifacts = {
+                **old, intent_id: old.get(intent_id, ()) + tuple(artifacts),
+            }
 
     def get_for_intent(self, intent_id: str) -> List[str]:
-        with self._lock:
-            return list(self._artifacts.get(intent_id, []))
+        return list(self._artifacts.get(intent_id, ()))
 
     def get_for_dependencies(self, dep_ids: List[str]) -> List[str]:
-        with self._lock:
-            result: List[str] = []
-            for dep_id in dep_ids:
-                result.extend(self._artifacts.get(dep_id, []))
-            return result
+        snap = self._artifacts
+        return list(chain.from_iterable([snap.get(d, ()) for d in dep_ids]))
 
     def collect_wave_artifacts(self, wave_exec: WaveExecution) -> Dict[str, List[str]]:
-        with self._lock:
-            return {
-                iid: list(self._artifacts.get(iid, []))
-                for iid in wave_exec.intent_executions
-            }
+        snap = self._artifacts
+        return {
+            iid: list(snap.get(iid, ()))
+            for iid in wave_exec.intent_executions
+        }
 
 
 # ---------------------------------------------------------------------------
 # AgentTodoGenerator
 # ---------------------------------------------------------------------------
 
+DEFAULT_MISSION = "Execute the assigned intent."
+DEFAULT_WORKFLOW = "Follow standard git-pr workflow."
+DEFAULT_QUALITY_GATES = "Verify all tests pass."
+
+_DEFAULT_SECTIONS: Tuple[str, str, str] = (
+    DEFAULT_MISSION, DEFAULT_WORKFLOW, DEFAULT_QUALITY_GATES,
+)
+
+_TODO_TEMPLATE = """\
+# Agent Todo: {intent_id}
+
+**Profile:** {profile}
+**Model:** {model}
+**Wave:** {wave}
+**Complexity:** {complexity}
+
+## Mission
+
+{mission}
+
+## Task
+
+Execute intent `{intent_id}` as part of wave {wave}.{deps_block}{artifacts_block}
+
+## Workflow
+
+{workflow}
+
+## Quality Gates Checklist
+
+{quality_gates}
+"""
+
+
+@lru_cache(maxsize=512)
+def _build_todo_md(
+    sections: Tuple[str, str, str],
+    intent_id: str,
+    profile: str,
+    model: str,
+    wave_index: int,
+    complexity: str,
+    depends_on: Tuple[str, ...],
+    predecessor_artifacts: Tuple[str, ...],
+) -> str:
+    """Render agent-todo.md; pure, so identical inputs share one string."""
+    mission, workflow, quality_gates = sections
+    deps_block = (
+        "\n\n**Dependencies:** " + ", ".join(depends_on) if depends_on else ""
+    )
+    artifacts_block = (
+        "\n\n## Predecessor Artifacts\n\n"
+        + "\n".join(f"- {art}" for art in predecessor_artifacts)
+        if predecessor_artifacts else ""
+    )
+    return _TODO_TEMPLATE.format(
+        intent_id=intent_id,
+        profile=profile,
+        model=model,
+        wave=wave_index,
+        complexity=complexity,
+        mission=mission,
+        deps_block=deps_block,
+        artifacts_block=artifacts_block,
+        workflow=workflow,
+        quality_gates=quality_gates,
+    )
+
+
 class AgentTodoGenerator:
     """Reads .claude/agents/{profile}.md and generates per-intent todo markdown."""
 
@@ -153,14 +240,19 @@ class AgentTodoGenerator:
             repo_root = Path(__file__).resolve().parent.parent.parent
             agents_dir = str(repo_root / ".claude" / "agents")
         self._agents_dir = Path(agents_dir)
-        self._profiles: Dict[str, Dict[str, str]] = {}
+        # profile -> (mission, workflow, quality_gates)
+        self._profiles: Dict[str, Tuple[str, str, str]] = {}
         self._load_profiles()
 
     def _load_profiles(self) -> None:
         for md_file in self._agents_dir.glob("*.md"):
             profile_name = md_file.stem
-            content = md_file.read_text()
-            self._profiles[profile_name] = self._parse_sections(content)
+            sections = self._parse_sections(md_file.read_text())
+            self._profiles[profile_name] = (
+                sections.get("Mission", DEFAULT_MISSION),
+                sections.get("Workflow: git-pr", DEFAULT_WORKFLOW),
+                sections.get("Quality Gates", DEFAULT_QUALITY_GATES),
+            )
 
     @staticmethod
     def _parse_sections(content: str) -> Dict[str, str]:
@@ -170,11 +262,11 @@ class AgentTodoGenerator:
         current_lines: List[str] = []
 
         for line in content.splitlines():
-            heading_match = re.match(r'^##\s+(.+)', line)
-            if heading_match:
+            # "##", whitespace, then at least one more character
+            if line.startswith("##") and len(line) > 3 and line[2].isspace():
                 if current_section is not None:
                     sections[current_section] = "\n".join(current_lines).strip()
-                current_section = heading_match.group(1).strip()
+                current_section = line[2:].strip()
                 current_lines = []
             elif current_section is not None:
                 current_lines.append(line)
@@ -203,52 +295,16 @@ class AgentTodoGenerator:
             The generated markdown string.
         """
         profile = intent_spec["profile"]
-        sections = self._profiles.get(profile, {})
-
-        mission = sections.get("Mission", "Execute the assigned intent.")
-        workflow = sections.get("Workflow: git-pr", "Follow standard git-pr workflow.")
-        quality_gates = sections.get("Quality Gates", "Verify all tests pass.")
-
-        lines = [
-            f"# Agent Todo: {intent_spec['id']}",
-            "",
-            f"**Profile:** {profile}",
-            f"**Model:** {intent_spec['model']}",
-            f"**Wave:** {wave_index}",
-            f"**Complexity:** {intent_spec['complexity']}",
-            "",
-            "## Mission",
-            "",
-            mission,
-            "",
-            "## Task",
-            "",
-            f"Execute intent `{intent_spec['id']}` as part of wave {wave_index}.",
-        ]
-
-        if intent_spec.get("depends_on"):
-            lines.append("")
-            lines.append("**Dependencies:** " + ", ".join(intent_spec["depends_on"]))
-
-        if predecessor_artifacts:
-            lines.append("")
-            lines.append("## Predecessor Artifacts")
-            lines.append("")
-            for art in predecessor_artifacts:
-                lines.append(f"- {art}")
-
-        lines.extend([
-            "",
-            "## Workflow",
-            "",
-            workflow,
-            "",
-            "## Quality Gates Checklist",
-            "",
-            quality_gates,
-        ])
-
-        todo_md = "\n".join(lines) + "\n"
+        todo_md = _build_todo_md(
+            self._profiles.get(profile, _DEFAULT_SECTIONS),
+            intent_spec["id"],
+            profile,
+            intent_spec["model"],
+            wave_index,
+            intent_spec["complexity"],
+            tuple(intent_spec.get("depends_on") or ()),
+            tuple(predecessor_artifacts),
+        )
 
         if output_dir:
             out_path = Path(output_dir) / f"{intent_spec['id']}-todo.md"
@@ -258,6 +314,15 @@ class AgentTodoGenerator:
         return todo_md
 
 
+@lru_cache(maxsize=8)
+def _get_todo_generator(agents_dir: Optional[str] = None) -> AgentTodoGenerator:
+    """Shared generator per agents_dir, so profiles are read from disk once.
+
+    Generators are read-only after construction, which makes sharing safe.
+    """
+    return AgentTodoGenerator(agents_dir)
+
+
 # ---------------------------------------------------------------------------
 # SimulatedBackend
 # ---------------------------------------------------------------------------
@@ -274,36 +339,130 @@ _ARTIFACT_TEMPLATES: Dict[str, List[str]] = {
 }
 
 
+def _make_formatter(template: str) -> Callable[[int, str], str]:
+    """Pre-split a single-field artifact template into a concatenating closure.
+
+    Templates with anything other than one ``{pr}`` or ``{id}`` field fall
+    back to ``str.format``.
+    """
+    for name in ("pr", "id"):
+        head, sep, tail = template.partition("{" + name + "}")
+        if sep and "{" not in head and "{" not in tail:
+            if name == "pr":
+                return lambda pr, intent_id: f"{head}{pr}{tail}"
+            return lambda pr, intent_id: f"{head}{intent_id}{tail}"
+    return lambda pr, intent_id: template.format(pr=pr, id=intent_id)
+
+
+_ARTIFACT_FORMATTERS: Dict[str, List[Callable[[int, str], str]]] = {
+    profile: [_make_formatter(t) for t in templates]
+    for profile, templates in _ARTIFACT_TEMPLATES.items()
+}
+_DEFAULT_ARTIFACT_FORMATTERS = [_make_formatter("PR #{pr}")]
+
+# Simulated failure messages per profile
+_ERROR_POOLS: Dict[str, Tuple[str, ...]] = {
+    "bug-hunter": (
+        "Could not reproduce bug in test environment",
+        "Regression test timeout after 30s",
+    ),
+    "feature-trailblazer": (
+        "Build failed: type mismatch in interface",
+        "Integration test failure in dependent module",
+    ),
+    "testing-guru": (
+        "Flaky test detected: non-deterministic ordering",
+        "Coverage tool segfault on large file",
+    ),
+    "tenacious-unit-tester": (
+        "Mock setup error: unexpected call sequence",
+        "Assertion error in edge case test",
+    ),
+    "docs-logs-wizard": (
+        "Markdown lint errors in generated docs",
+        "Broken internal links in API reference",
+    ),
+    "task-predator": (
+        "Plan validation failed: circular dependency in proposed architecture",
+        "Missing requirements traceability",
+    ),
+    "code-ace-reviewer": (
+        "Review blocked: PR has merge conflicts",
+        "Static analysis found critical issues",
+    ),
+}
+_DEFAULT_ERRORS: Tuple[str, ...] = ("Unexpected execution error",)
+
+# Executions' worth of random draws generated per refill
+_PREFETCH_SIZE = 256
+
+
 class SimulatedBackend:
     """Controllable simulated execution backend.
 
+    Retries are not delayed by the executor's backoff (``supports_backoff``
+    is False), and no agent todo is rendered for it (``needs_todo_md`` is
+    False).
+
     Args:
         failure_rate: Base probability of failure on first attempt (0.0-1.0).
         quality_mean: Mean quality score for successful executions.
         quality_std: Std deviation of quality scores.
         seed: Random seed for reproducibility.
+        simulate_latency: Sleep 10-50 ms per successful execution. Turn off
+            for tests and benchmarks; results are identical either way.
     """
 
+    supports_backoff = False
+    needs_todo_md = False
+
     def __init__(
         self,
         failure_rate: float = 0.15,
         quality_mean: float = 0.85,
         quality_std: float = 0.08,
         seed: int = 42,
+        simulate_latency: bool = True,
     ) -> None:
         self.failure_rate = failure_rate
         self.quality_mean = quality_mean
         self.quality_std = quality_std
-        self._rng = random.Random(seed)
+        self.simulate_latency = simulate_latency
+        self._rng = np.random.default_rng(seed)
+        self._draw_lock = threading.Lock()
+        self._uniform_pool: List[List[float]] = []
+        self._normal_pool: List[List[float]] = []
+        self._cursor = 0
         self._pr_counter = 100
 
+    def _prefetch(self, n: int) -> None:
+        """Refill the draw pools with ``n`` executions' worth of numbers."""
+        self._uniform_pool = self._rng.random((n, 2)).tolist()
+        self._normal_pool = self._rng.standard_normal((n, 2)).tolist()
+        self._cursor = 0
+
+    def _next_draws(self) -> Tuple[float, float, float, float]:
+        """Two uniforms and two standard normals for one execution."""
+        with self._draw_lock:
+            i = self._cursor
+            if i >= len(self._uniform_pool):
+                self._prefetch(_PREFETCH_SIZE)
+                i = 0
+            self._cursor = i + 1
+            (u_fail, u_aux), (z_quality, z_coverage) = (
+                self._uniform_pool[i], self._normal_pool[i],
+            )
+        return u_fail, u_aux, z_quality, z_coverage
+
     def execute_intent(
         self, intent_spec: Dict[str, Any], context: ExecutionContext
     ) -> IntentResult:
+        u_fail, u_aux, z_quality, z_coverage = self._next_draws()
+
         # Failure rate decreases on retries (simulates real retry success)
         effective_failure_rate = self.failure_rate / context.attempt
 
-        if self._rng.random() < effective_failure_rate:
+        if u_fail < effective_failure_rate:
             return IntentResult(
                 intent_id=context.intent_id,
                 profile=context.profile,
@@ -312,13 +471,13 @@ class SimulatedBackend:
                 tests_passed=False,
                 coverage_delta=0.0,
                 artifacts=[],
-                error_message=self._random_error(context.profile),
+                error_message=self._random_error(context.profile, u_aux),
             )
 
         # Successful execution
-        quality = max(0.0, min(1.0, self._rng.gauss(
-            self.quality_mean, self.quality_std
-        )))
+        quality = max(0.0, min(1.0,
+            self.quality_mean + self.quality_std * z_quality
+        ))
 
         # Higher-quality models produce slightly better results
         model_bonus = TOKEN_RATES.get(context.model, 0) * 1000
@@ -327,20 +486,20 @@ class SimulatedBackend:
         self._pr_counter += 1
         pr_num = self._pr_counter
 
-        templates = _ARTIFACT_TEMPLATES.get(context.profile, ["PR #{pr}"])
-        artifacts = [
-            t.format(pr=pr_num, id=context.intent_id)
-            for t in templates
-        ]
+        formatters = _ARTIFACT_FORMATTERS.get(
+            context.profile, _DEFAULT_ARTIFACT_FORMATTERS,
+        )
+        artifacts = [f(pr_num, context.intent_id) for f in formatters]
 
         coverage_delta = 0.0
         if context.profile in ("testing-guru", "tenacious-unit-tester"):
-            coverage_delta = max(0.01, self._rng.gauss(0.05, 0.02))
+            coverage_delta = max(0.01, 0.05 + 0.02 * z_coverage)
         elif context.profile == "bug-hunter":
-            coverage_delta = max(0.0, self._rng.gauss(0.02, 0.01))
+            coverage_delta = max(0.0, 0.02 + 0.01 * z_coverage)
 
         # Simulate execution time
-        time.sleep(self._rng.uniform(0.01, 0.05))
+        if self.simulate_latency:
+            time.sleep(0.01 + 0.04 * u_aux)
 
         return IntentResult(
             intent_id=context.intent_id,
@@ -352,95 +511,197 @@ class SimulatedBackend:
             artifacts=artifacts,
         )
 
-    def _random_error(self, profile: str) -> str:
-        errors = {
-            "bug-hunter": [
-                "Could not reproduce bug in test environment",
-                "Regression test timeout after 30s",
-            ],
-            "feature-trailblazer": [
-                "Build failed: type mismatch in interface",
-                "Integration test failure in dependent module",
-            ],
-            "testing-guru": [
-                "Flaky test detected: non-deterministic ordering",
-                "Coverage tool segfault on large file",
-            ],
-            "tenacious-unit-tester": [
-                "Mock setup error: unexpected call sequence",
-                "Assertion error in edge case test",
-            ],
-            "docs-logs-wizard": [
-                "Markdown lint errors in generated docs",
-                "Broken internal links in API reference",
-            ],
-            "task-predator": [
-                "Plan validation failed: circular dependency in proposed architecture",
-                "Missing requirements traceability",
-            ],
-            "code-ace-reviewer": [
-                "Review blocked: PR has merge conflicts",
-                "Static analysis found critical issues",
-            ],
-        }
-        pool = errors.get(profile, ["Unexpected execution error"])
-        return self._rng.choice(pool)
+    def _random_error(self, profile: str, u: float) -> str:
+        """Pick an error for ``profile`` using the uniform draw ``u``."""
+        pool = _ERROR_POOLS.get(profile, _DEFAULT_ERRORS)
+        return pool[int(u * len(pool))]
 
 
 # ---------------------------------------------------------------------------
 # WaveExecutor
 # ---------------------------------------------------------------------------
 
-def _next_higher_model(profile: str, current_model: str) -> str:
-    """Pick the next-higher-quality model from PROFILE_AGENT_MODELS."""
-    models = PROFILE_AGENT_MODELS.get(profile, [])
-    # Sort by token rate (proxy for quality) descending
-    sorted_models = sorted(models, key=lambda m: TOKEN_RATES.get(m, 0), reverse=True)
+def _available_cpus() -> int:
+    """CPUs this process may run on (affinity-aware where supported)."""
+    if hasattr(os, "sched_getaffinity"):
+        n = len(os.sched_getaffinity(0))
+        if n:
+            return n
+    return os.cpu_count() or 4
+
+
+def _default_max_workers(backend: ExecutionBackend) -> int:
+    """Pool size for ``backend`` when the caller doesn't pick one."""
+    cpus = _available_cpus()
+    if isinstance(backend, SimulatedBackend):
+        return min(32, cpus * 2)
+    return cpus
+
+
+_BACKOFF_BASE = 0.1
+_BACKOFF_CAP = 5.0
+
+
+def _backoff_delay(attempt: int) -> float:
+    """Capped exponential delay after ``attempt`` with 0.5x-1.5x jitter."""
+    return min(_BACKOFF_CAP, _BACKOFF_BASE * (2 ** (attempt - 1))) * (
+        0.5 + random.random()
+    )
+
+
+def _build_escalation_table() -> Dict[str, Tuple[Dict[str, str], str]]:
+    """Map each profile to ({model: next-higher model}, best model)."""
+    table: Dict[str, Tuple[Dict[str, str], str]] = {}
+    for profile, models in PROFILE_AGENT_MODELS.items():
+        if not models:
+            continue
+        # Sort by token rate (proxy for quality) descending
+        sorted_models = sorted(
+            models, key=lambda m: TOKEN_RATES.get(m, 0), reverse=True,
+        )
+        best = sorted_models[0]
+        table[profile] = (
+            {m: sorted_models[i - 1] if i > 0 else best
+             for i, m in enumerate(sorted_models)},
+            best,
+        )
+    return table
+
+
+_ESCALATION_NEXT = _build_escalation_table()
 
-    found = False
-    for m in reversed(sorted_models):
-        if found:
-            return m  # return the one above current
-        if m == current_model:
-            found = True
 
+def _next_higher_model(profile: str, current_model: str) -> str:
+    """Pick the next-higher-quality model from PROFILE_AGENT_MODELS."""
+    entry = _ESCALATION_NEXT.get(profile)
+    if entry is None:
+        return current_model
+    next_model, best = entry
     # If current is already the best or not found, return the best available
-    return sorted_models[0] if sorted_models else current_model
+    return next_model.get(current_model, best)
 
 
 ProgressCallback = Callable[[str, Dict[str, Any]], None]
 
 
+class _EventPump:
+    """Delivers progress events to their callbacks from one dedicated thread.
+
+    Worker threads only enqueue; the pump thread invokes callbacks in FIFO
+    order. flush() blocks until everything queued so far has been
+    delivered and re-raises the first callback error, if any.
+    """
+
+    def __init__(self) -> None:
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._errors: List[BaseException] = []
+        self._thread = threading.Thread(
+            target=self._run, args=(self._queue, self._errors),
+            name="wave-exec-events", daemon=True,
+        )
+        self._thread.start()
+        # Stop the thread if the pump is dropped without close()
+        weakref.finalize(self, self._queue.put, None)
+
+    @staticmethod
+    def _run(q: queue.SimpleQueue, errors: List[BaseException]) -> None:
+        while True:
+            item = q.get()
+            if item is None:
+                return
+            if isinstance(item, threading.Event):
+                item.set()
+                continue
+            callback, event, data = item
+            try:
+                callback(event, data)
+            except Exception as exc:
+                errors.append(exc)
+
+    def put(self, callback: ProgressCallback, event: str, data: Dict[str, Any]) -> None:
+        self._queue.put((callback, event, data))
+
+    def flush(self) -> None:
+        drained = threading.Event()
+        self._queue.put(drained)
+        drained.wait()
+        if self._errors:
+            error = self._errors[0]
+            self._errors.clear()
+            raise error
+
+    def close(self) -> None:
+        self._queue.put(None)
+        self._thread.join()
+
+
 class WaveExecutor:
-    """Orchestrates wave-by-wave execution of a staffing plan.
+    """Orchestrates dependency-scheduled execution of a staffing plan.
+
+    Intents run as soon as their own ``depends_on`` predecessors finish,
+    so waves overlap; a wave is validated (Gate 2) once all its intents
+    are done. ``wave_started`` events follow dispatch, so a wave can start
+    before an earlier one completes, but ``wave_completed`` events are
+    always delivered in plan order.
 
     Args:
         backend: Execution backend (default: SimulatedBackend).
         max_retries: Maximum attempts per intent before human flag (default 4).
-        max_workers: Thread pool size for parallel intent execution.
-        progress_callback: Optional callback for progress events.
+        max_workers: Thread pool size for parallel intent execution. None
+            sizes it from the usable CPUs: twice the count (capped at 32)
+            for the latency-bound SimulatedBackend, the count itself for
+            other backends.
+        progress_callback: Optional callback for progress events. It is
+            called from a single event thread, in emission order, and all
+            events have been delivered by the time execute_plan returns.
+
+    The worker pool lives as long as the executor and is reused across
+    waves; call close() or use the executor as a context manager.
     """
 
     def __init__(
         self,
         backend: Optional[ExecutionBackend] = None,
         max_retries: int = 4,
-        max_workers: int = 8,
+        max_workers: Optional[int] = None,
         progress_callback: Optional[ProgressCallback] = None,
     ) -> None:
         self.backend = backend or SimulatedBackend()
         self.max_retries = max_retries
+        if max_workers is None:
+            max_workers = _default_max_workers(self.backend)
         self.max_workers = max_workers
         self.progress_callback = progress_callback
         self.artifacts = ArtifactCollector()
-        self.todo_generator = AgentTodoGenerator()
+        self.todo_generator = _get_todo_generator()
+        self._pool = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="wave-exec",
+        )
+        self._events = _EventPump()
+
+    def close(self) -> None:
+        """Shut down the worker pool, waiting for running intents."""
+        self._pool.shutdown(wait=True)
+        self._events.close()
+
+    def __enter__(self) -> "WaveExecutor":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
 
     def _emit(self, event: str, data: Dict[str, Any]) -> None:
         if self.progress_callback:
-            self.progress_callback(event, data)
+            self._events.put(self.progress_callback, event, data)
 
     def execute_plan(self, staffing_plan: Dict[str, Any]) -> ExecutionResult:
-        """Execute a full staffing plan wave-by-wave.
+        """Execute a full staffing plan.
+
+        Intents are dispatched as soon as their own dependencies finish
+        rather than wave-by-wave, so a slow intent only delays its
+        dependents. Waves are still validated and reported as units;
+        ``wave_completed`` is emitted in plan order even when a later
+        wave's intents finish first.
 
         Args:
             staffing_plan: Output of generate_staffing_plan().
@@ -450,82 +711,161 @@ class WaveExecutor:
         """
         result = ExecutionResult()
         plan_start = time.time()
+        wave_plans = staffing_plan["waves"]
+
+        self._emit("execution_started", {
+            "waves": len(wave_plans),
+            "max_workers": self.max_workers,
+        })
+
+        result.waves = self._execute_waves(wave_plans)
+
+        # Plans use a handful of models; resolve each rate once
+        models_present = {
+            ispec.get("model", "gemini") for wp in wave_plans for ispec in wp["intents"]
+        }
+        models_present.add("gemini")
+        rate_by_model = {m: TOKEN_RATES.get(m, 0.000005) for m in models_present}
+
+        for wave_plan, wave_exec in zip(wave_plans, result.waves):
+            # Collect results and tally stats from this wave
+            executions = wave_exec.intent_executions.values()
+            wave_results = [ie.final_result for ie in executions if ie.final_result]
+            result.all_results.extend(wave_results)
+            result.human_review_count += sum(
+                ie.status == "human_review" for ie in executions
+            )
 
-        for wave_plan in staffing_plan["waves"]:
-            wave_exec = self._execute_wave(wave_plan)
-            result.waves.append(wave_exec)
+            specs = {ispec["id"]: ispec for ispec in wave_plan["intents"]}
+            for ie_result in wave_results:
+                spec = specs.get(ie_result.intent_id, {})
+                tokens = spec.get("estimated_tokens", 0)
+                rate = rate_by_model[spec.get("model", "gemini")]
+                result.total_cost += tokens * rate
 
-            # Collect results from this wave
-            for ie in wave_exec.intent_executions.values():
-                if ie.final_result:
-                    result.all_results.append(ie.final_result)
+                if ie_result.status == "completed":
+                    result.passed_count += 1
+                else:
+                    result.failed_count += 1
 
         # Gate 3: Final review
         result.final_verdict = final_review(result.all_results)
-
-        # Tally stats
         result.total_time = time.time() - plan_start
 
-        # Build token/model lookup from the staffing plan
-        intent_specs: Dict[str, Dict[str, Any]] = {}
-        for wp in staffing_plan["waves"]:
-            for ispec in wp["intents"]:
-                intent_specs[ispec["id"]] = ispec
-
-        for ie_result in result.all_results:
-            spec = intent_specs.get(ie_result.intent_id, {})
-            tokens = spec.get("estimated_tokens", 0)
-            model = spec.get("model", "gemini")
-            rate = TOKEN_RATES.get(model, 0.000005)
-            result.total_cost += tokens * rate
-
-            if ie_result.status == "completed":
-                result.passed_count += 1
-            else:
-                result.failed_count += 1
-
-        # Count human reviews
-        for wave_exec in result.waves:
-            for ie in wave_exec.intent_executions.values():
-                if ie.status == "human_review":
-                    result.human_review_count += 1
-
         self._emit("execution_completed", {
             "verdict": result.final_verdict.verdict.value if result.final_verdict else "unknown",
             "passed": result.passed_count,
             "failed": result.failed_count,
             "human_review": result.human_review_count,
         })
+        self._events.flush()
 
         return result
 
-    def _execute_wave(self, wave_plan: Dict[str, Any]) -> WaveExecution:
-        """Execute all intents in a wave in parallel."""
-        wave_index = wave_plan["wave"]
-        wave_exec = WaveExecution(wave_index=wave_index)
+    def _execute_waves(
+        self, wave_plans: List[Dict[str, Any]],
+    ) -> List[WaveExecution]:
+        """Run every intent in the plan as a dependency DAG.
+
+        Each intent is submitted once all of its in-plan ``depends_on``
+        predecessors have finished. A wave starts when its first intent is
+        dispatched and is validated (Gate 2) when its last one finishes;
+        its ``wave_completed`` event waits until every earlier wave has
+        reported. If dependencies can never be satisfied (a cycle), the
+        blocked intents of the earliest stalled wave are dispatched
+        together rather than deadlocking; their dependents still wait.
+        """
+        wave_execs = [WaveExecution(wave_index=wp["wave"]) for wp in wave_plans]
+        remaining = [len(wp["intents"]) for wp in wave_plans]
+        plan_ids = {ispec["id"] for wp in wave_plans for ispec in wp["intents"]}
+
+        blocked: Dict[str, Tuple[int, Dict[str, Any], Set[str]]] = {}
+        dependents: Dict[str, List[str]] = {}
+        ready: List[Tuple[int, Dict[str, Any]]] = []
+        for pos, wave_plan in enumerate(wave_plans):
+            for intent_spec in wave_plan["intents"]:
+                intent_id = intent_spec["id"]
+                deps = {
+                    d for d in intent_spec.get("depends_on") or ()
+                    if d in plan_ids and d != intent_id
+                }
+                if not deps:
+                    ready.append((pos, intent_spec))
+                    continue
+                blocked[intent_id] = (pos, intent_spec, deps)
+                for dep_id in deps:
+                    dependents.setdefault(dep_id, []).append(intent_id)
+
+        in_flight: Dict[Future, Tuple[int, str]] = {}
+        next_report = 0
+
+        def report_finished_waves() -> None:
+            nonlocal next_report
+            while (next_report < len(wave_execs)
+                   and wave_execs[next_report].wave_validation is not None):
+                self._report_wave(wave_execs[next_report])
+                next_report += 1
+
+        def dispatch(pos: int, intent_spec: Dict[str, Any]) -> None:
+            wave_exec = wave_execs[pos]
+            if wave_exec.status == "pending":
+                self._start_wave(wave_exec, remaining[pos])
+            future = self._pool.submit(
+                self._execute_intent_with_retries,
+                intent_spec, wave_exec.wave_index,
+            )
+            in_flight[future] = (pos, intent_spec["id"])
+
+        for pos, wave_exec in enumerate(wave_execs):
+            if not remaining[pos]:
+                self._start_wave(wave_exec, 0)
+                self._finish_wave(wave_exec)
+        report_finished_waves()
+        for pos, intent_spec in ready:
+            dispatch(pos, intent_spec)
+
+        while in_flight or blocked:
+            if not in_flight:
+                # Nothing running yet intents still blocked: a cycle. Break
+                # it by running the earliest wave's blocked intents; their
+                # dependents in later waves keep waiting for them.
+                first = min(b[0] for b in blocked.values())
+                stalled = [iid for iid, b in blocked.items() if b[0] == first]
+                for child_id in stalled:
+                    child_pos, child_spec, _deps = blocked.pop(child_id)
+                    dispatch(child_pos, child_spec)
+
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                pos, intent_id = in_flight.pop(future)
+                wave_execs[pos].intent_executions[intent_id] = future.result()
+                remaining[pos] -= 1
+                if not remaining[pos]:
+                    self._finish_wave(wave_execs[pos])
+                    report_finished_waves()
+
+                for child_id in dependents.pop(intent_id, ()):
+                    if child_id not in blocked:
+                        continue
+                    child_pos, child_spec, deps = blocked[child_id]
+                    deps.discard(intent_id)
+                    if not deps:
+                        del blocked[child_id]
+                        dispatch(child_pos, child_spec)
+
+        return wave_execs
+
+    def _start_wave(self, wave_exec: WaveExecution, intent_count: int) -> None:
         wave_exec.start_time = time.time()
         wave_exec.status = "running"
 
         self._emit("wave_started", {
-            "wave": wave_index,
-            "intent_count": len(wave_plan["intents"]),
+            "wave": wave_exec.wave_index,
+            "intent_count": intent_count,
         })
 
-        # Execute intents in parallel
-        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
-            futures = {}
-            for intent_spec in wave_plan["intents"]:
-                future = pool.submit(
-                    self._execute_intent_with_retries,
-                    intent_spec, wave_index,
-                )
-                futures[future] = intent_spec["id"]
-
-            for future in as_completed(futures):
-                intent_id = futures[future]
-                ie = future.result()
-                wave_exec.intent_executions[intent_id] = ie
-
+    def _finish_wave(self, wave_exec: WaveExecution) -> None:
+        """Validate a wave whose intents are all done (reported separately)."""
         # Gate 2: Wave validation
         wave_results = [
             ie.final_result
@@ -536,15 +876,14 @@ class WaveExecutor:
         wave_exec.end_time = time.time()
         wave_exec.status = "passed" if wave_exec.wave_validation.passed else "failed"
 
+    def _report_wave(self, wave_exec: WaveExecution) -> None:
         self._emit("wave_completed", {
-            "wave": wave_index,
+            "wave": wave_exec.wave_index,
             "status": wave_exec.status,
             "score": wave_exec.wave_validation.score,
             "duration": round(wave_exec.end_time - wave_exec.start_time, 3),
         })
 
-        return wave_exec
-
     def _execute_intent_with_retries(
         self, intent_spec: Dict[str, Any], wave_index: int,
     ) -> IntentExecution:
@@ -557,6 +896,7 @@ class WaveExecutor:
             intent_id=intent_id,
             profile=profile,
             model=current_model,
+            wave_index=wave_index,
         )
 
         self._emit("intent_started", {
@@ -566,15 +906,21 @@ class WaveExecutor:
             "wave": wave_index,
         })
 
-        for attempt in range(1, self.max_retries + 1):
-            # Generate todo markdown
-            pred_artifacts = self.artifacts.get_for_dependencies(
-                intent_spec.get("depends_on", [])
-            )
-            todo_md = self.todo_generator.generate_todo(
+        # Dependencies finished in earlier waves, so their artifacts and the
+        # todo built from them are the same for every attempt.
+        pred_artifacts = self.artifacts.get_for_dependencies(
+            intent_spec.get("depends_on", [])
+        )
+        todo_md = (
+            self.todo_generator.generate_todo(
                 intent_spec, wave_index, pred_artifacts,
             )
+            if getattr(self.backend, "needs_todo_md", True) else ""
+        )
+        backoff = getattr(self.backend, "supports_backoff", True)
+        last_validation: Optional[ValidationResult] = None
 
+        for attempt in range(1, self.max_retries + 1):
             context = ExecutionContext(
                 intent_id=intent_id,
                 profile=profile,
@@ -591,6 +937,7 @@ class WaveExecutor:
 
             # Gate 1: Per-intent validation
             validation = validate_intent(result)
+            last_validation = validation
 
             if validation.passed:
                 ie.final_result = result
@@ -606,7 +953,8 @@ class WaveExecutor:
                 })
                 return ie
 
-            # Validation failed -- decide next action
+            # Validation failed -- decide next action before spending another
+            # attempt; human-review exits here without touching the backend
             if attempt >= self.max_retries:
                 break
 
@@ -633,9 +981,12 @@ class WaveExecutor:
             else:  # flag_for_human_review
                 break
 
+            if backoff:
+                time.sleep(_backoff_delay(attempt))
+
         # All retries exhausted or flagged for human review
         ie.final_result = ie.attempts[-1] if ie.attempts else None
-        ie.validation = validate_intent(ie.final_result) if ie.final_result else None
+        ie.validation = last_validation
         ie.status = "human_review"
 
         if ie.final_result:
@@ -657,7 +1008,11 @@ class WaveExecutor:
 def _cli_progress(event: str, data: Dict[str, Any]) -> None:
     """Pretty-print progress events to stdout."""
     indent = "    "
-    if event == "wave_started":
+    if event == "execution_started":
+        print(f"  Executing {data['waves']} wave"
+              f"{'s' if data['waves'] != 1 else ''} "
+              f"with {data['max_workers']} workers")
+    elif event == "wave_started":
         print(f"\n  {'='*64}")
         print(f"  WAVE {data['wave']} ({data['intent_count']} intent"
               f"{'s' if data['intent_count'] != 1 else ''})")
@@ -849,11 +1204,14 @@ def _execute_and_report(
     progress_callback: Optional[ProgressCallback] = None,
 ) -> None:
     """Shared execution + reporting logic."""
-    executor = WaveExecutor(
-        backend=SimulatedBackend(failure_rate=0.15, seed=42),
+    with WaveExecutor(
+        backend=SimulatedBackend(
+            failure_rate=0.15, seed=42,
+            simulate_latency=os.environ.get("QR_FAST_SIM") != "1",
+        ),
         progress_callback=progress_callback or _cli_progress,
-    )
-    result = executor.execute_plan(plan)
+    ) as executor:
+        result = executor.execute_plan(plan)
 
     print(f"\n{'='*72}")
     print("  FINAL REPORT")
@@ -1,4 +1,4 @@
-"""Shared fixtures for staffing engine tests."""
+"""Shared fixtures for staffing engine and intent_ide endpoint tests."""
 
 from __future__ import annotations
 
@@ -177,3 +177,28 @@ def passing_results(make_intent_result):
         make_intent_result(profile, intent_id=f"pass-{i}")
         for i, profile in enumerate(PROFILES)
     ]
+
+
+# ---------------------------------------------------------------------------
+# intent_ide Flask app
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture(scope="session")
+def app():
+    """The intent_ide Flask app, imported once per session.
+
+    Importing intent_ide.app builds the agent pool and runs a CP-SAT solve,
+    so endpoint tests share a single import instead of each paying for it.
+    The import is deferred to the first test that asks for it (not done at
+    collection), and the requesting tests are skipped when the app's
+    dependencies (Flask and friends) are not installed.
+    """
+    return pytest.importorskip("intent_ide.app").app
+
+
+@pytest.fixture
+def client(app):
+    """A Flask test client for the intent_ide app."""
+    with app.test_client() as test_client:
+        yield test_client
@@ -1,9 +1,15 @@
 """Tests for quantum_routing.github_backend -- companion issue creation.
 
 Also tests the /api/staff and /api/materialize endpoints from intent_ide.app.
+
+Test classes carry ``xdist_group`` marks: the Flask endpoint tests share one
+worker (and so one import of intent_ide.app), while the pure helpers can go
+anywhere. Run in parallel with ``pytest -n auto --dist loadgroup``.
 """
 
+from types import SimpleNamespace
 from unittest.mock import patch, MagicMock
+import functools
 import subprocess
 import json
 
@@ -19,22 +25,32 @@ from quantum_routing.github_backend import (
     _build_issue_body,
     _extract_issue_number,
 )
+from quantum_routing.github_tickets import Ticket, TicketType
 
 
 # ---------------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------------
 
+_DEFAULT_PROFILES = (
+    ("feature-trailblazer", "ticket-1-implement"),
+    ("tenacious-unit-tester", "ticket-1-test"),
+    ("docs-logs-wizard", "ticket-1-docs"),
+    ("code-ace-reviewer", "ticket-1-review"),
+)
+
+
 def _make_staffing_plan(profiles=None):
-    """Create a minimal staffing plan for testing."""
-    if profiles is None:
-        profiles = [
-            ("feature-trailblazer", "ticket-1-implement"),
-            ("tenacious-unit-tester", "ticket-1-test"),
-            ("docs-logs-wizard", "ticket-1-docs"),
-            ("code-ace-reviewer", "ticket-1-review"),
-        ]
+    """Create a minimal staffing plan for testing.
 
+    Plans are cached per profile list and shared between callers, which
+    only read them.
+    """
+    return _cached_staffing_plan(tuple(profiles or _DEFAULT_PROFILES))
+
+
+@functools.lru_cache(maxsize=8)
+def _cached_staffing_plan(profiles):
     intents = []
     for profile, intent_id in profiles:
         intents.append({
@@ -60,20 +76,53 @@ def _make_staffing_plan(profiles=None):
     }
 
 
+@functools.lru_cache(maxsize=None)
 def _mock_gh_success(url="https://github.com/owner/repo/issues/42"):
-    """Return a mock subprocess result for successful gh issue create."""
-    mock = MagicMock()
-    mock.returncode = 0
-    mock.stdout = url + "\n"
-    mock.stderr = ""
-    return mock
+    """Return a subprocess result for successful gh issue create.
 
+    Callers only read returncode/stdout/stderr, so a cached namespace per
+    URL stands in for a fresh MagicMock.
+    """
+    return SimpleNamespace(returncode=0, stdout=url + "\n", stderr="")
 
+
+@functools.lru_cache(maxsize=None)
 def _mock_gh_failure(msg="permission denied"):
-    mock = MagicMock()
-    mock.returncode = 1
-    mock.stdout = ""
-    mock.stderr = msg
+    return SimpleNamespace(returncode=1, stdout="", stderr=msg)
+
+
+def _parse_cmds(mock_run):
+    """Parse every recorded gh command into ``(argv, {--flag: value})``.
+
+    Tests parse once and then look flags up by name instead of scanning
+    each argv with ``.index()`` per assertion.
+    """
+    return [
+        (cmd, {cmd[i]: cmd[i + 1]
+               for i in range(len(cmd) - 1) if cmd[i].startswith("--")})
+        for cmd in (call.args[0] for call in mock_run.call_args_list)
+    ]
+
+
+def _companion_results(first, base="https://github.com/owner/repo"):
+    """gh results for one create_companion_issues() run, in call order.
+
+    The function makes a fixed sequence of gh calls -- one ``issue create``
+    per companion agent, then the summary ``issue comment`` -- so a list
+    assigned to ``side_effect`` replaces a per-call Python callback.
+    Created issues are numbered consecutively from *first*.
+    """
+    return [
+        _mock_gh_success(f"{base}/issues/{first + k}")
+        for k in range(len(COMPANION_AGENTS))
+    ] + [_mock_gh_success()]
+
+
+@pytest.fixture
+def mock_run(monkeypatch):
+    """Replace subprocess.run in github_backend; gh calls succeed by default."""
+    mock = MagicMock(return_value=_mock_gh_success())
+    monkeypatch.setattr("quantum_routing.github_backend.subprocess.run", mock)
     return mock
 
 
@@ -82,39 +131,25 @@ def _mock_gh_failure(msg="permission denied"):
 # ---------------------------------------------------------------------------
 
 class TestEnsureAgentLabels:
-    @patch("quantum_routing.github_backend.subprocess.run")
     def test_creates_labels_for_all_profiles(self, mock_run):
-        mock_run.return_value = _mock_gh_success()
-
         results = ensure_agent_labels()
 
         assert mock_run.call_count == len(AGENT_LABEL_COLORS)
         for profile in AGENT_LABEL_COLORS:
             assert results[profile] is True
 
-    @patch("quantum_routing.github_backend.subprocess.run")
     def test_uses_force_flag(self, mock_run):
-        mock_run.return_value = _mock_gh_success()
-
         ensure_agent_labels()
 
-        for call in mock_run.call_args_list:
-            cmd = call[0][0]
-            assert "--force" in cmd
+        assert all("--force" in call.args[0]
+                   for call in mock_run.call_args_list)
 
-    @patch("quantum_routing.github_backend.subprocess.run")
     def test_passes_repo_flag(self, mock_run):
-        mock_run.return_value = _mock_gh_success()
-
         ensure_agent_labels(repo="octocat/hello")
 
-        for call in mock_run.call_args_list:
-            cmd = call[0][0]
-            assert "--repo" in cmd
-            repo_idx = cmd.index("--repo")
-            assert cmd[repo_idx + 1] == "octocat/hello"
+        assert all(flags.get("--repo") == "octocat/hello"
+                   for _, flags in _parse_cmds(mock_run))
 
-    @patch("quantum_routing.github_backend.subprocess.run")
     def test_handles_permission_error(self, mock_run):
         mock_run.return_value = _mock_gh_failure("permission denied")
 
@@ -123,104 +158,58 @@ class TestEnsureAgentLabels:
         for profile in AGENT_LABEL_COLORS:
             assert results[profile] is False
 
-    @patch("quantum_routing.github_backend.subprocess.run")
     def test_correct_colors(self, mock_run):
-        mock_run.return_value = _mock_gh_success()
-
         ensure_agent_labels()
 
-        for call in mock_run.call_args_list:
-            cmd = call[0][0]
-            if "--color" in cmd:
-                color_idx = cmd.index("--color")
-                color = cmd[color_idx + 1]
-                # Must be a valid 6-char hex color
-                assert len(color) == 6
-                int(color, 16)  # should not raise
+        colors = [flags["--color"] for _, flags in _parse_cmds(mock_run)
+                  if "--color" in flags]
+        # Must be valid 6-char hex colors (int() raises otherwise)
+        assert all(len(c) == 6 and int(c, 16) >= 0 for c in colors)
 
 
 # ---------------------------------------------------------------------------
 # create_companion_issues
 # ---------------------------------------------------------------------------
 
-class TestCreateCompanionIssues:
-    @patch("quantum_routing.github_backend.subprocess.run")
-    def test_creates_four_issues(self, mock_run):
-        """Should create exactly 4 companion issues + 1 summary comment."""
-        issue_counter = [20]
-
-        def side_effect(cmd, **kwargs):
-            if "issue" in cmd and "create" in cmd:
-                issue_counter[0] += 1
-                return _mock_gh_success(
-                    f"https://github.com/owner/repo/issues/{issue_counter[0]}"
-                )
-            # Comment
-            return _mock_gh_success()
-
-        mock_run.side_effect = side_effect
-        plan = _make_staffing_plan()
+@pytest.fixture(scope="class")
+def companion_run():
+    """One create_companion_issues() run shared by the assertion tests.
 
+    Returns ``(created, parsed_cmds)``; each test checks its own slice.
+    """
+    with pytest.MonkeyPatch.context() as mp:
+        run = MagicMock(side_effect=_companion_results(first=1))
+        mp.setattr("quantum_routing.github_backend.subprocess.run", run)
         created = create_companion_issues(
-            parent_issue_number=20,
-            parent_title="Add caching to API",
-            staffing_plan=plan,
+            parent_issue_number=50,
+            parent_title="Fix auth bug",
+            staffing_plan=_make_staffing_plan(),
         )
+    return created, _parse_cmds(run)
 
-        assert len(created) == 4
-        assert set(created.keys()) == set(COMPANION_AGENTS)
 
-    @patch("quantum_routing.github_backend.subprocess.run")
-    def test_issue_titles_contain_agent_and_parent(self, mock_run):
-        titles = []
-        issue_counter = [10]
-
-        def side_effect(cmd, **kwargs):
-            if "issue" in cmd and "create" in cmd:
-                issue_counter[0] += 1
-                title_idx = cmd.index("--title") + 1
-                titles.append(cmd[title_idx])
-                return _mock_gh_success(
-                    f"https://github.com/owner/repo/issues/{issue_counter[0]}"
-                )
-            return _mock_gh_success()
+class TestCreateCompanionIssues:
+    def test_creates_four_issues(self, companion_run):
+        """Should create exactly 4 companion issues + 1 summary comment."""
+        created, cmds = companion_run
 
-        mock_run.side_effect = side_effect
+        assert len(created) == 4
+        assert set(created.keys()) == set(COMPANION_AGENTS)
+        assert len(cmds) == 5
 
-        create_companion_issues(
-            parent_issue_number=10,
-            parent_title="Fix auth bug",
-            staffing_plan=_make_staffing_plan(),
-        )
+    def test_issue_titles_contain_agent_and_parent(self, companion_run):
+        _, cmds = companion_run
 
+        titles = [flags["--title"] for cmd, flags in cmds if "create" in cmd]
         assert len(titles) == 4
         for title in titles:
             assert "Fix auth bug" in title
             assert title.startswith("[Agent: ")
 
-    @patch("quantum_routing.github_backend.subprocess.run")
-    def test_reviewer_body_has_blocked_by(self, mock_run):
-        bodies = []
-        issue_counter = [0]
-
-        def side_effect(cmd, **kwargs):
-            if "issue" in cmd and "create" in cmd:
-                issue_counter[0] += 1
-                body_idx = cmd.index("--body") + 1
-                bodies.append(cmd[body_idx])
-                return _mock_gh_success(
-                    f"https://github.com/owner/repo/issues/{issue_counter[0]}"
-                )
-            return _mock_gh_success()
-
-        mock_run.side_effect = side_effect
-
-        create_companion_issues(
-            parent_issue_number=99,
-            parent_title="Test",
-            staffing_plan=_make_staffing_plan(),
-        )
+    def test_reviewer_body_has_blocked_by(self, companion_run):
+        _, cmds = companion_run
 
+        bodies = [flags["--body"] for cmd, flags in cmds if "create" in cmd]
         # Last body is code-ace-reviewer
         reviewer_body = bodies[-1]
         assert "Blocked By" in reviewer_body
@@ -229,76 +218,25 @@ class TestCreateCompanionIssues:
         assert "#2" in reviewer_body
         assert "#3" in reviewer_body
 
-    @patch("quantum_routing.github_backend.subprocess.run")
-    def test_labels_match_agent_profile(self, mock_run):
-        labels = []
-        issue_counter = [0]
-
-        def side_effect(cmd, **kwargs):
-            if "issue" in cmd and "create" in cmd:
-                issue_counter[0] += 1
-                label_idx = cmd.index("--label") + 1
-                labels.append(cmd[label_idx])
-                return _mock_gh_success(
-                    f"https://github.com/owner/repo/issues/{issue_counter[0]}"
-                )
-            return _mock_gh_success()
-
-        mock_run.side_effect = side_effect
-
-        create_companion_issues(
-            parent_issue_number=1,
-            parent_title="Test",
-            staffing_plan=_make_staffing_plan(),
-        )
+    def test_labels_match_agent_profile(self, companion_run):
+        _, cmds = companion_run
 
+        labels = [flags["--label"] for cmd, flags in cmds if "create" in cmd]
         assert labels == COMPANION_AGENTS
 
-    @patch("quantum_routing.github_backend.subprocess.run")
-    def test_summary_comment_posted_on_parent(self, mock_run):
+    def test_summary_comment_posted_on_parent(self, companion_run):
         """After creating issues, a summary comment should be posted on the parent."""
-        issue_counter = [0]
-        comment_calls = []
-
-        def side_effect(cmd, **kwargs):
-            if "issue" in cmd and "create" in cmd:
-                issue_counter[0] += 1
-                return _mock_gh_success(
-                    f"https://github.com/owner/repo/issues/{issue_counter[0]}"
-                )
-            if "issue" in cmd and "comment" in cmd:
-                comment_calls.append(cmd)
-                return _mock_gh_success()
-            return _mock_gh_success()
-
-        mock_run.side_effect = side_effect
-
-        create_companion_issues(
-            parent_issue_number=50,
-            parent_title="Big feature",
-            staffing_plan=_make_staffing_plan(),
-        )
+        _, cmds = companion_run
 
+        comment_calls = [(cmd, flags) for cmd, flags in cmds if "comment" in cmd]
         assert len(comment_calls) == 1
-        cmd = comment_calls[0]
+        cmd, flags = comment_calls[0]
         assert "50" in cmd  # parent issue number
-        body_idx = cmd.index("--body") + 1
-        body = cmd[body_idx]
-        assert "Staffing Plan Materialized" in body
+        assert "Staffing Plan Materialized" in flags["--body"]
 
-    @patch("quantum_routing.github_backend.subprocess.run")
     def test_passes_repo_through(self, mock_run):
-        issue_counter = [0]
-
-        def side_effect(cmd, **kwargs):
-            if "issue" in cmd and "create" in cmd:
-                issue_counter[0] += 1
-                return _mock_gh_success(
-                    f"https://github.com/ext/repo/issues/{issue_counter[0]}"
-                )
-            return _mock_gh_success()
-
-        mock_run.side_effect = side_effect
+        mock_run.side_effect = _companion_results(
+            first=1, base="https://github.com/ext/repo")
 
         create_companion_issues(
             parent_issue_number=1,
@@ -307,11 +245,8 @@ class TestCreateCompanionIssues:
             repo="ext/repo",
         )
 
-        for call in mock_run.call_args_list:
-            cmd = call[0][0]
-            assert "--repo" in cmd
-            repo_idx = cmd.index("--repo")
-            assert cmd[repo_idx + 1] == "ext/repo"
+        assert all(flags.get("--repo") == "ext/repo"
+                   for _, flags in _parse_cmds(mock_run))
 
 
 # ---------------------------------------------------------------------------
@@ -319,6 +254,8 @@ class TestCreateCompanionIssues:
 # ---------------------------------------------------------------------------
 
 class TestBuildIssueBody:
+    pytestmark = pytest.mark.xdist_group("github_backend_pure")
+
     def test_contains_parent_reference(self):
         body = _build_issue_body("feature-trailblazer", 42, "My Feature", [])
         assert "#42" in body
@@ -359,17 +296,16 @@ class TestBuildIssueBody:
 # ---------------------------------------------------------------------------
 
 class TestExtractIssueNumber:
-    def test_standard_url(self):
-        assert _extract_issue_number("https://github.com/owner/repo/issues/42") == 42
-
-    def test_trailing_slash(self):
-        assert _extract_issue_number("https://github.com/owner/repo/issues/7/") == 7
-
-    def test_non_numeric(self):
-        assert _extract_issue_number("https://github.com/owner/repo/pulls") is None
+    pytestmark = pytest.mark.xdist_group("github_backend_pure")
 
-    def test_empty(self):
-        assert _extract_issue_number("") is None
+    @pytest.mark.parametrize("url,expected", [
+        ("https://github.com/owner/repo/issues/42", 42),
+        ("https://github.com/owner/repo/issues/7/", 7),
+        ("https://github.com/owner/repo/pulls", None),
+        ("", None),
+    ])
+    def test_extract(self, url, expected):
+        assert _extract_issue_number(url) == expected
 
 
 # ---------------------------------------------------------------------------
@@ -377,10 +313,7 @@ class TestExtractIssueNumber:
 # ---------------------------------------------------------------------------
 
 class TestPostComment:
-    @patch("quantum_routing.github_backend.subprocess.run")
     def test_posts_comment(self, mock_run):
-        mock_run.return_value = _mock_gh_success()
-
         result = post_comment(42, "Hello world")
 
         assert result is True
@@ -389,7 +322,6 @@ class TestPostComment:
         assert "42" in cmd
         assert "Hello world" in cmd
 
-    @patch("quantum_routing.github_backend.subprocess.run")
     def test_returns_false_on_failure(self, mock_run):
         mock_run.return_value = _mock_gh_failure()
 
@@ -460,39 +392,55 @@ class TestGitHubProgressReporter:
 # /api/staff and /api/materialize endpoint tests
 # ---------------------------------------------------------------------------
 
+@functools.lru_cache(maxsize=4)
 def _make_mock_ticket(id_="13", title="Wire telemetry into ViolationsDashboard"):
-    """Create a mock Ticket for endpoint tests."""
-    ticket = MagicMock()
-    ticket.id = id_
-    ticket.title = title
-    ticket.body = "Some body text"
-    ticket.labels = ["enhancement"]
-    ticket.url = f"https://github.com/owner/repo/issues/{id_}"
-    ticket.ticket_type = MagicMock()
-    ticket.ticket_type.name = "FEATURE"
-    return ticket
+    """Create a Ticket for endpoint tests (cached; callers only read it).
+
+    A real ``Ticket`` instead of a MagicMock: cheaper to build, and an
+    attribute the endpoints don't expect raises instead of silently
+    returning a mock.
+    """
+    return Ticket(
+        id=id_,
+        repo="owner/repo",
+        title=title,
+        body="Some body text",
+        labels=["enhancement"],
+        ticket_type=TicketType.FEATURE,
+    )
+
+
+@pytest.fixture(scope="module")
+def staffing_plan():
+    """The default staffing plan, built once for the endpoint tests (read-only)."""
+    return _make_staffing_plan()
+
+
+@pytest.fixture(scope="module")
+def mock_ticket():
+    """The default mock ticket, built once for the endpoint tests (read-only)."""
+    return _make_mock_ticket()
 
 
 class TestApiStaffEndpoint:
     """Tests for POST /api/staff — plan-only endpoint."""
 
+    pytestmark = pytest.mark.xdist_group("flask_app")
+
     @patch("intent_ide.app.generate_staffing_plan")
     @patch("intent_ide.app.decompose_ticket_smart")
     @patch("intent_ide.app.import_issue")
-    def test_returns_staffing_plan(self, mock_import, mock_decompose, mock_staff):
+    def test_returns_staffing_plan(self, mock_import, mock_decompose, mock_staff,
+                                   client, mock_ticket, staffing_plan):
         """Should return full staffing plan without creating issues."""
-        # Import app inside test to avoid heavy module-level init
-        from intent_ide.app import app
-
-        mock_import.return_value = _make_mock_ticket()
+        mock_import.return_value = mock_ticket
         mock_decompose.return_value = [
             {"id": "t-1", "profile": "feature-trailblazer"},
         ]
-        mock_staff.return_value = _make_staffing_plan()
+        mock_staff.return_value = staffing_plan
 
-        with app.test_client() as client:
-            res = client.post('/api/staff', json={"issue_number": 13})
-            data = res.get_json()
+        res = client.post('/api/staff', json={"issue_number": 13})
+        data = res.get_json()
 
         assert res.status_code == 200
         assert data["parent_issue"] == 13
@@ -502,44 +450,34 @@ class TestApiStaffEndpoint:
         assert "waves" in data["staffing_plan"]
 
     @patch("intent_ide.app.import_issue")
-    def test_missing_issue_number(self, mock_import):
-        from intent_ide.app import app
-
-        with app.test_client() as client:
-            res = client.post('/api/staff', json={})
+    def test_missing_issue_number(self, mock_import, client):
+        res = client.post('/api/staff', json={})
 
         assert res.status_code == 400
         assert "issue_number" in res.get_json()["error"]
 
     @patch("intent_ide.app.import_issue")
-    def test_invalid_issue_number(self, mock_import):
-        from intent_ide.app import app
-
-        with app.test_client() as client:
-            res = client.post('/api/staff', json={"issue_number": "abc"})
+    def test_invalid_issue_number(self, mock_import, client):
+        res = client.post('/api/staff', json={"issue_number": "abc"})
 
         assert res.status_code == 400
         assert "integer" in res.get_json()["error"]
 
     @patch("intent_ide.app.import_issue")
-    def test_issue_not_found(self, mock_import):
-        from intent_ide.app import app
+    def test_issue_not_found(self, mock_import, client):
         mock_import.return_value = None
 
-        with app.test_client() as client:
-            res = client.post('/api/staff', json={"issue_number": 999})
+        res = client.post('/api/staff', json={"issue_number": 999})
 
         assert res.status_code == 404
 
     @patch("intent_ide.app.decompose_ticket_smart")
     @patch("intent_ide.app.import_issue")
-    def test_no_intents(self, mock_import, mock_decompose):
-        from intent_ide.app import app
-        mock_import.return_value = _make_mock_ticket()
+    def test_no_intents(self, mock_import, mock_decompose, client, mock_ticket):
+        mock_import.return_value = mock_ticket
         mock_decompose.return_value = []
 
-        with app.test_client() as client:
-            res = client.post('/api/staff', json={"issue_number": 13})
+        res = client.post('/api/staff', json={"issue_number": 13})
 
         assert res.status_code == 422
 
@@ -547,12 +485,13 @@ class TestApiStaffEndpoint:
 class TestApiMaterializeWithPlan:
     """Tests for POST /api/materialize with pre-computed plan."""
 
+    pytestmark = pytest.mark.xdist_group("flask_app")
+
     @patch("intent_ide.app.create_companion_issues")
     @patch("intent_ide.app.ensure_agent_labels")
-    def test_accepts_pre_computed_plan(self, mock_labels, mock_create):
+    def test_accepts_pre_computed_plan(self, mock_labels, mock_create, client,
+                                       staffing_plan):
         """When staffing_plan and parent_title are provided, skip decompose."""
-        from intent_ide.app import app
-
         mock_labels.return_value = {"feature-trailblazer": True}
         mock_create.return_value = {
             "feature-trailblazer": 21,
@@ -560,15 +499,13 @@ class TestApiMaterializeWithPlan:
             "docs-logs-wizard": 23,
             "code-ace-reviewer": 24,
         }
-        plan = _make_staffing_plan()
 
-        with app.test_client() as client:
-            res = client.post('/api/materialize', json={
-                "issue_number": 13,
-                "staffing_plan": plan,
-                "parent_title": "Wire telemetry",
-            })
-            data = res.get_json()
+        res = client.post('/api/materialize', json={
+            "issue_number": 13,
+            "staffing_plan": staffing_plan,
+            "parent_title": "Wire telemetry",
+        })
+        data = res.get_json()
 
         assert res.status_code == 200
         assert data["parent_title"] == "Wire telemetry"
@@ -580,18 +517,16 @@ class TestApiMaterializeWithPlan:
     @patch("intent_ide.app.create_companion_issues")
     @patch("intent_ide.app.ensure_agent_labels")
     def test_falls_back_to_full_pipeline(self, mock_labels, mock_create,
-                                          mock_import, mock_decompose, mock_staff):
+                                          mock_import, mock_decompose, mock_staff,
+                                          client, mock_ticket, staffing_plan):
         """Without staffing_plan, does full decompose+staff pipeline."""
-        from intent_ide.app import app
-
         mock_labels.return_value = {"feature-trailblazer": True}
         mock_create.return_value = {"feature-trailblazer": 21}
-        mock_import.return_value = _make_mock_ticket()
+        mock_import.return_value = mock_ticket
         mock_decompose.return_value = [{"id": "t-1"}]
-        mock_staff.return_value = _make_staffing_plan()
+        mock_staff.return_value = staffing_plan
 
-        with app.test_client() as client:
-            res = client.post('/api/materialize', json={"issue_number": 13})
+        res = client.post('/api/materialize', json={"issue_number": 13})
 
         assert res.status_code == 200
         mock_import.assert_called_once()
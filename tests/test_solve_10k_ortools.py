@@ -0,0 +1,126 @@
+"""Tests for quantum_routing.solve_10k_ortools.
+
+Covers:
+    - Dependency edge extraction for wave subsets with global indices
+    - solve_cpsat() on small intent subsets
+    - solve_cpsat() with agent_names naming only part of the pool
+    - Partial assignment when the pool runs out of capacity
+"""
+
+from __future__ import annotations
+
+import pytest
+from ortools.sat.python import cp_model
+
+from quantum_routing.css_renderer_agents import build_agent_pool
+from quantum_routing.css_renderer_intents import generate_intents
+from quantum_routing.solve_10k_ortools import (
+    MAX_OBJECTIVE_COEFFICIENT,
+    _dependency_edges,
+    solve_cpsat,
+)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Fixtures
+# ═══════════════════════════════════════════════════════════════════════════════
+
+
+@pytest.fixture(scope="module")
+def pool():
+    """(agents, agent_names) for the full 10K agent pool."""
+    return build_agent_pool()
+
+
+@pytest.fixture(scope="module")
+def intents():
+    return generate_intents()
+
+
+def _solve(intents, pool, **kwargs):
+    agents, agent_names = pool
+    kwargs.setdefault("time_limit", 5)
+    kwargs.setdefault("num_workers", 1)
+    return solve_cpsat(intents, agents, agent_names, **kwargs)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Dependencies
+# ═══════════════════════════════════════════════════════════════════════════════
+
+
+class TestDependencyEdges:
+
+    def test_skips_indices_outside_the_subset(self):
+        subset = [{"depends": [1, 5, -1]}, {"depends": [0]}, {}]
+        assert _dependency_edges(subset) == [(0, 1), (1, 0)]
+
+    def test_wave_subset_with_global_depends_solves(self, intents, pool):
+        """hybrid_router passes wave subsets whose depends are global indices."""
+        wave = [dict(intent, depends=[50 + k])
+                for k, intent in enumerate(intents[:40])]
+
+        assignments = _solve(wave, pool)
+
+        assert len(assignments) == len(wave)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Agent subsets
+# ═══════════════════════════════════════════════════════════════════════════════
+
+
+class TestAgentSubset:
+
+    def test_solves_with_subset_of_agent_names(self, intents, pool):
+        """agent_names may name only part of the pool (greedy hint included)."""
+        agents, agent_names = pool
+        subset = [name for name in agent_names if not agents[name]["is_local"]]
+
+        assignments = _solve(intents[:40], (agents, subset))
+
+        assert len(assignments) == 40
+        assert set(assignments.values()) <= set(subset)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Capacity shortfall
+# ═══════════════════════════════════════════════════════════════════════════════
+
+
+class TestPartialAssignment:
+
+    @pytest.fixture
+    def starved_pool(self, pool):
+        """Two slots on claude-0 and two on llama3.2-1b-0 (quality 0.95 / 0.4)."""
+        agents, _ = pool
+        names = ["claude-0", "llama3.2-1b-0"]
+        return {name: dict(agents[name], capacity=2) for name in names}, names
+
+    @pytest.fixture
+    def objective_coeffs(self, monkeypatch):
+        """Objective coefficients of every model solve_cpsat() hands to CP-SAT."""
+        seen = []
+        solve = cp_model.CpSolver.solve
+
+        def spy(solver, model, *args, **kwargs):
+            seen.extend(model.Proto().objective.coeffs)
+            return solve(solver, model, *args, **kwargs)
+
+        monkeypatch.setattr(cp_model.CpSolver, "solve", spy)
+        return seen
+
+    def test_fills_capacity_and_drops_the_rest(self, intents, starved_pool,
+                                               objective_coeffs):
+        chain = [dict(intent, depends=[k - 1] if k else [])
+                 for k, intent in enumerate(intents[:40])]
+
+        assignments = _solve(chain, starved_pool)
+
+        agents, _ = starved_pool
+        assert len(assignments) == 4
+        for name, agent in agents.items():
+            assert list(assignments.values()).count(name) <= agent["capacity"]
+        # Unassigned penalties stay within the coefficient cap even though
+        # every intent sits on dependency edges.
+        assert max(map(abs, objective_coeffs)) <= MAX_OBJECTIVE_COEFFICIENT
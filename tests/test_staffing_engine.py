@@ -9,18 +9,32 @@ Covers:
 from __future__ import annotations
 
 import json
+from types import SimpleNamespace
 
 import pytest
 
 from quantum_routing.feature_decomposer import Intent
 from quantum_routing.staffing_engine import (
     PROFILES,
+    analyze_waves,
     assign_profile,
     compute_waves,
+    compute_waves_ex,
+    compute_waves_with_stats,
     generate_staffing_plan,
+    WaveCache,
 )
 
 
+def _intent(id_, depends):
+    return Intent(id=id_, title=id_, description="", complexity="simple",
+                  min_quality=0.5, depends=depends)
+
+
+def _id(intent):
+    return intent["id"] if isinstance(intent, dict) else intent.id
+
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # assign_profile()
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -189,6 +203,18 @@ class TestComputeWaves:
         assert len(waves[1]) == 2  # B, C
         assert len(waves[2]) == 1  # D
 
+    def test_wave_members_ordered_by_id(self):
+        intents = [
+            {"id": "root", "depends": []},
+            {"id": "d", "depends": ["root"]},
+            {"id": "b", "depends": ["root"]},
+            {"id": "c", "depends": []},
+            {"id": "a", "depends": ["root"]},
+        ]
+        waves = compute_waves(intents)
+        assert [[i["id"] for i in w] for w in waves] == [["c", "root"], ["a", "b", "d"]]
+        assert compute_waves(intents[::-1]) == waves
+
     def test_circular_dependency_raises(self):
         intents = [
             {"id": "A", "depends": ["B"]},
@@ -197,6 +223,16 @@ class TestComputeWaves:
         with pytest.raises(ValueError, match="Circular dependency"):
             compute_waves(intents)
 
+    def test_long_cycle_reported_without_recursion_error(self):
+        n = 5000
+        intents = [
+            {"id": f"c{i:04d}", "depends": [f"c{(i - 1) % n:04d}"]}
+            for i in range(n)
+        ]
+        with pytest.raises(ValueError, match="Circular dependency") as exc:
+            compute_waves(intents)
+        assert exc.value.args[0].count(" -> ") == n
+
     def test_missing_dependency_raises(self):
         intents = [
             {"id": "A", "depends": ["nonexistent"]},
@@ -208,6 +244,61 @@ class TestComputeWaves:
         waves = compute_waves([])
         assert waves == []
 
+    def test_shared_dag_matches_fresh_analysis(self, collab_intents):
+        waves, dag = compute_waves_ex(collab_intents)
+        assert waves == compute_waves(collab_intents)
+        assert analyze_waves(waves, collab_intents, dag=dag) == analyze_waves(
+            waves, collab_intents,
+        )
+
+    def test_waves_with_stats_match_analysis(self, collab_intents):
+        waves, stats = compute_waves_with_stats(collab_intents)
+        assert waves == compute_waves(collab_intents)
+        assert stats == analyze_waves(waves, collab_intents)
+        assert stats.peak_parallelism == max(len(w) for w in waves)
+
+    def test_waves_with_stats_empty(self):
+        waves, stats = compute_waves_with_stats([])
+        assert waves == []
+        assert stats == analyze_waves([], [])
+
+    def test_no_implicit_cache(self, collab_intents):
+        _, dag = compute_waves_ex(collab_intents)
+        assert compute_waves_ex(collab_intents)[1] is not dag
+
+    def test_repeat_call_served_from_cache(self, collab_intents):
+        cache = WaveCache()
+        waves, dag = compute_waves_ex(collab_intents, cache)
+        again, dag_again = compute_waves_ex(collab_intents, cache)
+        assert again == waves
+        assert dag_again is dag
+        # Callers get their own wave lists
+        again[0].clear()
+        assert compute_waves(collab_intents, cache) == waves
+
+    def test_cache_revalidates_every_hit(self):
+        cache = WaveCache()
+        intents = [{"id": "A", "depends": []}, {"id": "B", "depends": ["A"]}]
+        assert len(compute_waves(intents, cache)) == 2
+
+        intents.append({"id": "C", "depends": ["B"]})
+        assert len(compute_waves(intents, cache)) == 3
+
+        # Dependency edited in place
+        intents[2]["depends"] = ["A"]
+        assert [[i["id"] for i in w] for w in compute_waves(intents, cache)] == \
+            [["A"], ["B", "C"]]
+
+        # Element replaced: the new object is returned, not the old one
+        replacement = {"id": "B", "depends": ["A"]}
+        intents[1] = replacement
+        assert compute_waves(intents, cache)[1][0] is replacement
+
+        # Dependency edited into a cycle
+        intents[0]["depends"] = ["C"]
+        with pytest.raises(ValueError, match="Circular"):
+            generate_staffing_plan(intents, cache)
+
     def test_dataclass_intents(self, slider_bug_intents):
         """compute_waves works with dataclass Intent objects."""
         waves = compute_waves(slider_bug_intents)
@@ -215,6 +306,21 @@ class TestComputeWaves:
         root_ids = {i.id for i in waves[0]}
         assert "bug2-1-reproduce" in root_ids
 
+    @pytest.mark.parametrize("intents", [
+        [_intent("A", []),
+         {"id": "B", "depends": ["A"]},
+         _intent("C", ["B"])],
+        [{"id": "A", "depends": []},
+         _intent("B", ["A"]),
+         {"id": "C", "dependencies": ["B"]}],
+        [SimpleNamespace(id="A", depends=[]),
+         SimpleNamespace(id="B", dependencies=["A"]),
+         SimpleNamespace(id="C", depends=["B"])],
+    ], ids=["dataclass_first", "dict_first", "per_instance_attrs"])
+    def test_mixed_intent_representations(self, intents):
+        waves = compute_waves(intents)
+        assert [[_id(i) for i in w] for w in waves] == [["A"], ["B"], ["C"]]
+
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # generate_staffing_plan()
@@ -275,6 +381,26 @@ class TestGenerateStaffingPlan:
         assert plan["total_waves"] == 0
         assert plan["waves"] == []
 
+    def test_critical_path_follows_longest_chain(self):
+        intents = [
+            {"id": "A", "depends": []},
+            {"id": "B", "depends": ["A"]},
+            {"id": "C", "depends": ["B"]},
+            {"id": "D", "depends": ["A"]},
+            {"id": "E", "depends": ["D", "C"]},
+        ]
+        plan = generate_staffing_plan(intents)
+        assert plan["critical_path"] == ["A", "B", "C", "E"]
+
+    def test_deep_chain_critical_path(self):
+        n = 5000
+        intents = [
+            {"id": f"c{i:04d}", "depends": [f"c{i - 1:04d}"] if i else []}
+            for i in range(n)
+        ]
+        plan = generate_staffing_plan(intents)
+        assert len(plan["critical_path"]) == n
+
     def test_json_serializable(self, slider_bug_intents):
         plan = generate_staffing_plan(slider_bug_intents)
         serialized = json.dumps(plan)
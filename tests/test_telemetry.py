@@ -0,0 +1,352 @@
+"""Tests for quantum_routing.telemetry.
+
+Covers:
+    - compute_metrics() on a small hand-built pool
+    - compute_metrics_batch() serial and process-pool paths
+    - TelemetryLog best-run selection and Pareto frontier
+    - TelemetryLog persistence (JSON lines, export, load)
+    - perturb_weights() bounds and reproducibility
+"""
+
+from __future__ import annotations
+
+import json
+
+import numpy as np
+import pytest
+
+from quantum_routing import telemetry
+from quantum_routing.telemetry import (
+    DEFAULT_WEIGHTS,
+    TelemetryLog,
+    clear_metric_caches,
+    compute_metrics,
+    compute_metrics_batch,
+    perturb_weights,
+)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Fixtures
+# ═══════════════════════════════════════════════════════════════════════════════
+
+
+@pytest.fixture
+def small_pool():
+    """Two cloud agents of different types plus one local agent."""
+    return {
+        "claude-0": {"model_type": "claude", "quality": 0.95,
+                     "token_rate": 0.00001, "latency": 2.0, "is_local": False},
+        "gemini-0": {"model_type": "gemini", "quality": 0.88,
+                     "token_rate": 0.000005, "latency": 2.0, "is_local": False},
+        "llama-0": {"model_type": "llama", "quality": 0.55,
+                    "token_rate": 0.0, "latency": 0.8, "is_local": True},
+    }
+
+
+@pytest.fixture
+def small_intents():
+    return [
+        {"estimated_tokens": 1000, "min_quality": 0.5, "story_points": 1,
+         "deadline": 10, "depends": []},
+        {"estimated_tokens": 2000, "min_quality": 0.9, "story_points": 3,
+         "deadline": 10, "depends": [0]},
+        {"estimated_tokens": 30000, "min_quality": 0.6, "story_points": 5,
+         "deadline": 1, "depends": [1]},
+        {"estimated_tokens": 500, "min_quality": 0.5, "story_points": 1,
+         "deadline": -1, "depends": []},
+    ]
+
+
+@pytest.fixture
+def small_chains():
+    return [("a-chain", [0, 1, 2]), ("b-chain", [3])]
+
+
+def _run(score, cq_ratio, gate=1.0):
+    return {
+        "chain_coherence": {"score": score},
+        "cost_quality": {"cost_quality_ratio": cq_ratio},
+        "gate_pass": {"gate_1_pass_rate": gate},
+    }
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# compute_metrics
+# ═══════════════════════════════════════════════════════════════════════════════
+
+
+class TestComputeMetrics:
+
+    def test_metric_values(self, small_pool, small_intents, small_chains):
+        assignments = {0: "llama-0", 1: "claude-0", 2: "gemini-0"}
+        m = compute_metrics(assignments, small_intents, small_pool, small_chains)
+
+        cc = m["chain_coherence"]
+        assert cc["total_chains"] == 1
+        assert cc["chains_multi_switch"] == 1
+        assert cc["score"] == 0.0
+
+        cq = m["cost_quality"]
+        assert cq["assigned_count"] == 3
+        assert cq["total_cost"] == pytest.approx(0.17)
+        assert cq["avg_quality"] == pytest.approx((0.55 + 0.95 + 0.88) / 3, abs=1e-4)
+
+        gp = m["gate_pass"]
+        assert gp["gate_1_passed"] == 3
+        assert gp["gate_1_pass_rate"] == 1.0
+
+        dl = m["deadline"]
+        assert dl["total_with_deadline"] == 3
+        assert dl["deadline_violations"] == 0
+        assert dl["dep_pairs_checked"] == 2
+        assert dl["dep_quality_violations"] == 1
+
+    def test_empty_assignments(self, small_pool, small_intents, small_chains):
+        m = compute_metrics({}, small_intents, small_pool, small_chains)
+        assert m["chain_coherence"]["total_chains"] == 0
+        assert m["cost_quality"]["assigned_count"] == 0
+        assert m["gate_pass"]["architecture_score"] == 1.0
+        assert m["metadata"]["num_assigned"] == 0
+
+
+    def test_default_weights_not_shared(self, small_pool, small_intents,
+                                        small_chains):
+        first = compute_metrics({}, small_intents, small_pool, small_chains)
+        first["weights"]["DEP_PENALTY"] = -1.0
+        second = compute_metrics({}, small_intents, small_pool, small_chains)
+        assert second["weights"] == DEFAULT_WEIGHTS
+
+    def test_pool_cache_tracks_mutation(self, small_pool, small_intents,
+                                        small_chains):
+        assignments = {0: "llama-0", 3: "mistral-0"}
+        m = compute_metrics(assignments, small_intents, small_pool, small_chains)
+        assert m["cost_quality"]["assigned_count"] == 1
+
+        # Added agent: detected without help.
+        small_pool["mistral-0"] = dict(small_pool["llama-0"], model_type="mistral")
+        m = compute_metrics(assignments, small_intents, small_pool, small_chains)
+        assert m["cost_quality"]["assigned_count"] == 2
+
+        # Field edited inside an existing agent: needs an explicit clear.
+        small_pool["llama-0"]["quality"] = 0.75
+        clear_metric_caches()
+        m = compute_metrics(assignments, small_intents, small_pool, small_chains)
+        assert m["cost_quality"]["avg_quality"] == pytest.approx(0.65)
+
+
+    def test_chain_cache_tracks_mutation(self, small_pool, small_intents,
+                                         small_chains):
+        assignments = {0: "llama-0", 1: "llama-0", 2: "llama-0", 3: "claude-0"}
+        m = compute_metrics(assignments, small_intents, small_pool, small_chains)
+        assert m["chain_coherence"]["total_chains"] == 1
+
+        small_chains[1][1].append(0)      # b-chain grows to two steps
+        small_chains.append(("c-chain", [1, 2]))
+        m = compute_metrics(assignments, small_intents, small_pool, small_chains)
+        assert m["chain_coherence"]["total_chains"] == 3
+        assert m["chain_coherence"]["chains_one_switch"] == 1
+
+    def test_popcount_table_matches_bin_count(self):
+        masks = np.array([0, 1, 0xFF, 0x8000_0000_0000_0001, 2**64 - 1,
+                          0x0123_4567_89AB_CDEF], dtype=np.uint64)
+        expected = [bin(int(m)).count("1") for m in masks]
+        assert telemetry._popcount64_table(masks).tolist() == expected
+        assert telemetry._popcount64(masks).tolist() == expected
+
+
+class TestComputeMetricsBatch:
+
+    @pytest.fixture
+    def runs(self):
+        return [
+            ({0: "llama-0", 1: "claude-0", 2: "gemini-0"}, None),
+            ({0: "claude-0", 1: "claude-0", 2: "claude-0"}, {"DEP_PENALTY": 50.0}),
+            ({3: "llama-0"}, None),
+        ]
+
+    @pytest.mark.parametrize("max_workers", [1, 2])
+    def test_matches_compute_metrics(self, runs, max_workers,
+                                     small_pool, small_intents, small_chains):
+        batch = compute_metrics_batch(
+            runs, small_intents, small_pool, small_chains,
+            max_workers=max_workers,
+        )
+        assert len(batch) == len(runs)
+        for (assignments, weights), result in zip(runs, batch):
+            expected = compute_metrics(
+                assignments, small_intents, small_pool, small_chains, weights,
+            )
+            for key in ("chain_coherence", "cost_quality", "gate_pass",
+                        "deadline", "weights"):
+                assert result[key] == expected[key]
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# TelemetryLog selection
+# ═══════════════════════════════════════════════════════════════════════════════
+
+
+class TestTelemetryLogSelection:
+
+    @pytest.fixture
+    def log(self):
+        return TelemetryLog(runs=[
+            _run(0.60, 1.0),
+            _run(0.80, 2.0),
+            _run(0.70, 3.0),            # dominated by 0.80 / 2.0
+            _run(0.95, 0.5, gate=0.5),  # fails the gate
+            _run(0.80, 2.5),            # same coherence, worse ratio
+            _run(0.90, 4.0),
+        ])
+
+    def test_best_single_scan_matches_scalar_bests(self, log):
+        best_c, best_cq = log.best()
+        assert best_c is log.runs[5]
+        assert best_cq is log.runs[0]
+        assert log.best_by_coherence() is best_c
+        assert log.best_by_cost() is best_cq
+
+    def test_best_respects_gate_threshold(self, log):
+        assert log.best_by_coherence(min_gate_pass=0.4) is log.runs[3]
+        assert log.best(min_gate_pass=1.1) == (None, None)
+
+    def test_pareto_frontier(self, log):
+        frontier = log.pareto_frontier()
+        assert frontier == [log.runs[5], log.runs[1], log.runs[0]]
+
+    def test_pareto_frontier_refreshes_after_add_run(self, log):
+        assert len(log.pareto_frontier()) == 3
+        log.add_run(_run(0.99, 0.1))
+        assert log.pareto_frontier() == [log.runs[-1]]
+
+    def test_summary(self, log):
+        text = log.summary()
+        assert "6 runs" in text
+        assert "90.0%" in text
+        assert TelemetryLog().summary() == "No runs logged."
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# TelemetryLog persistence
+# ═══════════════════════════════════════════════════════════════════════════════
+
+
+class TestTelemetryLogPersistence:
+
+    def test_add_run_appends_json_lines(self, tmp_path):
+        path = tmp_path / "telemetry" / "runs.jsonl"
+        log = TelemetryLog(log_path=path)
+        log.add_run(_run(0.5, 2.0))
+        log.add_run(_run(0.7, 1.5))
+
+        lines = path.read_bytes().splitlines()
+        assert len(lines) == 2
+
+        loaded = TelemetryLog.load(path)
+        assert loaded.runs == log.runs
+        assert loaded.log_path == path
+
+    def test_add_runs_appends_batch(self, tmp_path):
+        path = tmp_path / "runs.jsonl"
+        log = TelemetryLog(log_path=path)
+        log.add_run(_run(0.5, 2.0))
+        log.add_runs([_run(0.6, 1.8), _run(0.7, 1.5)])
+
+        assert len(path.read_bytes().splitlines()) == 3
+        assert TelemetryLog.load(path).runs == log.runs
+
+    def test_export_round_trips(self, tmp_path):
+        log = TelemetryLog(runs=[_run(0.5, 2.0), _run(0.7, 1.5)])
+        path = tmp_path / "export.json"
+        log.export(path)
+
+        assert TelemetryLog.load(path).runs == log.runs
+
+    @pytest.mark.parametrize("write", [
+        lambda log, path: log.export(path),
+        lambda log, path: path.write_text(json.dumps({"runs": log.runs}, indent=2)),
+    ], ids=["export", "legacy_indented"])
+    def test_document_load_then_append_round_trips(self, tmp_path, write):
+        path = tmp_path / "runs.json"
+        write(TelemetryLog(runs=[_run(0.5, 2.0), _run(0.7, 1.5)]), path)
+        original = path.read_bytes()
+
+        log = TelemetryLog.load(path)
+        assert path.read_bytes() == original  # loading leaves the file alone
+        log.add_run(_run(0.9, 1.0))
+
+        reloaded = TelemetryLog.load(path)
+        assert reloaded.runs == log.runs
+        assert len(path.read_bytes().splitlines()) == 3
+
+    def test_max_runs_in_memory_keeps_recent_window(self, tmp_path):
+        path = tmp_path / "runs.jsonl"
+        log = TelemetryLog(log_path=path, max_runs_in_memory=2)
+        for i in range(5):
+            log.add_run(_run(0.1 * i, 1.0))
+
+        assert [r["chain_coherence"]["score"] for r in log.runs] == \
+            pytest.approx([0.3, 0.4])
+        assert log.best_by_coherence() is log.runs[-1]
+        assert len(list(log.iter_history())) == 5
+
+    def test_max_file_bytes_rotates_log(self, tmp_path):
+        path = tmp_path / "runs.jsonl"
+        log = TelemetryLog(log_path=path, max_file_bytes=1, max_rotated_files=1)
+        log.add_run(_run(0.5, 2.0))
+        log.add_run(_run(0.6, 1.5))
+
+        assert not path.exists()
+        rotated = tmp_path / "runs.1.jsonl"
+        assert len(rotated.read_bytes().splitlines()) == 1
+
+        log.max_file_bytes = None
+        log.add_run(_run(0.7, 1.0))
+        history = list(log.iter_history())
+        assert [r["chain_coherence"]["score"] for r in history] == [0.6, 0.7]
+
+    def test_rotation_keeps_generations_and_history_queries(self, tmp_path):
+        path = tmp_path / "runs.jsonl"
+        log = TelemetryLog(log_path=path, max_file_bytes=1,
+                           max_rotated_files=3, max_runs_in_memory=1)
+        scores = [0.5, 0.9, 0.6, 0.7, 0.4]
+        for i, score in enumerate(scores):
+            log.add_run(_run(score, 1.0 + i))
+
+        # Four generations were rotated out; only the newest three survive.
+        assert [p.name for p in sorted(tmp_path.iterdir())] == \
+            ["runs.1.jsonl", "runs.2.jsonl", "runs.3.jsonl"]
+        history = [r["chain_coherence"]["score"] for r in log.iter_history()]
+        assert history == [0.6, 0.7, 0.4]
+
+        assert log.best_by_coherence() is log.runs[-1]
+        best_c, best_cq = log.best(include_history=True)
+        assert best_c["chain_coherence"]["score"] == 0.7
+        assert best_cq["chain_coherence"]["score"] == 0.6
+        frontier = log.pareto_frontier(include_history=True)
+        assert [r["chain_coherence"]["score"] for r in frontier] == [0.7, 0.6]
+
+    def test_export_empty_log(self, tmp_path):
+        path = tmp_path / "empty.json"
+        TelemetryLog().export(path)
+        assert TelemetryLog.load(path).runs == []
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# perturb_weights
+# ═══════════════════════════════════════════════════════════════════════════════
+
+
+class TestPerturbWeights:
+
+    def test_within_bounds(self):
+        perturbed = perturb_weights(DEFAULT_WEIGHTS, perturbation_pct=0.1)
+        assert perturbed.keys() == DEFAULT_WEIGHTS.keys()
+        for k, v in DEFAULT_WEIGHTS.items():
+            assert 0.9 * v <= perturbed[k] <= 1.1 * v
+
+    def test_seeded_rng_is_reproducible(self):
+        a = perturb_weights(DEFAULT_WEIGHTS, rng=np.random.default_rng(7))
+        b = perturb_weights(DEFAULT_WEIGHTS, rng=np.random.default_rng(7))
+        assert a == b
@@ -14,6 +14,7 @@ from __future__ import annotations
 import pytest
 
 from quantum_routing.feature_decomposer import decompose_slider_bug
+from quantum_routing.quality_gates import IntentResult
 from quantum_routing.staffing_engine import generate_staffing_plan
 from quantum_routing.wave_executor import (
     ArtifactCollector,
@@ -54,6 +55,24 @@ class TestSimulatedBackend:
         assert r1.status == r2.status
         assert r1.quality_score == r2.quality_score
 
+    def test_latency_flag_does_not_change_results(self):
+        """Skipping the simulated sleep keeps the same result stream."""
+        intent_spec = {"id": "test", "profile": "bug-hunter",
+                        "model": "claude", "complexity": "moderate"}
+        ctx = ExecutionContext(
+            intent_id="test", profile="bug-hunter",
+            model="claude", wave=0, attempt=1,
+            predecessor_artifacts=[], todo_md="test",
+        )
+        slow = SimulatedBackend(seed=7)
+        fast = SimulatedBackend(seed=7, simulate_latency=False)
+        for _ in range(5):
+            r1 = slow.execute_intent(intent_spec, ctx)
+            r2 = fast.execute_intent(intent_spec, ctx)
+            assert (r1.status, r1.quality_score, r1.artifacts) == (
+                r2.status, r2.quality_score, r2.artifacts,
+            )
+
     def test_zero_failure_rate_always_succeeds(self):
         backend = SimulatedBackend(failure_rate=0.0, seed=99)
         intent_spec = {"id": "test", "profile": "feature-trailblazer",
@@ -81,6 +100,22 @@ class TestSimulatedBackend:
         assert result.error_message is not None
 
 
+class _FailingBackend:
+    """Every attempt fails; counts backend calls."""
+
+    def __init__(self, supports_backoff):
+        self.supports_backoff = supports_backoff
+        self.calls = 0
+
+    def execute_intent(self, intent_spec, context):
+        self.calls += 1
+        return IntentResult(
+            intent_id=context.intent_id, profile=context.profile,
+            status="failed", quality_score=0.0, tests_passed=False,
+            coverage_delta=0.0, artifacts=[], error_message="busy",
+        )
+
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # WaveExecutor — end-to-end
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -94,16 +129,43 @@ class TestWaveExecutor:
         intents = decompose_slider_bug()
         plan = generate_staffing_plan(intents)
 
-        executor = WaveExecutor(
+        with WaveExecutor(
             backend=SimulatedBackend(failure_rate=0.0, seed=42),
             max_retries=2,
-        )
-        result = executor.execute_plan(plan)
+        ) as executor:
+            result = executor.execute_plan(plan)
 
         assert len(result.waves) == plan["total_waves"]
         assert result.final_verdict is not None
         assert result.passed_count + result.failed_count == plan["total_intents"]
 
+    def test_pool_reused_across_plans(self):
+        """One executor can run several plans and is closed by the with-block."""
+        plan = generate_staffing_plan(decompose_slider_bug())
+
+        with WaveExecutor(
+            backend=SimulatedBackend(failure_rate=0.0, seed=42,
+                                     simulate_latency=False),
+        ) as executor:
+            first = executor.execute_plan(plan)
+            second = executor.execute_plan(plan)
+
+        assert first.passed_count == second.passed_count == plan["total_intents"]
+        with pytest.raises(RuntimeError):
+            executor.execute_plan(plan)
+
+    def test_max_workers_auto_sized(self):
+        from quantum_routing.wave_executor import _available_cpus
+
+        with WaveExecutor(backend=SimulatedBackend()) as auto:
+            assert auto.max_workers == min(32, _available_cpus() * 2)
+        with WaveExecutor(backend=SimulatedBackend(), max_workers=3) as fixed:
+            assert fixed.max_workers == 3
+
+    def test_executors_share_todo_generator(self):
+        with WaveExecutor() as first, WaveExecutor() as second:
+            assert first.todo_generator is second.todo_generator
+
     def test_progress_callback_events(self):
         """Progress callback receives expected event types."""
         intents = decompose_slider_bug()
@@ -114,18 +176,54 @@ class TestWaveExecutor:
         def callback(event: str, data: dict):
             events.append(event)
 
-        executor = WaveExecutor(
+        with WaveExecutor(
             backend=SimulatedBackend(failure_rate=0.0, seed=42),
             progress_callback=callback,
-        )
-        executor.execute_plan(plan)
+        ) as executor:
+            executor.execute_plan(plan)
 
+        assert events[0] == "execution_started"
         assert "wave_started" in events
         assert "wave_completed" in events
         assert "intent_started" in events
         assert "intent_completed" in events
         assert "execution_completed" in events
 
+    def test_progress_events_delivered_from_one_thread(self):
+        import threading
+
+        plan = generate_staffing_plan(decompose_slider_bug())
+        threads = set()
+        events = []
+
+        def callback(event, data):
+            threads.add(threading.current_thread().name)
+            events.append(event)
+
+        with WaveExecutor(
+            backend=SimulatedBackend(failure_rate=0.0, simulate_latency=False),
+            progress_callback=callback,
+        ) as executor:
+            executor.execute_plan(plan)
+
+        assert threads == {"wave-exec-events"}
+        assert events[0] == "execution_started"
+        assert events[-1] == "execution_completed"
+
+    def test_progress_callback_error_surfaces(self):
+        plan = generate_staffing_plan(decompose_slider_bug())
+
+        def callback(event, data):
+            if event == "wave_completed":
+                raise ValueError("boom")
+
+        with WaveExecutor(
+            backend=SimulatedBackend(failure_rate=0.0, simulate_latency=False),
+            progress_callback=callback,
+        ) as executor:
+            with pytest.raises(ValueError, match="boom"):
+                executor.execute_plan(plan)
+
     def test_retry_on_failure(self):
         """Executor retries failed intents."""
         intents = decompose_slider_bug()
@@ -137,12 +235,12 @@ class TestWaveExecutor:
             events.append((event, data))
 
         # Moderate failure rate to trigger some retries
-        executor = WaveExecutor(
+        with WaveExecutor(
             backend=SimulatedBackend(failure_rate=0.5, seed=42),
             max_retries=4,
             progress_callback=callback,
-        )
-        result = executor.execute_plan(plan)
+        ) as executor:
+            result = executor.execute_plan(plan)
 
         # Some intents should have had retries or escalations
         retry_events = [e for e, _ in events if e in
@@ -151,17 +249,72 @@ class TestWaveExecutor:
         # (seed=42 is deterministic so this is stable)
         assert result.final_verdict is not None
 
+    def test_backoff_between_retries(self, monkeypatch):
+        """Backends that allow backoff get a growing sleep between attempts."""
+        from quantum_routing import wave_executor
+
+        sleeps = []
+        monkeypatch.setattr(wave_executor.time, "sleep", sleeps.append)
+        monkeypatch.setattr(wave_executor.random, "random", lambda: 0.5)
+
+        with WaveExecutor(
+            backend=_FailingBackend(supports_backoff=True),
+            max_retries=3,
+        ) as executor:
+            ie = executor._execute_intent_with_retries(
+                {"id": "x", "profile": "bug-hunter", "model": "claude",
+                 "complexity": "moderate"},
+                0,
+            )
+
+        assert len(ie.attempts) == 3
+        assert sleeps == [0.1, 0.2]
+
+    def test_human_review_flag_stops_before_next_attempt(self):
+        """Once the ladder says flag_for_human_review, no attempt is wasted."""
+        backend = _FailingBackend(supports_backoff=False)
+        with WaveExecutor(backend=backend, max_retries=6) as executor:
+            ie = executor._execute_intent_with_retries(
+                {"id": "x", "profile": "bug-hunter", "model": "claude",
+                 "complexity": "moderate"},
+                0,
+            )
+
+        # retry (1) -> escalate (2) -> flag after attempt 3
+        assert backend.calls == 3
+        assert ie.status == "human_review"
+        assert ie.final_result is ie.attempts[-1]
+
+    def test_todo_rendered_only_for_backends_that_need_it(self):
+        intent_spec = {"id": "x", "profile": "bug-hunter", "model": "claude",
+                       "complexity": "moderate"}
+        seen = []
+
+        class RecordingBackend(SimulatedBackend):
+            def execute_intent(self, spec, context):
+                seen.append(context.todo_md)
+                return super().execute_intent(spec, context)
+
+        backend = RecordingBackend(failure_rate=0.0, simulate_latency=False)
+        with WaveExecutor(backend=backend, max_workers=1) as executor:
+            executor._execute_intent_with_retries(intent_spec, 0)
+            backend.needs_todo_md = True
+            executor._execute_intent_with_retries(intent_spec, 0)
+
+        assert seen[0] == ""
+        assert seen[1].startswith("# Agent Todo: x")
+
     def test_human_review_after_max_retries(self):
         """After max_retries exhausted, intent gets flagged for human review."""
         intents = decompose_slider_bug()
         plan = generate_staffing_plan(intents)
 
         # 100% failure rate = all intents will exhaust retries
-        executor = WaveExecutor(
+        with WaveExecutor(
             backend=SimulatedBackend(failure_rate=1.0, seed=42),
             max_retries=3,
-        )
-        result = executor.execute_plan(plan)
+        ) as executor:
+            result = executor.execute_plan(plan)
 
         assert result.human_review_count > 0
         # Check at least one wave has human_review status intents
@@ -173,6 +326,117 @@ class TestWaveExecutor:
         assert len(human_reviewed) > 0
 
 
+# ═══════════════════════════════════════════════════════════════════════════════
+# WaveExecutor — dependency scheduling
+# ═══════════════════════════════════════════════════════════════════════════════
+
+
+def _spec(intent_id, wave, depends_on=()):
+    return {"id": intent_id, "profile": "bug-hunter", "model": "claude",
+            "complexity": "moderate", "wave": wave,
+            "depends_on": list(depends_on)}
+
+
+class _TimedBackend:
+    """Always succeeds; records start/end order and sleeps per intent."""
+
+    supports_backoff = False
+    needs_todo_md = False
+
+    def __init__(self, delays):
+        import threading
+
+        self.delays = delays
+        self.log = []
+        self.contexts = {}
+        self._lock = threading.Lock()
+
+    def execute_intent(self, intent_spec, context):
+        import time
+
+        with self._lock:
+            self.log.append(("start", context.intent_id))
+            self.contexts[context.intent_id] = context
+        time.sleep(self.delays.get(context.intent_id, 0.0))
+        with self._lock:
+            self.log.append(("end", context.intent_id))
+        return IntentResult(
+            intent_id=context.intent_id, profile=context.profile,
+            status="completed", quality_score=0.95, tests_passed=True,
+            coverage_delta=0.02, artifacts=[f"PR-{context.intent_id}"],
+        )
+
+
+class TestDependencyScheduling:
+    """Intents start when their own dependencies finish, not their wave."""
+
+    def test_independent_intent_not_held_by_straggler(self):
+        plan = {"waves": [
+            {"wave": 0, "intents": [_spec("slow", 0), _spec("fast", 0)]},
+            {"wave": 1, "intents": [_spec("child", 1, ["fast"])]},
+        ]}
+        backend = _TimedBackend({"slow": 0.3})
+        with WaveExecutor(backend=backend, max_workers=4) as executor:
+            result = executor.execute_plan(plan)
+
+        assert backend.log.index(("start", "child")) < backend.log.index(("end", "slow"))
+        assert backend.contexts["child"].predecessor_artifacts == ["PR-fast"]
+        assert [w.wave_index for w in result.waves] == [0, 1]
+        assert set(result.waves[0].intent_executions) == {"slow", "fast"}
+        assert result.waves[1].intent_executions["child"].wave_index == 1
+        assert result.passed_count == 3
+
+    def test_dependents_wait_for_all_predecessors(self):
+        plan = {"waves": [
+            {"wave": 0, "intents": [_spec("a", 0), _spec("b", 0)]},
+            {"wave": 1, "intents": [_spec("c", 1, ["a", "b"])]},
+        ]}
+        backend = _TimedBackend({"a": 0.05, "b": 0.1})
+        with WaveExecutor(backend=backend, max_workers=4) as executor:
+            executor.execute_plan(plan)
+
+        start_c = backend.log.index(("start", "c"))
+        assert backend.log.index(("end", "a")) < start_c
+        assert backend.log.index(("end", "b")) < start_c
+
+    def test_dependency_cycle_runs_blocked_intents_once(self):
+        """A cycle is broken by running its members together; dependents still wait."""
+        plan = {"waves": [
+            {"wave": 0, "intents": [_spec("x", 0, ["y"]), _spec("y", 0, ["x"])]},
+            {"wave": 1, "intents": [_spec("after", 1, ["x"])]},
+        ]}
+        backend = _TimedBackend({"x": 0.05})
+        with WaveExecutor(backend=backend, max_workers=3) as executor:
+            result = executor.execute_plan(plan)
+
+        starts = [iid for kind, iid in backend.log if kind == "start"]
+        assert sorted(starts) == ["after", "x", "y"]
+        assert backend.log.index(("end", "x")) < backend.log.index(("start", "after"))
+        assert set(result.waves[0].intent_executions) == {"x", "y"}
+        assert [w.status for w in result.waves] == ["passed", "passed"]
+        assert result.passed_count == 3
+
+    def test_wave_completed_events_in_plan_order(self):
+        """A later wave finishing first is still reported after the earlier one."""
+        plan = {"waves": [
+            {"wave": 0, "intents": [_spec("slow", 0), _spec("fast", 0)]},
+            {"wave": 1, "intents": [_spec("child", 1, ["fast"])]},
+        ]}
+        backend = _TimedBackend({"slow": 0.3})
+        events = []
+        with WaveExecutor(
+            backend=backend, max_workers=4,
+            progress_callback=lambda event, data: events.append((event, data)),
+        ) as executor:
+            executor.execute_plan(plan)
+
+        # child (wave 1) ends before slow (wave 0) ...
+        assert backend.log.index(("end", "child")) < backend.log.index(("end", "slow"))
+        # ... but wave 0 is still reported first.
+        completed = [d["wave"] for e, d in events if e == "wave_completed"]
+        assert completed == [0, 1]
+
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # ArtifactCollector
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -208,15 +472,37 @@ class TestArtifactCollector:
         dep_artifacts = collector.get_for_dependencies(["dep-1", "dep-2"])
         assert len(dep_artifacts) == 3
 
+    def test_concurrent_records_are_not_lost(self):
+        from concurrent.futures import ThreadPoolExecutor
+
+        collector = ArtifactCollector()
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            for i in range(200):
+                pool.submit(collector.record, f"intent-{i % 5}", [f"a{i}"])
+
+        total = sum(
+            len(collector.get_for_intent(f"intent-{k}")) for k in range(5)
+        )
+        assert total == 200
+
+    def test_snapshot_unaffected_by_later_record(self):
+        collector = ArtifactCollector()
+        collector.record("intent-1", ["PR #1"])
+        before = collector.get_for_intent("intent-1")
+        collector.record("intent-1", ["PR #2"])
+
+        assert before == ["PR #1"]
+        assert collector.get_for_intent("intent-1") == ["PR #1", "PR #2"]
+
     def test_artifacts_accumulate_across_waves(self):
         """WaveExecutor accumulates artifacts across waves."""
         intents = decompose_slider_bug()
         plan = generate_staffing_plan(intents)
 
-        executor = WaveExecutor(
+        with WaveExecutor(
             backend=SimulatedBackend(failure_rate=0.0, seed=42),
-        )
-        result = executor.execute_plan(plan)
+        ) as executor:
+            result = executor.execute_plan(plan)
 
         # After execution, artifact collector should have entries
         # for all intents that produced artifacts